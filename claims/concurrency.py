@@ -0,0 +1,203 @@
+"""
+Adaptive (AIMD) concurrency control for OpenRouter calls.
+
+A fixed worker count is either too timid or, when OpenRouter is busy,
+causes 429 storms. The controller bounds how many API requests are in
+flight at once and moves that limit the way TCP congestion control
+moves its window:
+
+- additive increase: each time ``limit`` requests complete healthily,
+  the limit grows by one, up to ``maximum``
+- multiplicative decrease: a throttling failure (429/5xx, connection
+  error, timeout) or a recent median latency above ``latency_factor``
+  times the best median seen multiplies the limit by ``decrease``, down
+  to ``minimum``
+
+Requests that started before the last decrease were already in flight
+during the same congestion episode, so their failures do not cut the
+limit again.
+
+The controller also keeps a sliding window of latencies and outcomes for
+stats(): current limit, in-flight requests, p50/p95 latency and error rate.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import requests
+
+from collectors.retry_utils import RetryableError
+
+logger = logging.getLogger(__name__)
+
+# Failures that mean the provider is overloaded, not that the request was bad
+CONGESTION_ERRORS = (
+    RetryableError,
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+)
+
+
+def _percentile(sorted_values, fraction):
+    """Return the nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(int(round(fraction * len(sorted_values))) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+class AdaptiveConcurrency:
+    """Thread-safe AIMD limit on concurrent requests."""
+
+    def __init__(self, initial=1, minimum=1, maximum=None, adaptive=False,
+                 decrease=0.5, latency_factor=2.0, window=100, min_samples=10,
+                 clock=time.monotonic):
+        """
+        Args:
+            initial: Starting concurrency limit.
+            minimum: Lowest limit a decrease can reach.
+            maximum: Highest limit an increase can reach (default: initial).
+            adaptive: If False, the limit stays at ``initial`` and only
+                stats are collected.
+            decrease: Factor the limit is multiplied by on congestion.
+            latency_factor: Median latency, relative to the best median
+                seen, above which the provider counts as congested.
+            window: Number of recent requests kept for stats.
+            min_samples: Latency samples needed before latency can
+                trigger a decrease.
+            clock: Monotonic clock function; override in tests.
+        """
+        self._cond = threading.Condition()
+        self._clock = clock
+        self.decrease = decrease
+        self.latency_factor = latency_factor
+        self.window = window
+        self.min_samples = min_samples
+        self._in_flight = 0
+        self.configure(initial, minimum, maximum, adaptive)
+
+    def configure(self, initial, minimum=1, maximum=None, adaptive=False):
+        """
+        Reset the limit and clear all samples; requests already in flight
+        keep their slots.
+
+        Args:
+            initial: Starting concurrency limit.
+            minimum: Lowest limit a decrease can reach.
+            maximum: Highest limit an increase can reach (default: initial).
+            adaptive: Whether the limit moves with load (see class docs).
+        """
+        with self._cond:
+            self.minimum = max(1, minimum)
+            self.maximum = max(self.minimum, maximum or initial)
+            self.adaptive = adaptive
+            self._limit = float(min(max(initial, self.minimum), self.maximum))
+            self._credits = 0.0
+            self._last_decrease = float("-inf")
+            self._baseline = None
+            self._latencies = deque(maxlen=self.window)
+            self._recent = deque(maxlen=self.window)  # since the last cut
+            self._outcomes = deque(maxlen=self.window)
+            self.requests = 0
+            self.errors = 0
+            self._cond.notify_all()
+
+    @property
+    def limit(self):
+        """Current whole-number concurrency limit."""
+        return int(self._limit)
+
+    @contextmanager
+    def slot(self):
+        """
+        Hold one request slot for the duration of the block.
+
+        Blocks until fewer than ``limit`` requests are in flight. An
+        exception from the block is recorded (congestion errors cut the
+        limit) and re-raised.
+        """
+        with self._cond:
+            while self._in_flight >= int(self._limit):
+                self._cond.wait()
+            self._in_flight += 1
+        started = self._clock()
+        try:
+            yield
+        except CONGESTION_ERRORS:
+            self._finish(started, congested=True, failed=True)
+            raise
+        except BaseException:
+            self._finish(started, congested=False, failed=True)
+            raise
+        else:
+            self._finish(started, congested=False, failed=False)
+
+    def _finish(self, started, congested, failed):
+        """Record a completed request and move the limit."""
+        latency = self._clock() - started
+        with self._cond:
+            self._in_flight -= 1
+            self.requests += 1
+            self.errors += failed
+            self._outcomes.append(failed)
+            if not failed:
+                self._latencies.append(latency)
+                self._recent.append(latency)
+            if self.adaptive:
+                if congested or (not failed and self._latency_congested()):
+                    self._decrease(started, "errors" if congested else "latency")
+                elif not failed:
+                    self._credits += 1.0 / self._limit
+                    if self._credits >= 1.0 and self._limit < self.maximum:
+                        self._credits = 0.0
+                        self._limit = min(self._limit + 1, self.maximum)
+                        logger.debug("OpenRouter concurrency raised to %d", self.limit)
+            self._cond.notify_all()
+
+    def _latency_congested(self):
+        """Check the recent median latency against the best median seen."""
+        if len(self._recent) < self.min_samples:
+            return False
+        p50 = _percentile(sorted(self._recent), 0.5)
+        if self._baseline is None or p50 < self._baseline:
+            self._baseline = p50
+        return p50 > self.latency_factor * self._baseline
+
+    def _decrease(self, started, reason):
+        """Cut the limit once per congestion episode."""
+        if started < self._last_decrease:
+            return
+        old = self.limit
+        self._limit = max(self.minimum, self._limit * self.decrease)
+        self._credits = 0.0
+        self._last_decrease = self._clock()
+        # Latencies from before the cut describe the old load
+        self._recent.clear()
+        if self.limit != old:
+            logger.info("OpenRouter concurrency cut from %d to %d (%s)",
+                        old, self.limit, reason)
+
+    def stats(self):
+        """
+        Return a snapshot of the controller state.
+
+        Returns:
+            Dict with 'limit', 'in_flight', 'requests', 'errors',
+            'error_rate' (over the recent window), and 'p50'/'p95'
+            latency in seconds (None before any success).
+        """
+        with self._cond:
+            latencies = sorted(self._latencies)
+            outcomes = list(self._outcomes)
+            return {
+                "limit": self.limit,
+                "in_flight": self._in_flight,
+                "requests": self.requests,
+                "errors": self.errors,
+                "error_rate": sum(outcomes) / len(outcomes) if outcomes else 0.0,
+                "p50": _percentile(latencies, 0.5),
+                "p95": _percentile(latencies, 0.95),
+            }
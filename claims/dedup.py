@@ -0,0 +1,176 @@
+"""
+Near-duplicate post detection for claims extraction.
+
+Retweets, cross-posts, and copy-paste campaigns produce many posts with
+almost the same text. Each post's text is reduced to a 64-bit SimHash
+fingerprint of its word shingles; texts that differ by a few words get
+fingerprints that differ in a few bits.
+
+Candidate pairs are found with locality-sensitive hashing instead of
+comparing every pair: the fingerprint is split into ``max_distance + 1``
+bands, and posts are bucketed by each band's value. Two fingerprints
+within ``max_distance`` bits must agree exactly on at least one band
+(pigeonhole), so every near-duplicate pair shares a bucket, and only
+posts that share a bucket are compared. Matches are merged into clusters
+with union-find.
+"""
+
+import hashlib
+import re
+from collections import defaultdict
+
+from collectors.config import DEDUP_MAX_DISTANCE, DEDUP_MIN_TOKENS
+
+FINGERPRINT_BITS = 64
+
+_RETWEET_RE = re.compile(r"^\s*rt\s+@\w+:?\s*", re.IGNORECASE)
+_URL_RE = re.compile(r"https?://\S+")
+_MENTION_RE = re.compile(r"@\w+")
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text):
+    """
+    Normalize post text into word tokens for fingerprinting.
+
+    Drops a leading 'RT @user:' prefix, URLs (which differ per share), and
+    @mentions, and lowercases the rest.
+
+    Args:
+        text: Post text.
+
+    Returns:
+        List of lowercase word tokens.
+    """
+    text = _RETWEET_RE.sub("", text or "")
+    text = _MENTION_RE.sub(" ", _URL_RE.sub(" ", text))
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _feature_hash(feature):
+    """Return a stable 64-bit hash of a feature string."""
+    digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def simhash(tokens):
+    """
+    Compute the 64-bit SimHash fingerprint of a token list.
+
+    Features are the single words and word bigrams of the text.
+
+    Args:
+        tokens: List of tokens from tokenize().
+
+    Returns:
+        Integer fingerprint in [0, 2**64).
+    """
+    features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    weights = [0] * FINGERPRINT_BITS
+    for feature in features:
+        h = _feature_hash(feature)
+        for bit in range(FINGERPRINT_BITS):
+            weights[bit] += 1 if h >> bit & 1 else -1
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def hamming_distance(a, b):
+    """Return the number of differing bits between two fingerprints."""
+    return bin(a ^ b).count("1")
+
+
+def _bands(fingerprint, count):
+    """Split a fingerprint into ``count`` contiguous bit bands."""
+    width = FINGERPRINT_BITS // count
+    mask = (1 << width) - 1
+    bands = [(fingerprint >> (i * width)) & mask for i in range(count - 1)]
+    # The last band takes any leftover high bits
+    bands.append(fingerprint >> ((count - 1) * width))
+    return bands
+
+
+def cluster_posts(posts, max_distance=None, min_tokens=None):
+    """
+    Group posts whose texts are near-duplicates.
+
+    Args:
+        posts: List of post dicts in unified schema.
+        max_distance: Maximum Hamming distance between fingerprints of
+            near-duplicates (default: DEDUP_MAX_DISTANCE).
+        min_tokens: Posts with fewer tokens are never clustered, since
+            short texts collide too easily (default: DEDUP_MIN_TOKENS).
+
+    Returns:
+        List of clusters, each a list of indices into posts in input order.
+        Every post is in exactly one cluster; the first index of each
+        cluster is its representative, and clusters are ordered by it.
+    """
+    if max_distance is None:
+        max_distance = DEDUP_MAX_DISTANCE
+    if min_tokens is None:
+        min_tokens = DEDUP_MIN_TOKENS
+
+    parent = list(range(len(posts)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i, j):
+        ri, rj = find(i), find(j)
+        if ri != rj:
+            # The earlier post stays the root, so it represents the cluster
+            parent[max(ri, rj)] = min(ri, rj)
+
+    fingerprints = {}
+    first_with = {}
+    buckets = defaultdict(list)
+    band_count = max_distance + 1
+    for i, post in enumerate(posts):
+        tokens = tokenize(post.get("text", ""))
+        if len(tokens) < min_tokens:
+            continue
+        fingerprint = simhash(tokens)
+        if fingerprint in first_with:
+            # Exact copies join directly and stay out of the buckets, so a
+            # mass-shared text does not make its buckets quadratic
+            union(first_with[fingerprint], i)
+            continue
+        first_with[fingerprint] = i
+        fingerprints[i] = fingerprint
+        for band, value in enumerate(_bands(fingerprint, band_count)):
+            for j in buckets[(band, value)]:
+                if find(i) != find(j) and \
+                        hamming_distance(fingerprint, fingerprints[j]) <= max_distance:
+                    union(i, j)
+            buckets[(band, value)].append(i)
+
+    clusters = defaultdict(list)
+    for i in range(len(posts)):
+        clusters[find(i)].append(i)
+    return [clusters[root] for root in sorted(clusters)]
+
+
+def link_claims(claims, member, representative):
+    """
+    Copy a representative post's claims onto a near-duplicate member post.
+
+    Args:
+        claims: Claim dicts extracted from the representative.
+        member: The near-duplicate post dict.
+        representative: The post the claims were extracted from.
+
+    Returns:
+        New claim dicts attributed to the member, each with a
+        'duplicate_of' field naming the representative's post id.
+    """
+    return [
+        dict(claim,
+             post_id=member.get("id", ""),
+             platform=member.get("platform", ""),
+             post_url=member.get("url", ""),
+             duplicate_of=representative.get("id", ""))
+        for claim in claims
+    ]
@@ -1,28 +1,85 @@
 """
 Claims extractor using GPT-4o via OpenRouter.
 
-Processes social media posts one at a time, extracts factual claims,
-classifies them by confidence threshold, and saves results incrementally
-for crash safety.
+Processes social media posts one at a time or through a bounded worker
+pool, extracts factual claims, and classifies them by confidence
+threshold. Each processed post is appended to an NDJSON journal for
+crash safety; the journal is compacted into the claims JSON file at the
+end of a run or on demand. A processed-post index next to the claims file
+lets reruns skip posts that were already extracted. An optional model
+cascade sends posts to a cheaper model first and escalates only
+ambiguous results to GPT-4o.
 """
 
+import hashlib
 import json
 import logging
-
-import requests
-
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+from collectors import http_client
 from collectors.config import (
     OPENROUTER_API_KEY, OPENROUTER_CHAT_URL,
     CONFIDENCE_AUTO_ACCEPT, CONFIDENCE_NEEDS_REVIEW,
-    CLAIMS_FILE,
+    CLAIMS_FILE, EXTRACTION_WORKERS, EXTRACTION_BATCH_SIZE, JOURNAL_FSYNC_EVERY,
+    LLM_CACHE_FILE, LLM_CACHE_MAX_BYTES, EXTRACTION_ADAPTIVE_INITIAL,
+    EXTRACTION_LATENCY_FACTOR,
 )
 from collectors.retry_utils import retry_with_backoff, check_response_retryable
-from collectors.file_utils import save_json_atomic, load_json_safe
-from claims.prompts import build_extraction_prompt
+from collectors.file_utils import NdjsonJournal, compact_ndjson, read_ndjson
+from claims.prompts import build_extraction_prompt, build_batch_extraction_prompt
+from claims.prefilter import prefilter_post
+from claims.dedup import cluster_posts, link_claims
+from claims.response_cache import ResponseCache, cache_key
+from claims.concurrency import AdaptiveConcurrency
 
 logger = logging.getLogger(__name__)
 
 OPENROUTER_MODEL = "openai/gpt-4o"
+CASCADE_MODEL = "openai/gpt-4o-mini"
+OPENROUTER_TEMPERATURE = 0.1
+
+_response_cache = None
+
+
+def configure_response_cache(enabled=True, path=None, max_bytes=None, bypass=False):
+    """
+    Configure the response cache used by _call_openrouter().
+
+    Args:
+        enabled: If False, disable caching entirely.
+        path: SQLite database path (default: LLM_CACHE_FILE).
+        max_bytes: Maximum cache size in bytes (default: LLM_CACHE_MAX_BYTES).
+        bypass: If True, skip cache lookups but still store new responses.
+
+    Returns:
+        The new ResponseCache, or None if caching is disabled.
+    """
+    global _response_cache
+    if _response_cache is not None:
+        _response_cache.close()
+    _response_cache = None
+    if enabled:
+        _response_cache = ResponseCache(
+            path or LLM_CACHE_FILE,
+            max_bytes if max_bytes is not None else LLM_CACHE_MAX_BYTES,
+            bypass=bypass,
+        )
+    return _response_cache
+
+
+def get_response_cache():
+    """
+    Return the active response cache, or None if caching is disabled.
+
+    Returns:
+        ResponseCache instance or None.
+    """
+    return _response_cache
 
 
 def classify_claim(claim):
@@ -44,13 +101,134 @@ def classify_claim(claim):
         return "auto_rejected"
 
 
-@retry_with_backoff()
-def _call_openrouter(messages):
+class CascadeStats:
+    """
+    Thread-safe call counters for the model cascade.
+
+    Records API call counts and latency per model (tier), and how many
+    posts the cheap tier settled versus escalated to the strong model.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Clear all counters."""
+        with self._lock:
+            self.calls = {}
+            self.seconds = {}
+            self.settled = 0
+            self.escalated = 0
+
+    def record_call(self, model, seconds):
+        """
+        Record one completed chat completion call.
+
+        Args:
+            model: Model identifier the call was made with.
+            seconds: Wall-clock duration of the call.
+        """
+        with self._lock:
+            self.calls[model] = self.calls.get(model, 0) + 1
+            self.seconds[model] = self.seconds.get(model, 0.0) + seconds
+
+    def record_outcome(self, settled, escalated):
+        """
+        Record how many posts the cheap tier settled or escalated.
+
+        Args:
+            settled: Number of posts accepted from the cheap model.
+            escalated: Number of posts re-sent to the strong model.
+        """
+        with self._lock:
+            self.settled += settled
+            self.escalated += escalated
+
+    def summary(self):
+        """
+        Return a snapshot of the counters.
+
+        Returns:
+            Dict with per-model 'tiers' ({model: {'calls', 'mean_latency'}}),
+            'settled', and 'escalated'.
+        """
+        with self._lock:
+            tiers = {
+                model: {
+                    "calls": calls,
+                    "mean_latency": self.seconds[model] / calls,
+                }
+                for model, calls in self.calls.items()
+            }
+            return {"tiers": tiers, "settled": self.settled,
+                    "escalated": self.escalated}
+
+
+cascade_stats = CascadeStats()
+
+# Limits in-flight OpenRouter requests; extract_all_claims() configures it
+openrouter_concurrency = AdaptiveConcurrency(initial=EXTRACTION_WORKERS,
+                                             latency_factor=EXTRACTION_LATENCY_FACTOR)
+
+
+def _call_openrouter(messages, model=None):
+    """
+    Get a chat completion for the messages, using the response cache.
+
+    Checks the response cache (see configure_response_cache()) before
+    calling the API. Only responses that parse as JSON are stored, so a
+    malformed reply is requested again on the next run. Call latency is
+    recorded per model in cascade_stats.
+
+    Args:
+        messages: List of message dicts for the API.
+        model: OpenRouter model identifier (default: OPENROUTER_MODEL).
+
+    Returns:
+        Parsed response content string.
+
+    Raises:
+        RetryableError: On transient HTTP errors.
+        requests.HTTPError: On non-retryable HTTP errors.
+    """
+    if model is None:
+        model = OPENROUTER_MODEL
+    started = time.monotonic()
+    cache = _response_cache
+    if cache is None:
+        content = _request_completion(messages, model)
+    else:
+        key = cache_key(model, OPENROUTER_TEMPERATURE, messages)
+        content = cache.get(key)
+        if content is None:
+            content = _request_completion(messages, model)
+            if _is_json(content):
+                cache.put(key, content)
+    cascade_stats.record_call(model, time.monotonic() - started)
+    return content
+
+
+def _is_json(content):
+    """Return True if content is a string holding valid JSON."""
+    try:
+        json.loads(content)
+    except (json.JSONDecodeError, TypeError):
+        return False
+    return True
+
+
+@retry_with_backoff(endpoint="openrouter")
+def _request_completion(messages, model=OPENROUTER_MODEL):
     """
     Call the OpenRouter chat completions API.
 
+    Each attempt holds an openrouter_concurrency slot, so the controller
+    sees every 429/5xx before the retry decorator handles it.
+
     Args:
         messages: List of message dicts for the API.
+        model: OpenRouter model identifier (default: OPENROUTER_MODEL).
 
     Returns:
         Parsed response content string.
@@ -59,27 +237,27 @@ def _call_openrouter(messages):
         RetryableError: On transient HTTP errors.
         requests.HTTPError: On non-retryable HTTP errors.
     """
-    resp = requests.post(
-        OPENROUTER_CHAT_URL,
-        headers={
-            "Authorization": f"Bearer {OPENROUTER_API_KEY}",
-            "Content-Type": "application/json",
-        },
-        json={
-            "model": OPENROUTER_MODEL,
-            "messages": messages,
-            "temperature": 0.1,
-        },
-        timeout=60,
-    )
-    check_response_retryable(resp)
+    with openrouter_concurrency.slot():
+        resp = http_client.post(
+            OPENROUTER_CHAT_URL,
+            headers={
+                "Authorization": f"Bearer {OPENROUTER_API_KEY}",
+                "Content-Type": "application/json",
+            },
+            json={
+                "model": model,
+                "messages": messages,
+                "temperature": OPENROUTER_TEMPERATURE,
+            },
+        )
+        check_response_retryable(resp)
     data = resp.json()
 
     content = data["choices"][0]["message"]["content"]
     return content
 
 
-def extract_claims_from_post(post):
+def extract_claims_from_post(post, model=None):
     """
     Extract factual claims from a single post using GPT-4o.
 
@@ -88,6 +266,7 @@ def extract_claims_from_post(post):
 
     Args:
         post: Dict in unified post schema format.
+        model: OpenRouter model identifier (default: OPENROUTER_MODEL).
 
     Returns:
         List of claim dicts, each with added 'status', 'post_id',
@@ -101,7 +280,7 @@ def extract_claims_from_post(post):
     messages = build_extraction_prompt(post_text)
 
     try:
-        content = _call_openrouter(messages)
+        content = _call_openrouter(messages, model=model)
         parsed = json.loads(content)
         raw_claims = parsed.get("claims", [])
     except (json.JSONDecodeError, KeyError, TypeError) as e:
@@ -109,7 +288,21 @@ def extract_claims_from_post(post):
                       post.get("id", "?"), str(e))
         return []
 
-    # Enrich each claim with metadata
+    return _enrich_claims(raw_claims, post)
+
+
+def _enrich_claims(raw_claims, post):
+    """
+    Classify raw claims and add metadata from the source post.
+
+    Args:
+        raw_claims: List of claim dicts as returned by the model.
+        post: Dict in unified post schema format.
+
+    Returns:
+        List of claim dicts with added 'status', 'post_id', 'platform',
+        and 'post_url' fields.
+    """
     claims = []
     for claim in raw_claims:
         claim["status"] = classify_claim(claim)
@@ -117,46 +310,545 @@ def extract_claims_from_post(post):
         claim["platform"] = post.get("platform", "")
         claim["post_url"] = post.get("url", "")
         claims.append(claim)
-
     return claims
 
 
-def extract_all_claims(posts, output_path=None):
+def _valid_claims(raw_claims):
     """
-    Extract claims from all posts, saving incrementally after each.
+    Check that a model's claims value is a list of well-formed claim dicts.
+
+    Args:
+        raw_claims: The 'claims' value from a parsed model response.
+
+    Returns:
+        True if it is a list of dicts that each carry a numeric 'confidence'.
+    """
+    return isinstance(raw_claims, list) and all(
+        isinstance(claim, dict) and
+        isinstance(claim.get("confidence"), (int, float)) and
+        not isinstance(claim.get("confidence"), bool)
+        for claim in raw_claims
+    )
 
-    Processes posts one at a time for reliability. If a post fails,
-    logs the error and continues with the next post. Saves the
-    accumulated claims to disk after each successful extraction.
+
+def _batch_tags(posts):
+    """
+    Return a unique tag per post for a batch prompt, based on its id.
 
     Args:
         posts: List of post dicts in unified schema.
-        output_path: Path to save claims JSON (default: CLAIMS_FILE).
 
     Returns:
-        List of all extracted claim dicts.
+        List of tag strings aligned with posts.
+    """
+    tags = []
+    seen = set()
+    for n, post in enumerate(posts, 1):
+        tag = str(post.get("id") or f"post_{n}")
+        if tag in seen:
+            tag = f"{tag}#{n}"
+        seen.add(tag)
+        tags.append(tag)
+    return tags
+
+
+def _request_batch(batch, model):
+    """
+    Send one batch prompt and return the raw claims per tag.
+
+    Args:
+        batch: List of (tag, post) tuples with non-empty text.
+        model: OpenRouter model identifier.
+
+    Returns:
+        Dict mapping each tag found in a well-formed response entry to
+        its list of raw claim dicts. Entries whose claims are not all
+        dicts with a numeric confidence are left out.
+
+    Raises:
+        Exception: If the API call fails or the response is not a JSON
+            object with a 'posts' object.
+    """
+    messages = build_batch_extraction_prompt(
+        [(tag, post["text"]) for tag, post in batch]
+    )
+    content = _call_openrouter(messages, model=model)
+    by_tag = json.loads(content)["posts"]
+    if not isinstance(by_tag, dict):
+        raise TypeError("'posts' is not an object")
+    return {
+        tag: entry["claims"] for tag, entry in by_tag.items()
+        if isinstance(entry, dict) and _valid_claims(entry.get("claims"))
+    }
+
+
+def extract_claims_from_batch(posts, model=None):
+    """
+    Extract factual claims from several posts with a single API call.
+
+    Packs the posts into one batch prompt tagged by post id and splits the
+    response back out per post. Posts missing from the response or with
+    malformed claims, or every post if the response cannot be parsed, fall
+    back to individual extract_claims_from_post() calls.
+
+    Args:
+        posts: List of post dicts in unified schema.
+        model: OpenRouter model identifier (default: OPENROUTER_MODEL).
+
+    Returns:
+        List aligned with posts; each item is a list of claim dicts, or
+        None if that post's fallback extraction raised an exception.
+    """
+    results = [None] * len(posts)
+    batch = []
+    for i, (tag, post) in enumerate(zip(_batch_tags(posts), posts)):
+        if post.get("text", "").strip():
+            batch.append((i, tag, post))
+        else:
+            logger.warning("Skipping post %s: empty text", post.get("id", "?"))
+            results[i] = []
+
+    if not batch:
+        return results
+
+    try:
+        by_tag = _request_batch([(tag, post) for _, tag, post in batch], model)
+        parsed = True
+    except Exception as e:
+        logger.error("Batch of %d posts failed, falling back to single-post calls: %s",
+                      len(batch), str(e))
+        by_tag = {}
+        parsed = False
+
+    for i, tag, post in batch:
+        if tag in by_tag:
+            results[i] = _enrich_claims(by_tag[tag], post)
+        else:
+            if parsed:
+                logger.warning("Post %s missing or malformed in batch response, "
+                               "retrying alone", tag)
+            results[i] = _extract_post_safely(post, model)
+    return results
+
+
+def _extract_post_safely(post, model=None):
+    """
+    Extract claims from a single post, isolating any failure.
+
+    Args:
+        post: Dict in unified post schema format.
+        model: OpenRouter model identifier (default: OPENROUTER_MODEL).
+
+    Returns:
+        List of claim dicts, or None if extraction raised an exception.
+    """
+    try:
+        return extract_claims_from_post(post, model=model)
+    except Exception as e:
+        logger.error("  Failed to process post %s: %s",
+                      post.get("id", "?"), str(e))
+        return None
+
+
+def _try_cascade_tier(posts):
+    """
+    Run the cheap cascade model over posts without any fallbacks.
+
+    Args:
+        posts: List of post dicts in unified schema.
+
+    Returns:
+        List aligned with posts of enriched claim lists, or None for posts
+        whose response failed, could not be parsed, or held malformed claims.
+    """
+    results = [None] * len(posts)
+    batch = []
+    for i, (tag, post) in enumerate(zip(_batch_tags(posts), posts)):
+        if post.get("text", "").strip():
+            batch.append((i, tag, post))
+        else:
+            results[i] = []
+    if not batch:
+        return results
+
+    try:
+        if len(batch) == 1:
+            i, tag, post = batch[0]
+            content = _call_openrouter(build_extraction_prompt(post["text"]),
+                                       model=CASCADE_MODEL)
+            raw_claims = json.loads(content)["claims"]
+            if not _valid_claims(raw_claims):
+                raise TypeError("'claims' is not a list of claim objects")
+            by_tag = {tag: raw_claims}
+        else:
+            by_tag = _request_batch([(tag, post) for _, tag, post in batch],
+                                    CASCADE_MODEL)
+        for i, tag, post in batch:
+            if tag in by_tag:
+                results[i] = _enrich_claims(by_tag[tag], post)
+    except Exception as e:
+        logger.warning("Cascade model failed for %d posts, escalating: %s",
+                       len(batch), str(e))
+    return results
+
+
+def _extract_with_cascade(posts):
+    """
+    Extract claims with the cheap model first, escalating when unsure.
+
+    A post is re-sent to OPENROUTER_MODEL when the cheap model's response
+    failed or did not parse, or when any of its claims falls in the
+    'needs_review' confidence band of classify_claim().
+
+    Args:
+        posts: List of post dicts in unified schema.
+
+    Returns:
+        List aligned with posts of claim lists (None for failed posts).
+    """
+    results = _try_cascade_tier(posts)
+    escalate = [
+        i for i, claims in enumerate(results)
+        if claims is None or any(c["status"] == "needs_review" for c in claims)
+    ]
+    cascade_stats.record_outcome(len(posts) - len(escalate), len(escalate))
+    if escalate:
+        logger.info("  Escalating %d/%d posts to %s",
+                    len(escalate), len(posts), OPENROUTER_MODEL)
+        strong = _extract_unit_safely([posts[i] for i in escalate])
+        for i, claims in zip(escalate, strong):
+            results[i] = claims
+    return results
+
+
+def _extract_unit_safely(posts, cascade=False):
+    """
+    Extract claims from a unit of work: one post or one batch of posts.
+
+    Args:
+        posts: List of post dicts in unified schema.
+        cascade: If True, try CASCADE_MODEL first (see _extract_with_cascade()).
+
+    Returns:
+        List aligned with posts of claim lists (None for failed posts).
+    """
+    if cascade:
+        return _extract_with_cascade(posts)
+    if len(posts) == 1:
+        return [_extract_post_safely(posts[0])]
+    return extract_claims_from_batch(posts)
+
+
+def claims_journal_path(output_path=None):
+    """
+    Return the path of the NDJSON journal that backs a claims file.
+
+    Args:
+        output_path: Path to the claims JSON file (default: CLAIMS_FILE).
+
+    Returns:
+        Journal path next to the claims file, e.g. 'claims.journal.ndjson'.
     """
     if output_path is None:
         output_path = CLAIMS_FILE
+    root, _ = os.path.splitext(output_path)
+    return f"{root}.journal.ndjson"
 
-    all_claims = []
-    total = len(posts)
 
-    for i, post in enumerate(posts, 1):
-        logger.info("Processing post %d/%d (id: %s, platform: %s)...",
-                     i, total, post.get("id", "?"), post.get("platform", "?"))
+def claims_index_path(output_path=None):
+    """
+    Return the path of the processed-post index that backs a claims file.
 
-        try:
-            claims = extract_claims_from_post(post)
-            all_claims.extend(claims)
-            logger.info("  Found %d claims", len(claims))
-        except Exception as e:
-            logger.error("  Failed to process post %s: %s",
-                          post.get("id", "?"), str(e))
-            continue
+    Args:
+        output_path: Path to the claims JSON file (default: CLAIMS_FILE).
 
-        # Save incrementally after each post
-        save_json_atomic(all_claims, output_path)
+    Returns:
+        Index path next to the claims file, e.g. 'claims.index.ndjson'.
+    """
+    if output_path is None:
+        output_path = CLAIMS_FILE
+    root, _ = os.path.splitext(output_path)
+    return f"{root}.index.ndjson"
+
+
+def text_hash(text):
+    """
+    Return a short, stable hash of a post's text.
+
+    Args:
+        text: Post text string.
 
-    logger.info("Extraction complete: %d claims from %d posts", len(all_claims), total)
+    Returns:
+        First 16 hex characters of the SHA-256 digest of the text.
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def processed_key(post):
+    """
+    Return the processed-post index key for a post.
+
+    The key combines platform, post id, and text hash, so a post is
+    extracted again if its text changes.
+
+    Args:
+        post: Dict in unified post schema format.
+
+    Returns:
+        Key string of the form 'platform:id:texthash'.
+    """
+    return (f"{post.get('platform', '')}:{post.get('id', '')}:"
+            f"{text_hash(post.get('text', ''))}")
+
+
+def prefiltered_key(key, threshold):
+    """
+    Return the index key recording that a post was pre-filtered out.
+
+    Args:
+        key: The post's key from processed_key().
+        threshold: Pre-filter threshold the post scored below.
+
+    Returns:
+        Key string of the form 'platform:id:texthash@prefilter<threshold'.
+    """
+    return f"{key}@prefilter<{threshold:g}"
+
+
+def load_processed_index(output_path=None):
+    """
+    Load the set of processed-post keys recorded for a claims file.
+
+    Args:
+        output_path: Path to the claims JSON file (default: CLAIMS_FILE).
+
+    Returns:
+        Set of keys as returned by processed_key().
+    """
+    return {record["key"] for record in read_ndjson(claims_index_path(output_path))
+            if "key" in record}
+
+
+def _latest_claims_per_post(records):
+    """
+    Yield the claims of the latest journal record for each post.
+
+    A post re-extracted after its text changed appears in the journal
+    more than once; the newest record replaces the older one but keeps
+    the position where the post first appeared.
+    """
+    latest = {}
+    for record in records:
+        latest[(record.get("platform", ""), record.get("post_id", ""))] = record
+    for record in latest.values():
+        yield from record.get("claims", [])
+
+
+def compact_claims(output_path=None):
+    """
+    Rebuild the claims JSON file from its journal.
+
+    Args:
+        output_path: Path to the claims JSON file (default: CLAIMS_FILE).
+
+    Returns:
+        List of all claim dicts written to output_path.
+    """
+    if output_path is None:
+        output_path = CLAIMS_FILE
+    return compact_ndjson(claims_journal_path(output_path), output_path,
+                          transform=_latest_claims_per_post)
+
+
+def extract_all_claims(posts, output_path=None, workers=None, resume=True,
+                       batch_size=None, prefilter_threshold=None, cascade=False,
+                       dedup_distance=None, adaptive=False):
+    """
+    Extract claims from all posts, journaling each one as it completes.
+
+    Posts are grouped into units of ``batch_size`` posts; a unit of one
+    post is sent as a single-post prompt, larger units as one batch prompt
+    (see extract_claims_from_batch()). With a single worker, units are
+    processed one at a time. With more workers, up to ``workers`` API
+    calls run concurrently in a thread pool; results are still consumed in
+    input order, so claims keep the same order as the posts. If a post
+    fails, logs the error and continues with the next post.
+
+    With ``adaptive``, ``workers`` is an upper bound: the number of
+    requests actually in flight starts at EXTRACTION_ADAPTIVE_INITIAL and
+    is moved by openrouter_concurrency (see claims.concurrency), rising
+    while OpenRouter answers quickly and falling on 429/5xx or rising
+    latency.
+
+    Each completed post is appended as one line to the claims journal
+    (see claims_journal_path()) and its key to the processed-post index
+    (see claims_index_path()); both are fsynced every JOURNAL_FSYNC_EVERY
+    posts. When resuming, posts whose key is already in the index are
+    skipped, so a rerun after a crash or a new collection only pays for
+    new or changed posts. Repeats of a post within ``posts`` (same
+    platform, id, and text) are extracted once. The claims JSON file is
+    built from the journal once, at the end of the run, and covers every
+    post ever journaled.
+
+    If ``prefilter_threshold`` is set, posts scoring below it in the local
+    pre-filter (see claims.prefilter) are not sent to the API. They are
+    journaled with no claims and a 'skipped' reason, so they are not lost
+    silently, and indexed under a key tied to that threshold (see
+    prefiltered_key()). A later run with the same threshold skips them
+    again; a run with another threshold or without the pre-filter
+    reconsiders them.
+
+    If ``dedup_distance`` is set, the posts left to extract are clustered
+    by near-duplicate text (see claims.dedup). Only the first post of each
+    cluster is sent to the API. Its claims are copied to every other
+    member, re-attributed to that post and tagged with 'duplicate_of'.
+    Members are journaled and indexed like extracted posts.
+
+    Args:
+        posts: List of post dicts in unified schema.
+        output_path: Path to save claims JSON (default: CLAIMS_FILE).
+        workers: Maximum number of concurrent API calls
+            (default: EXTRACTION_WORKERS).
+        resume: If True, skip posts recorded in the processed-post index.
+            If False, discard the journal and index and start over.
+        batch_size: Number of posts packed into one API call
+            (default: EXTRACTION_BATCH_SIZE).
+        prefilter_threshold: Minimum pre-filter score for a post to be
+            extracted, or None to send every post to the API.
+        cascade: If True, run CASCADE_MODEL first and escalate only
+            ambiguous or unparseable posts to OPENROUTER_MODEL.
+        dedup_distance: Maximum SimHash distance for two posts to count as
+            near-duplicates, or None to extract every post.
+        adaptive: If True, adapt the number of in-flight API requests
+            between 1 and ``workers`` to OpenRouter's load.
+
+    Returns:
+        List of all extracted claim dicts.
+    """
+    if output_path is None:
+        output_path = CLAIMS_FILE
+    if workers is None:
+        workers = EXTRACTION_WORKERS
+    if batch_size is None:
+        batch_size = EXTRACTION_BATCH_SIZE
+    workers = max(1, workers)
+    batch_size = max(1, batch_size)
+    openrouter_concurrency.configure(
+        min(EXTRACTION_ADAPTIVE_INITIAL, workers) if adaptive else workers,
+        maximum=workers, adaptive=adaptive,
+    )
+
+    processed = load_processed_index(output_path) if resume else set()
+    seen = set()
+    todo = []
+    prefiltered = []
+    skipped = duplicates = 0
+    for post in posts:
+        key = processed_key(post)
+        if key in seen:
+            duplicates += 1
+            continue
+        seen.add(key)
+        if key in processed:
+            skipped += 1
+            continue
+        if prefilter_threshold is not None:
+            filter_key = prefiltered_key(key, prefilter_threshold)
+            if filter_key in processed:
+                skipped += 1
+                continue
+            keep, reason = prefilter_post(post, prefilter_threshold)
+            if not keep:
+                prefiltered.append((filter_key, post, reason))
+                continue
+        todo.append((key, post))
+
+    members = {}
+    if dedup_distance is not None and todo:
+        clusters = cluster_posts([post for _, post in todo], max_distance=dedup_distance)
+        members = {todo[c[0]][0]: [todo[i] for i in c[1:]] for c in clusters if len(c) > 1}
+        todo = [todo[c[0]] for c in clusters]
+        if members:
+            logger.info("Near-duplicate detection: %d posts share claims with %d "
+                        "representatives", sum(len(m) for m in members.values()),
+                        len(members))
+
+    total = len(todo)
+    if skipped:
+        logger.info("Skipping %d already-processed posts", skipped)
+    if duplicates:
+        logger.info("Skipping %d duplicate posts (same platform, id and text) "
+                    "in this run", duplicates)
+    if prefiltered:
+        logger.info("Pre-filter skipped %d posts unlikely to contain claims",
+                    len(prefiltered))
+    units = [todo[i:i + batch_size] for i in range(0, total, batch_size)]
+
+    journal = NdjsonJournal(claims_journal_path(output_path),
+                            fsync_every=JOURNAL_FSYNC_EVERY, truncate=not resume)
+    index = NdjsonJournal(claims_index_path(output_path),
+                          fsync_every=JOURNAL_FSYNC_EVERY, truncate=not resume)
+    done = 0
+
+    def write(key, post, claims, skipped=None, duplicate_of=None):
+        entry = {
+            "post_id": post.get("id", ""),
+            "platform": post.get("platform", ""),
+            "text_hash": text_hash(post.get("text", "")),
+            "claims": claims,
+        }
+        if skipped:
+            entry["skipped"] = skipped
+        if duplicate_of is not None:
+            entry["duplicate_of"] = duplicate_of
+        # Journal first: an indexed post must always have its claims on disk.
+        journal.append(entry)
+        index.append({"key": key})
+
+    def record(unit, results):
+        nonlocal done
+        for (key, post), claims in zip(unit, results):
+            done += 1
+            logger.info("Processed post %d/%d (id: %s, platform: %s)",
+                         done, total, post.get("id", "?"), post.get("platform", "?"))
+            if claims is None:
+                continue
+            logger.info("  Found %d claims", len(claims))
+            write(key, post, claims)
+            for member_key, member in members.get(key, []):
+                write(member_key, member, link_claims(claims, member, post),
+                      duplicate_of=post.get("id", ""))
+
+    def run(unit):
+        return _extract_unit_safely([post for _, post in unit], cascade=cascade)
+
+    with journal, index:
+        for key, post, reason in prefiltered:
+            write(key, post, [], skipped=reason)
+        if workers == 1:
+            for unit in units:
+                record(unit, run(unit))
+        else:
+            if adaptive:
+                logger.info("Extracting with up to %d concurrent workers (adaptive)",
+                            workers)
+            else:
+                logger.info("Extracting with %d concurrent workers", workers)
+            # Keep a bounded window of in-flight units and consume it in
+            # input order, so the journal order matches the sequential path.
+            window = workers * 2
+            pending = deque()
+            unit_iter = iter(units)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for unit in islice(unit_iter, window):
+                    pending.append((unit, executor.submit(run, unit)))
+                while pending:
+                    unit, future = pending.popleft()
+                    record(unit, future.result())
+                    for next_unit in islice(unit_iter, 1):
+                        pending.append((next_unit, executor.submit(run, next_unit)))
+
+    all_claims = compact_claims(output_path)
+    logger.info("Extraction complete: %d claims from %d new posts",
+                len(all_claims), total)
     return all_claims
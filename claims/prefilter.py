@@ -0,0 +1,115 @@
+"""
+Local pre-filter for claims extraction.
+
+Scores a post's text with cheap heuristics before any LLM call, so posts
+that are very unlikely to contain a factual claim (pure opinion, emoji,
+one-word replies) can be skipped. The score combines:
+
+- numbers, percentages, and currency amounts
+- named-entity-like capitalization (mid-sentence capitals, acronyms,
+  CamelCase names); a single such word counts for half
+- attribution verbs ("according to", "reported", "announced", ...)
+- a minimum length, below which the score is halved
+"""
+
+import re
+
+from collectors.config import PREFILTER_MIN_WORDS
+
+# Signal weights; the total score is capped at 1.0
+NUMBER_WEIGHT = 0.35
+QUANTITY_WEIGHT = 0.10
+ENTITY_WEIGHT = 0.25
+ATTRIBUTION_WEIGHT = 0.30
+
+_MENTION_RE = re.compile(r"[@#]\w+")
+_URL_RE = re.compile(r"https?://\S+")
+_NUMBER_RE = re.compile(r"\d")
+_QUANTITY_RE = re.compile(
+    r"\d\s?%|\bper ?cent\b|[$€£₹¥]\s?\d|"
+    r"\d\s?(?:k|m|bn|mn|crore|lakh|thousand|million|billion|trillion)\b|"
+    r"\b(?:usd|inr|eur|gbp|rs\.?)\s?\d",
+    re.IGNORECASE,
+)
+_ATTRIBUTION_RE = re.compile(
+    r"\b(?:according to|reportedly|report(?:s|ed)?|sa(?:y|ys|id)|"
+    r"announc(?:e|es|ed)|confirm(?:s|ed)?|stat(?:es|ed)|reveal(?:s|ed)|"
+    r"estimat(?:e|es|ed)|data shows?|study|survey|official(?:s|ly)?)\b",
+    re.IGNORECASE,
+)
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+_WORD_RE = re.compile(r"[^\W\d_][\w'’-]*")
+_ACRONYM_RE = re.compile(r"^[A-Z]{2,}$")
+_CAMEL_RE = re.compile(r"^[A-Z]?[a-z]+[A-Z]\w*$")
+
+
+def _count_entities(text):
+    """Count distinct named-entity-like capitalized words in the text."""
+    entities = set()
+    for sentence in _SENTENCE_SPLIT_RE.split(text):
+        words = _WORD_RE.findall(sentence)
+        for position, word in enumerate(words):
+            if (_ACRONYM_RE.match(word) or _CAMEL_RE.match(word) or
+                    (position > 0 and word[0].isupper() and word != "I")):
+                entities.add(word)
+    return len(entities)
+
+
+def score_post(text, min_words=None):
+    """
+    Score how likely a post's text is to contain a factual claim.
+
+    Args:
+        text: The post text.
+        min_words: Posts with fewer words have their score halved
+            (default: PREFILTER_MIN_WORDS).
+
+    Returns:
+        Tuple of (score, signals): a float between 0.0 and 1.0 and the
+        list of signal names that contributed to it.
+    """
+    if min_words is None:
+        min_words = PREFILTER_MIN_WORDS
+
+    cleaned = _MENTION_RE.sub(" ", _URL_RE.sub(" ", text or ""))
+    score = 0.0
+    signals = []
+
+    if _NUMBER_RE.search(cleaned):
+        score += NUMBER_WEIGHT
+        signals.append("numbers")
+        if _QUANTITY_RE.search(cleaned):
+            score += QUANTITY_WEIGHT
+            signals.append("quantities")
+    entities = _count_entities(cleaned)
+    if entities:
+        # A single capitalized word (e.g. "AI") is weak evidence on its own
+        score += ENTITY_WEIGHT if entities > 1 else ENTITY_WEIGHT / 2
+        signals.append("entities")
+    if _ATTRIBUTION_RE.search(cleaned):
+        score += ATTRIBUTION_WEIGHT
+        signals.append("attribution")
+    if len(_WORD_RE.findall(cleaned)) < min_words:
+        score *= 0.5
+        signals.append("short")
+
+    return round(min(score, 1.0), 2), signals
+
+
+def prefilter_post(post, threshold):
+    """
+    Decide whether a post should be sent to the LLM.
+
+    Args:
+        post: Dict in unified post schema format.
+        threshold: Minimum score (0.0-1.0) for a post to be extracted.
+
+    Returns:
+        Tuple of (keep, reason). ``reason`` is None for kept posts and a
+        human-readable explanation for skipped ones.
+    """
+    score, signals = score_post(post.get("text", ""))
+    if score >= threshold:
+        return True, None
+    found = ", ".join(signals) if signals else "no signals"
+    return False, f"prefilter score {score:.2f} < {threshold:.2f} ({found})"
@@ -2,9 +2,12 @@
 Prompts for factual claims extraction using GPT-4o.
 
 Contains the system prompt, few-shot examples, and prompt construction
-functions for extracting factual claims from social media posts.
+functions for extracting factual claims from social media posts, either
+one post per request or several posts packed into a single request.
 """
 
+import json
+
 SYSTEM_PROMPT = """You are a factual claims extraction system. Your job is to analyze social media posts and extract specific factual claims — statements that can be verified as true or false.
 
 Rules:
@@ -82,3 +85,74 @@ def build_extraction_prompt(post_text):
         "content": f"Analyze this social media post for factual claims:\n\n\"{post_text}\""
     })
     return messages
+
+
+BATCH_SYSTEM_PROMPT = SYSTEM_PROMPT + """
+
+Batch mode:
+You may receive several posts in one message. Each post starts with a line of the form [post_id: ID] followed by the quoted post text.
+Apply the rules above to each post independently and return one entry per post ID, using an empty claims array for posts with no factual claims.
+
+Batch response format:
+{"posts": {"ID": {"claims": [...]}, "ID2": {"claims": [...]}}}"""
+
+
+def _format_batch(tagged_posts):
+    """
+    Format (post_id, text) pairs as a single batch user message.
+
+    Args:
+        tagged_posts: List of (post_id, post_text) tuples.
+
+    Returns:
+        Message content string listing each post under its ID.
+    """
+    sections = [f"[post_id: {post_id}]\n\"{text}\"" for post_id, text in tagged_posts]
+    return ("Analyze each of these social media posts for factual claims:\n\n"
+            + "\n\n".join(sections))
+
+
+def _build_batch_few_shot():
+    """
+    Pack the single-post few-shot examples into one batch example.
+
+    Returns:
+        List with one user message and one assistant message.
+    """
+    tagged_posts = []
+    results = {}
+    for n, i in enumerate(range(0, len(FEW_SHOT_EXAMPLES), 2), 1):
+        user, assistant = FEW_SHOT_EXAMPLES[i], FEW_SHOT_EXAMPLES[i + 1]
+        text = user["content"].split("\n\n", 1)[1].strip('"')
+        post_id = f"example_{n}"
+        tagged_posts.append((post_id, text))
+        results[post_id] = json.loads(assistant["content"])
+    return [
+        {"role": "user", "content": _format_batch(tagged_posts)},
+        {"role": "assistant", "content": json.dumps({"posts": results}, ensure_ascii=False)},
+    ]
+
+
+BATCH_FEW_SHOT_EXAMPLES = _build_batch_few_shot()
+
+
+def build_batch_extraction_prompt(tagged_posts):
+    """
+    Build the message list for extracting claims from several posts at once.
+
+    The system prompt and few-shot examples are sent once for the whole
+    batch instead of once per post.
+
+    Args:
+        tagged_posts: List of (post_id, post_text) tuples. IDs must be
+            unique within the batch.
+
+    Returns:
+        List of message dicts with 'role' and 'content' keys.
+    """
+    messages = [
+        {"role": "system", "content": BATCH_SYSTEM_PROMPT},
+    ]
+    messages.extend(BATCH_FEW_SHOT_EXAMPLES)
+    messages.append({"role": "user", "content": _format_batch(tagged_posts)})
+    return messages
@@ -0,0 +1,197 @@
+"""
+Persistent, content-addressed cache for LLM responses.
+
+Responses are stored in a SQLite database keyed by a SHA-256 hash of the
+model, temperature, and full messages list, so an identical request
+(a rerun, a retweet with the same text, a test rerun) is answered from
+disk instead of the API. The cache is bounded by total response size
+and evicts least-recently-used entries first. The database runs in WAL
+mode with synchronous=NORMAL, and hits only rewrite an entry's access
+time once per TOUCH_RESOLUTION seconds, so lookups rarely touch disk.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Seconds within which a repeated hit does not rewrite an entry's
+# last_access; LRU order only needs to be coarse
+TOUCH_RESOLUTION = 60
+
+# Oldest entries read per eviction query
+EVICT_BATCH = 64
+
+
+def cache_key(model, temperature, messages):
+    """
+    Build the cache key for a chat completion request.
+
+    Args:
+        model: Model identifier string (e.g., 'openai/gpt-4o').
+        temperature: Sampling temperature.
+        messages: List of message dicts sent to the API.
+
+    Returns:
+        Hex SHA-256 digest of the canonical JSON encoding of the request.
+    """
+    payload = json.dumps(
+        {"model": model, "temperature": temperature, "messages": messages},
+        sort_keys=True, ensure_ascii=False, separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    SQLite-backed LRU cache of LLM response strings.
+
+    Safe to share between threads. Tracks hit and miss counts for the
+    lifetime of the instance.
+    """
+
+    def __init__(self, path, max_bytes, bypass=False, touch_resolution=TOUCH_RESOLUTION):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path: Path to the SQLite database file.
+            max_bytes: Maximum total size of cached responses in bytes.
+                Least-recently-used entries are evicted beyond this.
+            bypass: If True, lookups always miss but new responses are
+                still stored, which refreshes the cache.
+            touch_resolution: Seconds within which repeated hits on an
+                entry do not update its last_access time.
+        """
+        dirpath = os.path.dirname(path)
+        if dirpath:
+            os.makedirs(dirpath, exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.bypass = bypass
+        self.touch_resolution = touch_resolution
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " response TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_responses_last_access"
+            " ON responses (last_access)"
+        )
+        self._conn.commit()
+        row = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+        self._total_bytes = row[0]
+
+    def get(self, key):
+        """
+        Look up a cached response and mark it as recently used.
+
+        The access time is only written back if it is older than
+        touch_resolution, so a burst of hits costs no disk writes.
+
+        Args:
+            key: Cache key from cache_key().
+
+        Returns:
+            The cached response string, or None on a miss or when bypassed.
+        """
+        with self._lock:
+            if self.bypass:
+                self.misses += 1
+                return None
+            row = self._conn.execute(
+                "SELECT response, last_access FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            now = time.time()
+            if now - row[1] >= self.touch_resolution:
+                self._conn.execute(
+                    "UPDATE responses SET last_access = ? WHERE key = ?", (now, key),
+                )
+                self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, key, response):
+        """
+        Store a response, evicting least-recently-used entries if needed.
+
+        Args:
+            key: Cache key from cache_key().
+            response: Response string to cache.
+        """
+        size = len(response.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._conn.execute(
+                "SELECT size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, size, last_access)"
+                " VALUES (?, ?, ?, ?)",
+                (key, response, size, time.time()),
+            )
+            self._total_bytes += size - (old[0] if old else 0)
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """Delete least-recently-used entries until under max_bytes."""
+        if self._total_bytes <= self.max_bytes:
+            return
+        evicted = 0
+        # Walk the last_access index a batch at a time; only the oldest
+        # few rows are read, however large the cache is
+        while self._total_bytes > self.max_bytes:
+            rows = self._conn.execute(
+                "SELECT key, size FROM responses ORDER BY last_access LIMIT ?",
+                (EVICT_BATCH,),
+            ).fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                if self._total_bytes <= self.max_bytes:
+                    break
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._total_bytes -= size
+                evicted += 1
+        logger.info("Evicted %d cached responses (%d bytes remain)",
+                    evicted, self._total_bytes)
+
+    def stats(self):
+        """
+        Return cache counters.
+
+        Returns:
+            Dict with 'hits', 'misses', 'entries', and 'bytes'.
+        """
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": entries,
+                "bytes": self._total_bytes,
+            }
+
+    def close(self):
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
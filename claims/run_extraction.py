@@ -5,15 +5,29 @@ Reads posts from data/posts.json, extracts factual claims using GPT-4o
 via OpenRouter, and saves results to data/claims.json.
 
 Usage:
-    python -m claims.run_extraction
+    python -m claims.run_extraction [--workers N] [--batch-size N] [--no-resume]
+                                    [--prefilter-threshold [SCORE]] [--cascade]
+                                    [--dedup [DISTANCE]] [--adaptive]
+                                    [--no-cache | --bypass-cache]
+    python -m claims.run_extraction --compact-only
 """
 
+import argparse
 import logging
 import sys
 
-from collectors.config import validate_keys, POSTS_FILE, CLAIMS_FILE
+from collectors.config import (
+    validate_keys, POSTS_FILE, CLAIMS_FILE, EXTRACTION_WORKERS,
+    EXTRACTION_BATCH_SIZE, PREFILTER_THRESHOLD, DEDUP_MAX_DISTANCE,
+    STORAGE_BACKEND, SQLITE_DB_FILE, EXTRACTION_STATS_FILE,
+)
+from collectors import metrics, sqlite_store
 from collectors.file_utils import load_json_safe
-from claims.extractor import extract_all_claims
+from collectors.retry_utils import breaker_states
+from claims.extractor import (
+    extract_all_claims, compact_claims, configure_response_cache,
+    cascade_stats, openrouter_concurrency,
+)
 
 logging.basicConfig(
     level=logging.INFO,
@@ -22,13 +36,94 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def main():
+def parse_args(argv=None):
+    """
+    Parse command-line arguments for claims extraction.
+
+    Args:
+        argv: Optional list of argument strings (default: sys.argv[1:]).
+
+    Returns:
+        Parsed argparse.Namespace object.
+    """
+    parser = argparse.ArgumentParser(
+        description="Extract factual claims from collected posts using GPT-4o."
+    )
+    parser.add_argument(
+        "--workers", type=int, default=EXTRACTION_WORKERS,
+        help=f"Number of concurrent OpenRouter requests (default: {EXTRACTION_WORKERS})"
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=EXTRACTION_BATCH_SIZE,
+        help=f"Number of posts packed into one OpenRouter request (default: {EXTRACTION_BATCH_SIZE})"
+    )
+    parser.add_argument(
+        "--prefilter-threshold", type=float, nargs="?", const=PREFILTER_THRESHOLD,
+        default=None, metavar="SCORE",
+        help=("Skip posts whose local pre-filter score is below SCORE "
+              f"(0-1; default when given without a value: {PREFILTER_THRESHOLD})")
+    )
+    parser.add_argument(
+        "--cascade", action="store_true",
+        help="Try a cheaper model first and escalate ambiguous posts to GPT-4o"
+    )
+    parser.add_argument(
+        "--dedup", type=int, nargs="?", const=DEDUP_MAX_DISTANCE, default=None,
+        metavar="DISTANCE",
+        help=("Extract one post per cluster of near-duplicate texts and link its "
+              "claims to the others (SimHash distance; default when given "
+              f"without a value: {DEDUP_MAX_DISTANCE})")
+    )
+    parser.add_argument(
+        "--adaptive", action="store_true",
+        help=("Adapt concurrent OpenRouter requests between 1 and --workers to "
+              "the provider's latency and 429/5xx rate")
+    )
+    parser.add_argument(
+        "--no-resume", dest="resume", action="store_false",
+        help="Re-extract every post instead of skipping already-processed ones"
+    )
+    cache_group = parser.add_mutually_exclusive_group()
+    cache_group.add_argument(
+        "--no-cache", action="store_true",
+        help="Disable the on-disk LLM response cache"
+    )
+    cache_group.add_argument(
+        "--bypass-cache", action="store_true",
+        help="Ignore cached responses but store fresh ones (refreshes the cache)"
+    )
+    parser.add_argument(
+        "--compact-only", action="store_true",
+        help="Rebuild the claims file from its journal without calling the API"
+    )
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+    if args.dedup is not None and not 0 <= args.dedup < 64:
+        parser.error("--dedup distance must be between 0 and 63")
+    return args
+
+
+def main(argv=None):
     """
     Main entry point for claims extraction.
 
     Validates the OpenRouter API key, loads posts from data/posts.json,
-    runs the extraction pipeline, and reports results.
+    runs the extraction pipeline, and reports results. Request/retry
+    stats are logged at the end and written to data/extraction_stats.json.
+
+    Args:
+        argv: Optional list of argument strings for testing.
     """
+    args = parse_args(argv)
+
+    if args.compact_only:
+        claims = compact_claims(CLAIMS_FILE)
+        logger.info("Compacted %d claims into %s", len(claims), CLAIMS_FILE)
+        return
+
     validate_keys('openrouter')
 
     posts = load_json_safe(POSTS_FILE, default=[])
@@ -39,18 +134,61 @@ def main():
     logger.info("Loaded %d posts from %s", len(posts), POSTS_FILE)
     logger.info("Extracting claims using GPT-4o via OpenRouter...")
 
-    claims = extract_all_claims(posts, CLAIMS_FILE)
+    cache = configure_response_cache(enabled=not args.no_cache,
+                                     bypass=args.bypass_cache)
+    metrics.registry.reset()
+    try:
+        claims = extract_all_claims(posts, CLAIMS_FILE, workers=args.workers,
+                                    resume=args.resume, batch_size=args.batch_size,
+                                    prefilter_threshold=args.prefilter_threshold,
+                                    cascade=args.cascade, dedup_distance=args.dedup,
+                                    adaptive=args.adaptive)
 
-    # Summary
-    auto_accepted = sum(1 for c in claims if c.get("status") == "auto_accepted")
-    needs_review = sum(1 for c in claims if c.get("status") == "needs_review")
-    auto_rejected = sum(1 for c in claims if c.get("status") == "auto_rejected")
+        # Summary
+        auto_accepted = sum(1 for c in claims if c.get("status") == "auto_accepted")
+        needs_review = sum(1 for c in claims if c.get("status") == "needs_review")
+        auto_rejected = sum(1 for c in claims if c.get("status") == "auto_rejected")
 
-    logger.info("Results saved to %s", CLAIMS_FILE)
-    logger.info("Summary: %d total claims", len(claims))
-    logger.info("  Auto-accepted (>=%.2f): %d", 0.85, auto_accepted)
-    logger.info("  Needs review (%.2f-%.2f): %d", 0.60, 0.85, needs_review)
-    logger.info("  Auto-rejected (<%.2f): %d", 0.60, auto_rejected)
+        logger.info("Results saved to %s", CLAIMS_FILE)
+        if STORAGE_BACKEND == "sqlite":
+            conn = sqlite_store.connect()
+            try:
+                count = sqlite_store.replace_claims(conn, claims)
+            finally:
+                conn.close()
+            logger.info("Mirrored %d claims into %s", count, SQLITE_DB_FILE)
+        logger.info("Summary: %d total claims", len(claims))
+        logger.info("  Auto-accepted (>=%.2f): %d", 0.85, auto_accepted)
+        logger.info("  Needs review (%.2f-%.2f): %d", 0.60, 0.85, needs_review)
+        logger.info("  Auto-rejected (<%.2f): %d", 0.60, auto_rejected)
+        stats = cascade_stats.summary()
+        for model, tier in stats["tiers"].items():
+            logger.info("Model %s: %d calls, %.2fs mean latency",
+                        model, tier["calls"], tier["mean_latency"])
+        if args.cascade:
+            logger.info("Cascade: %d posts settled by the cheap model, %d escalated",
+                        stats["settled"], stats["escalated"])
+        stats = openrouter_concurrency.stats()
+        if stats["requests"]:
+            logger.info("OpenRouter requests: %d (%.1f%% errors), p50 %.2fs, p95 %.2fs, "
+                        "final concurrency %d", stats["requests"],
+                        stats["errors"] * 100 / stats["requests"], stats["p50"] or 0.0,
+                        stats["p95"] or 0.0, stats["limit"])
+        if cache is not None:
+            stats = cache.stats()
+            logger.info("Response cache: %d hits, %d misses (%d entries, %.1f MB)",
+                        stats["hits"], stats["misses"], stats["entries"],
+                        stats["bytes"] / (1024 * 1024))
+    finally:
+        # Also on failure: the stats show which endpoint broke the run
+        extra = {
+            "circuit_breakers": breaker_states(),
+            "openrouter_concurrency": openrouter_concurrency.stats(),
+            "models": cascade_stats.summary(),
+        }
+        if cache is not None:
+            extra["response_cache"] = cache.stats()
+        metrics.report(EXTRACTION_STATS_FILE, extra)
 
 
 if __name__ == "__main__":
@@ -3,28 +3,46 @@ Shared BrightData Web Scraper API utilities.
 
 Provides trigger/poll/download functions for the BrightData datasets API,
 used by both Meta and TikTok collectors. Implements crash-safe snapshot ID
-persistence and polling with timeout.
+persistence (with a status that lets an interrupted run be resumed),
+polling of one or many snapshots with adaptive intervals
+and a monotonic deadline, and a streaming download that archives the raw
+body to disk while yielding records one at a time. collect_snapshot_records()
+ties these together: large input lists are split into chunks triggered as
+parallel snapshots, and downloaded snapshots sit behind a TTL cache keyed
+by dataset and normalized input, so repeat scrapes reuse the raw archive.
 """
 
+import glob
+import hashlib
 import json
 import logging
 import os
+import tempfile
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from urllib.parse import urlsplit, parse_qsl, urlencode
 
 import requests
 
+from collectors import http_client
 from collectors.config import (
     BRIGHTDATA_API_KEY, BRIGHTDATA_TRIGGER_URL, BRIGHTDATA_PROGRESS_URL,
     BRIGHTDATA_SNAPSHOT_URL, BRIGHTDATA_POLL_INTERVAL, BRIGHTDATA_POLL_TIMEOUT,
-    RAW_DIR,
+    BRIGHTDATA_POLL_BACKOFF, BRIGHTDATA_POLL_MAX_INTERVAL, RAW_DIR,
+    BRIGHTDATA_CACHE_TTL, BRIGHTDATA_CACHE_FILE, BRIGHTDATA_CHUNK_SIZE,
+    BRIGHTDATA_MAX_PARALLEL_TRIGGERS,
 )
 from collectors.retry_utils import retry_with_backoff, check_response_retryable
-from collectors.file_utils import save_json_atomic
+from collectors.file_utils import (
+    save_json_atomic, load_json_safe, iter_json_records, read_json_records,
+)
 
 logger = logging.getLogger(__name__)
 
 
-@retry_with_backoff()
+@retry_with_backoff(endpoint="brightdata")
 def trigger_collection(dataset_id, inputs):
     """
     Trigger a BrightData data collection.
@@ -43,7 +61,7 @@ def trigger_collection(dataset_id, inputs):
         RetryableError: On transient HTTP errors.
         requests.HTTPError: On non-retryable HTTP errors.
     """
-    resp = requests.post(
+    resp = http_client.post(
         BRIGHTDATA_TRIGGER_URL,
         params={"dataset_id": dataset_id, "format": "json"},
         headers={
@@ -51,7 +69,6 @@ def trigger_collection(dataset_id, inputs):
             "Content-Type": "application/json",
         },
         json=inputs,
-        timeout=30,
     )
     check_response_retryable(resp)
     data = resp.json()
@@ -63,21 +80,78 @@ def trigger_collection(dataset_id, inputs):
     logger.info("Triggered collection, snapshot_id: %s", snapshot_id)
 
     # Save snapshot_id for crash recovery
-    recovery_path = os.path.join(RAW_DIR, f'snapshot_{snapshot_id}.json')
-    save_json_atomic({"snapshot_id": snapshot_id, "dataset_id": dataset_id}, recovery_path)
+    save_json_atomic({
+        "snapshot_id": snapshot_id,
+        "dataset_id": dataset_id,
+        "status": "pending",
+        "triggered_at": datetime.now(timezone.utc).isoformat(),
+    }, _recovery_path(snapshot_id))
 
     return snapshot_id
 
 
-def poll_snapshot(snapshot_id, timeout=None, poll_interval=None, sleep_func=time.sleep):
+def _recovery_path(snapshot_id):
+    """Return the path of the crash-recovery file for a snapshot."""
+    return os.path.join(RAW_DIR, f'snapshot_{snapshot_id}.json')
+
+
+def _update_recovery(snapshot_id, status, **fields):
+    """
+    Record a new status in a snapshot's crash-recovery file, if it exists.
+
+    Args:
+        snapshot_id: The snapshot ID.
+        status: New status string ('downloaded' or 'failed').
+        **fields: Extra fields to store (e.g., raw_path).
+    """
+    path = _recovery_path(snapshot_id)
+    record = load_json_safe(path)
+    if record is None:
+        return
+    record.update(fields, status=status)
+    save_json_atomic(record, path)
+
+
+def find_pending_snapshots():
+    """
+    Find snapshots that were triggered but never downloaded.
+
+    Reads the crash-recovery files written by trigger_collection(). Files
+    without a status (written before statuses were recorded) count as
+    pending.
+
+    Returns:
+        List of recovery dicts with 'snapshot_id' and 'dataset_id', oldest
+        first.
+    """
+    pending = []
+    for path in sorted(glob.glob(os.path.join(RAW_DIR, 'snapshot_*.json')),
+                       key=os.path.getmtime):
+        try:
+            record = load_json_safe(path)
+        except json.JSONDecodeError:
+            logger.warning("Skipping unreadable recovery file %s", path)
+            continue
+        if (isinstance(record, dict) and record.get("snapshot_id") and
+                record.get("status", "pending") == "pending"):
+            pending.append(record)
+    return pending
+
+
+def poll_snapshot(snapshot_id, timeout=None, poll_interval=None, sleep_func=time.sleep,
+                  clock=time.monotonic):
     """
     Poll BrightData until a snapshot is ready or timeout is reached.
 
+    Thin wrapper around poll_snapshots() for a single snapshot.
+
     Args:
         snapshot_id: The snapshot ID to poll.
         timeout: Maximum wait time in seconds (default: BRIGHTDATA_POLL_TIMEOUT).
-        poll_interval: Seconds between polls (default: BRIGHTDATA_POLL_INTERVAL).
+        poll_interval: Seconds before the first re-poll; later intervals grow
+            adaptively (default: BRIGHTDATA_POLL_INTERVAL).
         sleep_func: Sleep function (override in tests).
+        clock: Monotonic clock function (override in tests).
 
     Returns:
         True if snapshot is ready, False if timed out.
@@ -85,54 +159,158 @@ def poll_snapshot(snapshot_id, timeout=None, poll_interval=None, sleep_func=time
     Raises:
         RuntimeError: If the snapshot fails.
     """
+    status = poll_snapshots([snapshot_id], timeout=timeout,
+                            initial_interval=poll_interval,
+                            sleep_func=sleep_func, clock=clock)[snapshot_id]
+    if status == "failed":
+        raise RuntimeError(f"Snapshot {snapshot_id} failed")
+    return status == "ready"
+
+
+def poll_snapshots(snapshot_ids, timeout=None, initial_interval=None,
+                   max_interval=None, backoff=None, sleep_func=time.sleep,
+                   clock=time.monotonic):
+    """
+    Poll many BrightData snapshots in one loop until each is done.
+
+    Each round checks the progress of every pending snapshot, then sleeps.
+    The sleep starts at ``initial_interval`` and grows by ``backoff`` each
+    round up to ``max_interval``, so short jobs are noticed quickly and
+    long ones cost few progress requests. The deadline is measured on a
+    monotonic clock, so request latency counts against the timeout. Each
+    progress check is a single request, bounded by the time left; one
+    that fails is logged and retried in the next round, and a round stops
+    early once the deadline has passed.
+
+    Args:
+        snapshot_ids: Iterable of snapshot IDs to wait for.
+        timeout: Maximum total wait in seconds (default: BRIGHTDATA_POLL_TIMEOUT).
+        initial_interval: First sleep in seconds (default: BRIGHTDATA_POLL_INTERVAL).
+        max_interval: Cap on the sleep in seconds
+            (default: BRIGHTDATA_POLL_MAX_INTERVAL).
+        backoff: Sleep multiplier per round (default: BRIGHTDATA_POLL_BACKOFF).
+        sleep_func: Sleep function (override in tests).
+        clock: Monotonic clock function (override in tests).
+
+    Returns:
+        Dict mapping each snapshot ID to 'ready', 'failed', or 'timeout'.
+    """
     if timeout is None:
         timeout = BRIGHTDATA_POLL_TIMEOUT
-    if poll_interval is None:
-        poll_interval = BRIGHTDATA_POLL_INTERVAL
-
-    elapsed = 0
-    while elapsed < timeout:
-        status = _check_progress(snapshot_id)
-        logger.info("Snapshot %s status: %s (%.0fs elapsed)",
-                     snapshot_id, status, elapsed)
+    if initial_interval is None:
+        initial_interval = BRIGHTDATA_POLL_INTERVAL
+    if max_interval is None:
+        max_interval = max(BRIGHTDATA_POLL_MAX_INTERVAL, initial_interval)
+    if backoff is None:
+        backoff = BRIGHTDATA_POLL_BACKOFF
+
+    pending = list(dict.fromkeys(snapshot_ids))
+    total = len(pending)
+    results = {}
+    finished_after = []
+    started = clock()
+    deadline = started + timeout
+    interval = initial_interval
+
+    while pending:
+        for snapshot_id in list(pending):
+            remaining = deadline - clock()
+            if remaining <= 0:
+                break
+            try:
+                status = _check_progress(snapshot_id, timeout=min(
+                    remaining, http_client.timeout_for(BRIGHTDATA_PROGRESS_URL)))
+            except Exception as e:
+                logger.warning("Progress check failed for snapshot %s: %s",
+                               snapshot_id, str(e))
+                continue
+            if status in ("ready", "failed"):
+                results[snapshot_id] = status
+                pending.remove(snapshot_id)
+                finished_after.append(clock() - started)
+                if status == "failed":
+                    logger.error("Snapshot %s failed", snapshot_id)
+                    _update_recovery(snapshot_id, "failed")
+
+        if not pending:
+            break
+        now = clock()
+        elapsed = now - started
+        remaining = deadline - now
+        if remaining <= 0:
+            break
+
+        sleep = min(interval, remaining)
+        logger.info("Snapshots: %d/%d done, %d pending (%.0fs elapsed, ETA %s, "
+                    "next check in %.0fs)", total - len(pending), total,
+                    len(pending), elapsed, _format_eta(finished_after, elapsed,
+                                                       remaining), sleep)
+        sleep_func(sleep)
+        interval = min(interval * backoff, max_interval)
+
+    for snapshot_id in pending:
+        results[snapshot_id] = "timeout"
+        logger.error("Polling timed out for snapshot %s after %ds", snapshot_id, timeout)
+    return results
+
+
+def _format_eta(finished_after, elapsed, remaining):
+    """
+    Estimate time until the pending snapshots finish.
 
-        if status == "ready":
-            return True
-        if status == "failed":
-            raise RuntimeError(f"Snapshot {snapshot_id} failed")
+    Uses the mean completion time of snapshots that already finished;
+    before any has finished, or once that mean has passed, the estimate
+    is unknown.
 
-        sleep_func(poll_interval)
-        elapsed += poll_interval
+    Args:
+        finished_after: Seconds from start at which each finished snapshot
+            was seen done.
+        elapsed: Seconds elapsed so far.
+        remaining: Seconds left before the deadline.
 
-    logger.error("Polling timed out for snapshot %s after %ds", snapshot_id, timeout)
-    return False
+    Returns:
+        ETA string such as '~25s' or 'unknown'.
+    """
+    if not finished_after:
+        return "unknown"
+    eta = sum(finished_after) / len(finished_after) - elapsed
+    if eta <= 0:
+        return "unknown"
+    return f"~{min(eta, remaining):.0f}s"
 
 
-@retry_with_backoff()
-def _check_progress(snapshot_id):
+@retry_with_backoff(max_retries=0, endpoint="brightdata")
+def _check_progress(snapshot_id, timeout=None):
     """
     Check the progress of a BrightData snapshot.
 
+    Makes a single attempt: poll_snapshots() checks again next round, so
+    retrying here would only hold up the other snapshots' checks.
+
     Args:
         snapshot_id: The snapshot ID to check.
+        timeout: Request timeout in seconds (default: the host's timeout).
 
     Returns:
         Status string (e.g., 'starting', 'running', 'ready', 'failed').
     """
-    resp = requests.get(
+    resp = http_client.get(
         f"{BRIGHTDATA_PROGRESS_URL}/{snapshot_id}",
         headers={"Authorization": f"Bearer {BRIGHTDATA_API_KEY}"},
-        timeout=30,
+        timeout=timeout or http_client.timeout_for(BRIGHTDATA_PROGRESS_URL),
     )
     check_response_retryable(resp)
     data = resp.json()
     return data.get("status", "unknown")
 
 
-@retry_with_backoff()
+@retry_with_backoff(endpoint="brightdata")
 def download_snapshot(snapshot_id):
     """
-    Download the results of a completed BrightData snapshot.
+    Download the results of a completed BrightData snapshot into memory.
+
+    Loads the whole snapshot at once; collectors use stream_snapshot()
+    instead so memory stays flat for large snapshots.
 
     Args:
         snapshot_id: The snapshot ID to download.
@@ -144,7 +322,7 @@ def download_snapshot(snapshot_id):
         RetryableError: On transient HTTP errors.
         requests.HTTPError: On non-retryable HTTP errors.
     """
-    resp = requests.get(
+    resp = http_client.get(
         f"{BRIGHTDATA_SNAPSHOT_URL}/{snapshot_id}",
         headers={"Authorization": f"Bearer {BRIGHTDATA_API_KEY}"},
         timeout=60,
@@ -164,3 +342,368 @@ def download_snapshot(snapshot_id):
 
     logger.info("Downloaded %d records from snapshot %s", len(data), snapshot_id)
     return data
+
+
+@retry_with_backoff(endpoint="brightdata")
+def _open_snapshot_stream(snapshot_id):
+    """
+    Open a streaming download of a completed BrightData snapshot.
+
+    Args:
+        snapshot_id: The snapshot ID to download.
+
+    Returns:
+        requests.Response with an unread body (stream=True).
+
+    Raises:
+        RetryableError: On transient HTTP errors.
+        requests.HTTPError: On non-retryable HTTP errors.
+    """
+    resp = http_client.get(
+        f"{BRIGHTDATA_SNAPSHOT_URL}/{snapshot_id}",
+        headers={"Authorization": f"Bearer {BRIGHTDATA_API_KEY}"},
+        timeout=60,
+        stream=True,
+    )
+    try:
+        check_response_retryable(resp)
+    except Exception:
+        resp.close()
+        raise
+    return resp
+
+
+def stream_snapshot(snapshot_id, raw_path, chunk_size=65536):
+    """
+    Stream a completed snapshot to the raw archive while yielding records.
+
+    The response body is written to disk chunk by chunk as received
+    (JSON array or NDJSON, unchanged) and parsed incrementally with
+    iter_json_records(), so only one record is held in memory at a time.
+    The raw file is written to a temporary file and moved into place once
+    the whole body has been read, and the snapshot's recovery file is then
+    marked 'downloaded'. If the download fails or the consumer stops
+    early, no partial raw file is left behind and the snapshot stays
+    pending for find_pending_snapshots().
+
+    Args:
+        snapshot_id: The snapshot ID to download.
+        raw_path: Path of the raw archive file to write.
+        chunk_size: Bytes per network read (default: 64 KiB).
+
+    Yields:
+        Each record dict from the snapshot.
+
+    Raises:
+        RetryableError: On transient HTTP errors opening the download.
+        requests.HTTPError: On non-retryable HTTP errors.
+        ValueError: If the body ends mid-record or is not valid JSON.
+    """
+    dirpath = os.path.dirname(raw_path)
+    if dirpath:
+        os.makedirs(dirpath, exist_ok=True)
+
+    resp = _open_snapshot_stream(snapshot_id)
+    fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=dirpath or '.')
+    count = 0
+    try:
+        with os.fdopen(fd, 'wb') as raw_file:
+            def archived_chunks():
+                for chunk in resp.iter_content(chunk_size=chunk_size):
+                    raw_file.write(chunk)
+                    yield chunk
+
+            for record in iter_json_records(archived_chunks()):
+                count += 1
+                yield record
+        os.replace(tmp_path, raw_path)
+        _update_recovery(snapshot_id, "downloaded", raw_path=raw_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    finally:
+        resp.close()
+
+    logger.info("Streamed %d records from snapshot %s to %s", count, snapshot_id, raw_path)
+
+
+_cache_lock = threading.Lock()
+
+# Query parameters that only track the click and never select content
+TRACKING_PARAMS = {"ref", "ref_src", "refsrc", "fbclid", "gclid", "mibextid",
+                   "is_from_webapp", "sender_device", "_r", "_t", "__tn__", "__cft__"}
+
+
+def _normalize_input(item):
+    """
+    Return a canonical copy of a BrightData input dict for cache keys.
+
+    URLs are compared without scheme/host case, 'www.', fragment, tracking
+    parameters, or trailing slash, so equivalent links share one cache
+    entry while pages addressed by query (profile.php?id=...) stay apart.
+    """
+    normalized = dict(item)
+    if normalized.get("url"):
+        normalized["url"] = _normalize_url(normalized["url"])
+    return normalized
+
+
+def _normalize_url(url):
+    """Normalize a URL for comparison (see _normalize_input())."""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith("utm_")
+    )
+    normalized = f"{parts.scheme.lower()}://{host}{parts.path.rstrip('/')}"
+    return f"{normalized}?{urlencode(query)}" if query else normalized
+
+
+def input_cache_key(item):
+    """
+    Return the cache key of a single BrightData input.
+
+    Args:
+        item: Input dict (e.g., {"url": "...", "num_of_posts": 25}).
+
+    Returns:
+        Hex SHA-256 digest of the normalized input.
+    """
+    payload = json.dumps(_normalize_input(item), sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _record_source_url(record):
+    """Return the normalized input URL a snapshot record came from, if known."""
+    source = record.get("input") if isinstance(record, dict) else None
+    url = source.get("url") if isinstance(source, dict) else None
+    if not url and isinstance(record, dict):
+        url = record.get("url")
+    return _normalize_url(url) if isinstance(url, str) and url else None
+
+
+def _load_cache(cache_path):
+    """Load the snapshot cache index, tolerating a missing or corrupt file."""
+    try:
+        cache = load_json_safe(cache_path, default={})
+    except json.JSONDecodeError:
+        logger.warning("Ignoring unreadable snapshot cache %s", cache_path)
+        cache = {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _split_cached_inputs(dataset_id, inputs, ttl, cache_path):
+    """
+    Split inputs into those served by a fresh cached snapshot and the rest.
+
+    Args:
+        dataset_id: BrightData dataset ID.
+        inputs: List of input dicts.
+        ttl: Maximum age in seconds of a usable cached snapshot.
+        cache_path: Path of the snapshot cache index.
+
+    Returns:
+        Tuple of (hits, uncached): ``hits`` maps each cached raw archive
+        path to (the requested inputs it covers, whether it covers only
+        requested inputs); ``uncached`` is the list of inputs to scrape.
+    """
+    with _cache_lock:
+        cache = _load_cache(cache_path).get(dataset_id, {})
+    snapshots = cache.get("snapshots", {})
+    by_input = cache.get("inputs", {})
+    now = time.time()
+
+    requested = {}
+    uncached = []
+    for item in inputs:
+        key = input_cache_key(item)
+        snapshot = snapshots.get(by_input.get(key, ""))
+        if (ttl > 0 and snapshot and now - snapshot["fetched_at"] < ttl and
+                os.path.exists(snapshot["raw_path"])):
+            requested.setdefault(by_input[key], []).append((key, item))
+        else:
+            uncached.append(item)
+
+    hits = {}
+    for snapshot_id, items in requested.items():
+        snapshot = snapshots[snapshot_id]
+        covers_only_requested = set(snapshot["input_keys"]) <= {k for k, _ in items}
+        hits[snapshot["raw_path"]] = ([item for _, item in items], covers_only_requested)
+    return hits, uncached
+
+
+def _store_in_cache(dataset_id, inputs, snapshot_id, raw_path, cache_path):
+    """
+    Record a downloaded snapshot as the cached result for its inputs.
+
+    Args:
+        dataset_id: BrightData dataset ID.
+        inputs: List of input dicts the snapshot was triggered with.
+        snapshot_id: The downloaded snapshot ID.
+        raw_path: Path of the snapshot's raw archive.
+        cache_path: Path of the snapshot cache index.
+    """
+    keys = [input_cache_key(item) for item in inputs]
+    with _cache_lock:
+        cache = _load_cache(cache_path)
+        entry = cache.setdefault(dataset_id, {"snapshots": {}, "inputs": {}})
+        entry["snapshots"][snapshot_id] = {
+            "raw_path": raw_path,
+            "fetched_at": time.time(),
+            "input_keys": keys,
+        }
+        for key in keys:
+            entry["inputs"][key] = snapshot_id
+        # Drop snapshots no longer referenced by any input
+        live = set(entry["inputs"].values())
+        entry["snapshots"] = {sid: snap for sid, snap in entry["snapshots"].items()
+                              if sid in live}
+        save_json_atomic(cache, cache_path)
+
+
+def _iter_cached_records(raw_path, items, covers_only_requested):
+    """
+    Yield records from a cached raw archive that belong to requested inputs.
+
+    If the cached snapshot was triggered with exactly the requested inputs
+    (or a subset of them), every record is used. Otherwise records are
+    matched to inputs by their 'input.url' or 'url' field, and records
+    that cannot be attributed are dropped.
+
+    Returns:
+        The requested inputs no record could be attributed to (always
+        empty when every record is used). The cache cannot serve these,
+        so the caller scrapes them again.
+    """
+    if covers_only_requested:
+        yield from read_json_records(raw_path)
+        return []
+    wanted = {_normalize_url(item["url"]) for item in items if item.get("url")}
+    matched = set()
+    for record in read_json_records(raw_path):
+        url = _record_source_url(record)
+        if url in wanted:
+            matched.add(url)
+            yield record
+    return [item for item in items
+            if not item.get("url") or _normalize_url(item["url"]) not in matched]
+
+
+def _trigger_chunks(dataset_id, chunks, label):
+    """
+    Trigger one snapshot per input chunk, several at a time.
+
+    Args:
+        dataset_id: BrightData dataset ID.
+        chunks: List of input lists.
+        label: Human-readable platform name for logging.
+
+    Returns:
+        List of (snapshot_id, chunk) pairs, in chunk order, for the chunks
+        that were triggered.
+
+    Raises:
+        Exception: The last trigger error, if no chunk could be triggered.
+    """
+    workers = max(1, min(len(chunks), BRIGHTDATA_MAX_PARALLEL_TRIGGERS))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(trigger_collection, dataset_id, chunk)
+                   for chunk in chunks]
+
+    triggered = []
+    error = None
+    for index, (future, chunk) in enumerate(zip(futures, chunks), 1):
+        try:
+            triggered.append((future.result(), chunk))
+        except Exception as e:
+            error = e
+            logger.error("%s: failed to trigger chunk %d/%d (%d inputs): %s",
+                         label, index, len(chunks), len(chunk), str(e))
+    if not triggered and error is not None:
+        raise error
+    return triggered
+
+
+def collect_snapshot_records(dataset_id, inputs, raw_subdir, label, ttl=None,
+                             cache_path=None, chunk_size=None):
+    """
+    Collect BrightData records for inputs, reusing recent snapshots.
+
+    Inputs whose cache entry (keyed by dataset ID and normalized input) is
+    younger than ``ttl`` are served from the raw archive of the cached
+    snapshot, skipping the trigger/poll/download cycle. When a cached
+    snapshot also covered other inputs, its records are matched to the
+    requested ones by URL; inputs that no record can be attributed to are
+    treated as uncached. The remaining inputs are split into chunks of ``chunk_size``, each triggered as its
+    own snapshot in parallel. All snapshots are awaited together with
+    poll_snapshots(), so one slow chunk does not hold up the others'
+    results; each ready snapshot is streamed to RAW_DIR/<raw_subdir>/ and
+    recorded in the cache. Chunks that fail or time out are logged and
+    contribute no records.
+
+    Args:
+        dataset_id: BrightData dataset ID.
+        inputs: List of input dicts.
+        raw_subdir: Raw archive subdirectory (e.g., 'meta').
+        label: Human-readable platform name for logging.
+        ttl: Cache lifetime in seconds; 0 disables reuse
+            (default: BRIGHTDATA_CACHE_TTL).
+        cache_path: Snapshot cache index path (default: BRIGHTDATA_CACHE_FILE).
+        chunk_size: Maximum inputs per snapshot (default: BRIGHTDATA_CHUNK_SIZE).
+
+    Yields:
+        Raw record dicts from cached and newly downloaded snapshots. Records
+        are not deduplicated; overlapping snapshots may repeat a post.
+
+    Raises:
+        RuntimeError: If every triggered snapshot failed.
+    """
+    if ttl is None:
+        ttl = BRIGHTDATA_CACHE_TTL
+    if cache_path is None:
+        cache_path = BRIGHTDATA_CACHE_FILE
+    if chunk_size is None:
+        chunk_size = BRIGHTDATA_CHUNK_SIZE
+    chunk_size = max(1, chunk_size)
+
+    hits, uncached = _split_cached_inputs(dataset_id, inputs, ttl, cache_path)
+    if hits:
+        logger.info("%s: reusing cached snapshots for %d of %d inputs",
+                    label, len(inputs) - len(uncached), len(inputs))
+    for raw_path, (items, covers_only_requested) in hits.items():
+        unattributed = yield from _iter_cached_records(raw_path, items,
+                                                       covers_only_requested)
+        if unattributed:
+            logger.warning("%s: no records in cached %s match %d inputs; "
+                           "scraping them again", label, raw_path, len(unattributed))
+            uncached.extend(unattributed)
+
+    if not uncached:
+        return
+
+    chunks = [uncached[i:i + chunk_size] for i in range(0, len(uncached), chunk_size)]
+    if len(chunks) > 1:
+        logger.info("%s: triggering %d snapshots of up to %d inputs",
+                    label, len(chunks), chunk_size)
+    triggered = _trigger_chunks(dataset_id, chunks, label)
+    statuses = poll_snapshots([snapshot_id for snapshot_id, _ in triggered])
+
+    for snapshot_id, chunk in triggered:
+        status = statuses[snapshot_id]
+        if status == "timeout":
+            logger.error("BrightData %s collection timed out (snapshot %s).",
+                         label, snapshot_id)
+        if status != "ready":
+            continue
+        raw_path = os.path.join(RAW_DIR, raw_subdir, f'snapshot_{snapshot_id}.json')
+        yield from stream_snapshot(snapshot_id, raw_path)
+        _store_in_cache(dataset_id, chunk, snapshot_id, raw_path, cache_path)
+
+    if all(status == "failed" for status in statuses.values()):
+        raise RuntimeError(f"All {label} snapshots failed")
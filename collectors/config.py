@@ -35,18 +35,73 @@ MAX_POSTS = 25
 RETRY_MAX_RETRIES = 5
 RETRY_INITIAL_BACKOFF = 1.0
 RETRY_MULTIPLIER = 2.0
-BRIGHTDATA_POLL_INTERVAL = 10  # seconds
+RETRY_MAX_BACKOFF = 30.0  # seconds, cap on one backoff sleep before jitter
+BREAKER_FAILURE_THRESHOLD = 5  # consecutive calls failing all retries that open a circuit
+BREAKER_RECOVERY_TIMEOUT = 30.0  # seconds an open circuit waits before a probe
+BRIGHTDATA_POLL_INTERVAL = 2  # seconds before the first re-poll
+BRIGHTDATA_POLL_BACKOFF = 1.5  # poll interval multiplier per round
+BRIGHTDATA_POLL_MAX_INTERVAL = 30  # seconds, cap on the poll interval
 BRIGHTDATA_POLL_TIMEOUT = 300  # seconds
+BRIGHTDATA_CACHE_TTL = 6 * 3600  # seconds a downloaded snapshot is reused; 0 disables
+BRIGHTDATA_CHUNK_SIZE = 25  # inputs per triggered snapshot
+BRIGHTDATA_MAX_PARALLEL_TRIGGERS = 4  # snapshot triggers in flight at once
+TWITTER_SEARCH_WORKERS = 4  # keyword searches in flight with per_keyword=True
+EXTRACTION_WORKERS = 1  # concurrent OpenRouter requests during extraction
+EXTRACTION_BATCH_SIZE = 1  # posts packed into one OpenRouter request
+EXTRACTION_ADAPTIVE_INITIAL = 2  # starting request limit with --adaptive
+EXTRACTION_LATENCY_FACTOR = 2.0  # median latency vs. best seen that counts as congestion
+JOURNAL_FSYNC_EVERY = 20  # journal records appended per fsync
+LLM_CACHE_MAX_BYTES = 256 * 1024 * 1024  # LRU-evicted beyond this size
+DASHBOARD_PAGE_SIZE = 500  # records per exported dashboard page shard
+QUERY_SERVER_HOST = "127.0.0.1"  # the query server is local and read-only
+QUERY_SERVER_PORT = 8787
+QUERY_PAGE_SIZE = 50  # records per query server page by default
+QUERY_MAX_PAGE_SIZE = 500
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "json")  # 'json' or 'sqlite'
+
+# --- HTTP Connection Pooling ---
+HTTP_POOL_CONNECTIONS = 4  # connection pools kept per session
+HTTP_POOL_MAXSIZE = 16  # keep-alive connections kept per host
+HTTP_DEFAULT_TIMEOUT = 30  # seconds
+HTTP_HOST_TIMEOUTS = {  # per-host default timeouts in seconds
+    "api.twitterapi.io": 30,
+    "api.brightdata.com": 30,
+    "openrouter.ai": 60,
+}
+HTTP_RATE_LIMITS = {  # per-host (requests per second, burst) token buckets
+    "api.twitterapi.io": (10, 10),
+    "api.brightdata.com": (5, 10),
+    "openrouter.ai": (10, 20),
+}
+HTTP_DEFAULT_RATE_LIMIT = None  # other hosts: unlimited, but Retry-After still applies
+HTTP_MAX_RETRY_AFTER = 120  # seconds, cap on a server-requested wait
 
 # --- Confidence Thresholds ---
 CONFIDENCE_AUTO_ACCEPT = 0.85
 CONFIDENCE_NEEDS_REVIEW = 0.60
 
+# --- Near-duplicate Detection ---
+DEDUP_MAX_DISTANCE = 3  # SimHash bits two near-duplicate texts may differ by
+DEDUP_MIN_TOKENS = 5  # shorter texts are never clustered
+
+# --- Claims Pre-filter ---
+PREFILTER_THRESHOLD = 0.20  # default cut-off when the pre-filter is enabled
+PREFILTER_MIN_WORDS = 6  # shorter posts have their pre-filter score halved
+
 # --- Data Paths ---
 DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
 RAW_DIR = os.path.join(DATA_DIR, 'raw')
 POSTS_FILE = os.path.join(DATA_DIR, 'posts.json')
 CLAIMS_FILE = os.path.join(DATA_DIR, 'claims.json')
+BRIGHTDATA_CACHE_FILE = os.path.join(RAW_DIR, 'brightdata_cache.json')
+TWITTER_STATE_FILE = os.path.join(DATA_DIR, 'twitter_state.json')
+POSTS_STORE_FILE = os.path.join(DATA_DIR, 'posts.store.ndjson')
+POSTS_STORE_INDEX_FILE = os.path.join(DATA_DIR, 'posts.store.index.ndjson')
+LLM_CACHE_FILE = os.path.join(DATA_DIR, 'llm_cache.sqlite3')
+SQLITE_DB_FILE = os.path.join(DATA_DIR, 'pipeline.sqlite3')
+DASHBOARD_EXPORT_DIR = os.path.join(DATA_DIR, 'dashboard')  # served at /data/dashboard
+COLLECTION_STATS_FILE = os.path.join(DATA_DIR, 'collection_stats.json')
+EXTRACTION_STATS_FILE = os.path.join(DATA_DIR, 'extraction_stats.json')
 
 
 def validate_keys(*required_keys):
@@ -0,0 +1,235 @@
+"""
+Paginated, pre-sorted export of posts and claims for the dashboard.
+
+The dashboard fetches data/posts.json and data/claims.json whole and
+filters and sorts them in the browser, which stops scaling at around
+100k posts. This export writes the same records as fixed-size page
+shards plus precomputed orderings, so a view only loads the shard(s) it
+shows:
+
+    dashboard/
+      manifest.json
+      posts/page-00000.json ...      # posts in posts.json order
+      posts/index/<filter>.<order>.json
+      claims/page-00000.json ...     # claims in claims.json order
+      claims/index/<filter>.<order>.json
+
+A record's position is its index in the source file, so it lives on page
+position // page_size. Each index file is the list of positions matching
+a filter ('all', 'platform-twitter', 'status-needs_review', ...) in the
+given order. Orders match the dashboard's: posts by 'date' (parsed, since
+Twitter and TikTok timestamps differ in format), 'likes' and 'shares',
+newest or highest first, and claims in 'file' order (which
+keeps the post_id/position review keys stable) or by 'confidence'. Ties
+keep file order, as Array.prototype.sort does.
+
+The manifest lists page counts, per-platform, per-status and
+per-category counts, and every index file. The export is built in a
+temporary directory and swapped in, so the dashboard never sees a
+half-written export.
+
+Usage:
+    python -m collectors.export_dashboard [--page-size N] [--output DIR]
+"""
+
+import argparse
+import logging
+import os
+import re
+import shutil
+import sys
+from collections import defaultdict
+from datetime import datetime, timezone
+
+from collectors.config import (
+    POSTS_FILE, CLAIMS_FILE, DASHBOARD_EXPORT_DIR, DASHBOARD_PAGE_SIZE,
+)
+from collectors.file_utils import read_json_records, save_json_atomic, save_json_stream
+from collectors.timestamps import parse_timestamp
+
+logger = logging.getLogger(__name__)
+
+
+def _number(value):
+    """Coerce a count or score to a number like JS subtraction does, else 0."""
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _epoch(value):
+    """Return a timestamp as epoch seconds; unparseable ones sort oldest."""
+    parsed = parse_timestamp(value)
+    return parsed.timestamp() if parsed else float("-inf")
+
+
+POST_ORDERS = {
+    "date": lambda post: _epoch(post.get("timestamp")),
+    "likes": lambda post: _number((post.get("engagement") or {}).get("likes")),
+    "shares": lambda post: _number((post.get("engagement") or {}).get("shares")),
+}
+CLAIM_ORDERS = {
+    "confidence": lambda claim: _number(claim.get("confidence")),
+}
+POST_FILTER_FIELDS = ("platform",)
+CLAIM_FILTER_FIELDS = ("status", "category", "platform")
+
+_UNSAFE_NAME_RE = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+def _filter_name(field, value):
+    """Return the file-safe name of a field=value filter."""
+    return f"{field}-{_UNSAFE_NAME_RE.sub('_', str(value)) or '_'}"
+
+
+def _export_records(records, out_dir, page_size, orders, filter_fields):
+    """
+    Write page shards and index files for one record stream.
+
+    Only the sort keys and filter values of each record are kept in
+    memory; record bodies are written out page by page.
+
+    Args:
+        records: Iterable of record dicts, in source-file order.
+        out_dir: Directory for this record type's pages and indexes.
+        page_size: Records per page shard.
+        orders: Dict of order name -> key function (sorted descending).
+        filter_fields: Record fields to build per-value filters for.
+
+    Returns:
+        Manifest section dict with 'total', 'pages', 'counts' and 'indexes'.
+    """
+    os.makedirs(os.path.join(out_dir, "index"))
+    keys = {name: [] for name in orders}
+    members = defaultdict(list)
+    counts = {field: defaultdict(int) for field in filter_fields}
+    page, pages, total = [], 0, 0
+
+    def flush():
+        save_json_stream(page, os.path.join(out_dir, f"page-{pages:05d}.json"))
+
+    for position, record in enumerate(records):
+        for name, key in orders.items():
+            keys[name].append(key(record))
+        for field in filter_fields:
+            value = record.get(field) or "unknown"
+            counts[field][value] += 1
+            members[_filter_name(field, value)].append(position)
+        page.append(record)
+        total += 1
+        if len(page) == page_size:
+            flush()
+            page, pages = [], pages + 1
+    if page:
+        flush()
+        pages += 1
+
+    sorted_orders = {"file": range(total)}
+    for name, values in keys.items():
+        # sorted() is stable with reverse=True, so ties keep file order
+        sorted_orders[name] = sorted(range(total), key=values.__getitem__, reverse=True)
+
+    indexes = {}
+    filters = {"all": None}
+    filters.update((name, set(positions)) for name, positions in sorted(members.items()))
+    for filter_name, allowed in filters.items():
+        for order_name, order in sorted_orders.items():
+            positions = (p for p in order if allowed is None or p in allowed)
+            filename = f"index/{filter_name}.{order_name}.json"
+            save_json_stream(positions, os.path.join(out_dir, filename))
+            indexes.setdefault(filter_name, {})[order_name] = filename
+
+    return {
+        "total": total,
+        "pages": pages,
+        "counts": {field: dict(values) for field, values in counts.items()},
+        "indexes": indexes,
+    }
+
+
+def export_dashboard(posts_path=None, claims_path=None, output_dir=None, page_size=None):
+    """
+    Write the paginated dashboard export.
+
+    Args:
+        posts_path: Source posts JSON (default: POSTS_FILE).
+        claims_path: Source claims JSON (default: CLAIMS_FILE).
+        output_dir: Export directory (default: DASHBOARD_EXPORT_DIR).
+        page_size: Records per page shard (default: DASHBOARD_PAGE_SIZE).
+
+    Returns:
+        The manifest dict written to output_dir/manifest.json.
+
+    Raises:
+        ValueError: If page_size is less than 1.
+    """
+    posts_path = posts_path or POSTS_FILE
+    claims_path = claims_path or CLAIMS_FILE
+    output_dir = os.path.normpath(output_dir or DASHBOARD_EXPORT_DIR)
+    if page_size is None:
+        page_size = DASHBOARD_PAGE_SIZE
+    if page_size < 1:
+        raise ValueError("page_size must be at least 1")
+
+    def source(path):
+        return read_json_records(path) if os.path.exists(path) else iter(())
+
+    build_dir = output_dir + ".tmp"
+    old_dir = output_dir + ".old"
+    for stale in (build_dir, old_dir):
+        shutil.rmtree(stale, ignore_errors=True)
+    try:
+        manifest = {
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "page_size": page_size,
+            "posts": _export_records(source(posts_path), os.path.join(build_dir, "posts"),
+                                     page_size, POST_ORDERS, POST_FILTER_FIELDS),
+            "claims": _export_records(source(claims_path), os.path.join(build_dir, "claims"),
+                                      page_size, CLAIM_ORDERS, CLAIM_FILTER_FIELDS),
+        }
+        save_json_atomic(manifest, os.path.join(build_dir, "manifest.json"))
+    except BaseException:
+        shutil.rmtree(build_dir, ignore_errors=True)
+        raise
+
+    # Swap the finished export in; the old one is only briefly absent
+    if os.path.exists(output_dir):
+        os.replace(output_dir, old_dir)
+    os.replace(build_dir, output_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+    logger.info("Exported %d posts (%d pages) and %d claims (%d pages) to %s",
+                manifest["posts"]["total"], manifest["posts"]["pages"],
+                manifest["claims"]["total"], manifest["claims"]["pages"], output_dir)
+    return manifest
+
+
+def main(argv=None):
+    """
+    Export data/posts.json and data/claims.json for the dashboard.
+
+    Args:
+        argv: Optional list of argument strings for testing.
+    """
+    logging.basicConfig(level=logging.INFO,
+                        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    parser = argparse.ArgumentParser(
+        description="Write paginated, pre-sorted posts and claims for the dashboard."
+    )
+    parser.add_argument(
+        "--page-size", type=int, default=DASHBOARD_PAGE_SIZE,
+        help=f"Records per page shard (default: {DASHBOARD_PAGE_SIZE})"
+    )
+    parser.add_argument(
+        "--output", default=DASHBOARD_EXPORT_DIR,
+        help="Export directory (default: data/dashboard, served at /data/dashboard)"
+    )
+    args = parser.parse_args(argv)
+    if args.page_size < 1:
+        parser.error("--page-size must be at least 1")
+    export_dashboard(output_dir=args.output, page_size=args.page_size)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,12 +5,22 @@ Provides atomic JSON save operations that write to a temporary file
 first, then use os.replace() for an atomic rename. This ensures that
 data files are never left in a corrupted state if the process crashes
 mid-write.
+
+Also provides an append-only NDJSON journal for incremental writes: each
+record is one line, appended and fsynced in groups, and a compaction step
+turns the journal into a regular JSON file with save_json_atomic(). For
+large downloads, iter_json_records() parses a JSON array or NDJSON stream
+incrementally without holding the whole body in memory.
 """
 
+import codecs
 import json
+import logging
 import os
 import tempfile
 
+logger = logging.getLogger(__name__)
+
 
 def save_json_atomic(data, filepath):
     """
@@ -50,6 +60,50 @@ def save_json_atomic(data, filepath):
         raise
 
 
+def save_json_stream(records, filepath):
+    """
+    Atomically save an iterable of records as a JSON array, streaming.
+
+    Like save_json_atomic(), but serializes one record at a time so a
+    large export never has to be materialized as one list.
+
+    Args:
+        records: Iterable of JSON-serializable objects.
+        filepath: Path to the target JSON file.
+
+    Returns:
+        Number of records written.
+
+    Raises:
+        OSError: If the directory cannot be created or file cannot be written.
+        TypeError: If a record is not JSON-serializable.
+    """
+    dirpath = os.path.dirname(filepath)
+    if dirpath:
+        os.makedirs(dirpath, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=dirpath or '.')
+    count = 0
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write('[')
+            for record in records:
+                f.write(',\n  ' if count else '\n  ')
+                f.write(json.dumps(record, ensure_ascii=False))
+                count += 1
+            f.write('\n]\n' if count else ']\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    return count
+
+
 def load_json_safe(filepath, default=None):
     """
     Safely load JSON from a file, returning a default if the file doesn't exist.
@@ -68,3 +122,206 @@ def load_json_safe(filepath, default=None):
         return default
     with open(filepath, 'r') as f:
         return json.load(f)
+
+
+class NdjsonJournal:
+    """
+    Append-only newline-delimited JSON journal.
+
+    Each call to append() writes one JSON record as a single line and
+    flushes it to the OS. The file is fsynced every ``fsync_every``
+    records and on close(), so a crash loses at most the last partial
+    group on power failure and at most a torn final line otherwise.
+    read_ndjson() skips such a torn line.
+
+    Usable as a context manager.
+    """
+
+    def __init__(self, filepath, fsync_every=20, truncate=False):
+        """
+        Open the journal for appending, creating parent directories.
+
+        Args:
+            filepath: Path to the journal file.
+            fsync_every: Number of appended records per fsync (default: 20).
+            truncate: If True, discard any existing journal contents.
+        """
+        dirpath = os.path.dirname(filepath)
+        if dirpath:
+            os.makedirs(dirpath, exist_ok=True)
+        self.filepath = filepath
+        self.fsync_every = max(1, fsync_every)
+        self._unsynced = 0
+        self._file = open(filepath, 'w' if truncate else 'a', encoding='utf-8')
+        if not truncate and _ends_with_partial_line(filepath):
+            # Terminate a line torn by an earlier crash so the next
+            # record starts on a line of its own.
+            self._file.write('\n')
+
+    def append(self, record):
+        """
+        Append one JSON-serializable record as a line.
+
+        Args:
+            record: Any JSON-serializable Python object.
+
+        Raises:
+            TypeError: If record is not JSON-serializable.
+        """
+        line = json.dumps(record, ensure_ascii=False)
+        self._file.write(line + '\n')
+        self._file.flush()
+        self._unsynced += 1
+        if self._unsynced >= self.fsync_every:
+            self.sync()
+
+    def sync(self):
+        """Flush and fsync any records appended since the last sync."""
+        if self._unsynced:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+
+    def close(self):
+        """Sync outstanding records and close the journal file."""
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def _ends_with_partial_line(filepath):
+    """Return True if a non-empty file does not end with a newline."""
+    with open(filepath, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell() == 0:
+            return False
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) != b'\n'
+
+
+def read_ndjson(filepath):
+    """
+    Iterate over the records of an NDJSON file.
+
+    Blank lines are ignored. A line that fails to parse is skipped with a
+    warning, which covers a final line torn by a crash mid-append.
+
+    Args:
+        filepath: Path to the NDJSON file. A missing file yields nothing.
+
+    Yields:
+        Parsed JSON record for each line.
+    """
+    if not os.path.exists(filepath):
+        return
+    with open(filepath, 'r', encoding='utf-8') as f:
+        for lineno, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning("Skipping unreadable line %d in %s", lineno, filepath)
+
+
+def compact_ndjson(journal_path, output_path, transform=None):
+    """
+    Build a JSON array file from the records in an NDJSON journal.
+
+    The output is written with save_json_atomic(), so it is either the
+    previous version or the fully compacted one.
+
+    Args:
+        journal_path: Path to the NDJSON journal to read.
+        output_path: Path to the JSON file to write.
+        transform: Optional function mapping an iterator of journal
+            records to an iterable of output items (default: identity).
+
+    Returns:
+        The list of items written to output_path.
+    """
+    records = read_ndjson(journal_path)
+    items = list(transform(records) if transform else records)
+    save_json_atomic(items, output_path)
+    return items
+
+
+# Characters allowed between top-level records of a JSON array or NDJSON stream
+_RECORD_SEPARATORS = frozenset(' \t\r\n,[]')
+
+
+def iter_json_records(chunks):
+    """
+    Incrementally parse records from a JSON array or NDJSON byte stream.
+
+    Accepts either format (BrightData may return both): top-level values
+    are decoded one at a time as soon as enough bytes have arrived, and
+    array brackets, commas, and newlines between them are skipped. Only
+    the current partial record is buffered. Records are expected to be
+    objects or arrays; a bare number split across chunks could be cut short.
+
+    Args:
+        chunks: Iterable of bytes (or str) chunks, e.g. from
+            requests.Response.iter_content().
+
+    Yields:
+        Each decoded top-level record.
+
+    Raises:
+        ValueError: If the stream ends in the middle of a record or
+            contains invalid JSON.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder('utf-8')()
+    buffer = ""
+
+    def drain(final=False):
+        nonlocal buffer
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in _RECORD_SEPARATORS:
+                pos += 1
+            if pos >= len(buffer):
+                break
+            try:
+                record, pos = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if final:
+                    raise ValueError(
+                        f"Truncated or invalid JSON record near: {buffer[pos:pos + 80]!r}"
+                    )
+                break
+            yield record
+        buffer = buffer[pos:]
+
+    for chunk in chunks:
+        if not chunk:
+            continue
+        buffer += utf8.decode(chunk) if isinstance(chunk, bytes) else chunk
+        yield from drain()
+
+    buffer += utf8.decode(b'', final=True)
+    yield from drain(final=True)
+
+
+def read_json_records(filepath, chunk_size=65536):
+    """
+    Stream the records of a JSON array or NDJSON file from disk.
+
+    Args:
+        filepath: Path to the file.
+        chunk_size: Bytes read per chunk (default: 64 KiB).
+
+    Yields:
+        Each top-level record, as parsed by iter_json_records().
+    """
+    with open(filepath, 'rb') as f:
+        yield from iter_json_records(iter(lambda: f.read(chunk_size), b''))
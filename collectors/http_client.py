@@ -0,0 +1,151 @@
+"""
+Shared HTTP client with per-host connection pooling.
+
+Keeps one requests.Session per host, each mounted with a pooled
+HTTPAdapter, so repeated calls to the same API (Twitter pagination,
+BrightData progress polling, OpenRouter completions) reuse keep-alive
+connections instead of opening a new TCP+TLS connection per request.
+Applies a per-host default timeout from config, and sends every request
+through the host's rate_limiter token bucket, which also learns from the
+response's rate-limit headers. Each request's latency, status code (or
+transport error), body size and rate-limit wait are recorded per host in
+metrics.registry.
+
+The adapters do not retry on their own; retries stay with
+retry_utils.retry_with_backoff at the call sites.
+"""
+
+import logging
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from collectors import metrics, rate_limiter
+from collectors.config import (
+    HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE, HTTP_DEFAULT_TIMEOUT,
+    HTTP_HOST_TIMEOUTS,
+)
+
+logger = logging.getLogger(__name__)
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def _host(url):
+    """Return the lower-cased host[:port] part of a URL."""
+    return urlsplit(url).netloc.lower()
+
+
+def get_session(url):
+    """
+    Return the pooled session for the host of the given URL.
+
+    Sessions are created on first use and shared by all threads.
+
+    Args:
+        url: Any URL on the target host.
+
+    Returns:
+        requests.Session configured with a pooled HTTPAdapter.
+    """
+    host = _host(url)
+    with _sessions_lock:
+        session = _sessions.get(host)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=HTTP_POOL_CONNECTIONS,
+                pool_maxsize=HTTP_POOL_MAXSIZE,
+                max_retries=0,
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[host] = session
+            logger.debug("Opened HTTP session pool for %s", host)
+        return session
+
+
+def timeout_for(url):
+    """
+    Return the default timeout in seconds for the host of a URL.
+
+    Args:
+        url: Request URL.
+
+    Returns:
+        Timeout from HTTP_HOST_TIMEOUTS, or HTTP_DEFAULT_TIMEOUT.
+    """
+    return HTTP_HOST_TIMEOUTS.get(_host(url), HTTP_DEFAULT_TIMEOUT)
+
+
+def _body_size(response, streamed):
+    """
+    Return the response body size in bytes, or 0 if unknown.
+
+    Streamed bodies are not read here; their Content-Length is used.
+    """
+    length = (getattr(response, "headers", None) or {}).get("Content-Length")
+    if isinstance(length, str) and length.isdigit():
+        return int(length)
+    if streamed:
+        return 0
+    content = getattr(response, "content", None)
+    return len(content) if isinstance(content, (bytes, str)) else 0
+
+
+def request(method, url, **kwargs):
+    """
+    Send an HTTP request through the pooled session for the URL's host.
+
+    Waits for the host's rate limit first, and updates the limit from
+    the response headers afterwards. The request is recorded in
+    metrics.registry.
+
+    Args:
+        method: HTTP method string (e.g., 'GET', 'POST').
+        url: Request URL.
+        **kwargs: Passed to requests.Session.request(). If 'timeout' is
+            not given, the per-host default from timeout_for() is used.
+
+    Returns:
+        requests.Response object.
+    """
+    kwargs.setdefault("timeout", timeout_for(url))
+    host = _host(url)
+    waited = rate_limiter.acquire(host)
+    if waited:
+        metrics.registry.record_wait(host, waited)
+    started = time.monotonic()
+    try:
+        response = get_session(url).request(method, url, **kwargs)
+    except requests.exceptions.RequestException as e:
+        metrics.registry.record_request(host, type(e).__name__,
+                                        time.monotonic() - started)
+        raise
+    metrics.registry.record_request(host, response.status_code,
+                                    time.monotonic() - started,
+                                    _body_size(response, kwargs.get("stream", False)))
+    rate_limiter.update_from_response(host, response)
+    return response
+
+
+def get(url, **kwargs):
+    """Send a GET request through the pooled session. See request()."""
+    return request("GET", url, **kwargs)
+
+
+def post(url, **kwargs):
+    """Send a POST request through the pooled session. See request()."""
+    return request("POST", url, **kwargs)
+
+
+def close_all():
+    """Close every pooled session and release its connections."""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
@@ -6,16 +6,12 @@ to the unified post schema.
 """
 
 import logging
-import os
 from datetime import datetime, timezone
 
 from collectors.config import (
-    BRIGHTDATA_FACEBOOK_DATASET_ID, MAX_POSTS, RAW_DIR,
+    BRIGHTDATA_FACEBOOK_DATASET_ID, MAX_POSTS,
 )
-from collectors.brightdata_utils import (
-    trigger_collection, poll_snapshot, download_snapshot,
-)
-from collectors.file_utils import save_json_atomic
+from collectors.brightdata_utils import collect_snapshot_records
 
 logger = logging.getLogger(__name__)
 
@@ -55,46 +51,57 @@ def normalize_meta_post(post):
     }
 
 
-def collect_meta(urls):
+def iter_meta_posts(records):
+    """
+    Lazily normalize raw BrightData Facebook records.
+
+    Args:
+        records: Iterable of raw record dicts (e.g., from stream_snapshot()).
+
+    Yields:
+        Dicts in unified post schema format.
+    """
+    for item in records:
+        yield normalize_meta_post(item)
+
+
+def collect_meta(urls, cache_ttl=None, chunk_size=None):
     """
     Collect Facebook posts from the given page URLs via BrightData.
 
     Triggers a BrightData collection, polls until ready, downloads results,
-    and normalizes to the unified post schema.
+    and normalizes to the unified post schema. Large URL lists are split
+    into chunks, each triggered as its own snapshot in parallel, and posts
+    are deduplicated by id. Pages scraped within the snapshot cache TTL are
+    served from their raw archive instead.
 
     Args:
         urls: List of public Facebook page URL strings.
+        cache_ttl: Snapshot cache lifetime in seconds; 0 forces a fresh
+            scrape (default: BRIGHTDATA_CACHE_TTL).
+        chunk_size: Maximum URLs per snapshot (default: BRIGHTDATA_CHUNK_SIZE).
 
     Returns:
-        List of normalized post dicts (up to MAX_POSTS).
+        List of normalized post dicts (up to MAX_POSTS per page).
     """
     logger.info("Collecting Facebook posts from %d URLs...", len(urls))
 
-    # Build inputs for BrightData
-    inputs = [{"url": url, "num_of_posts": MAX_POSTS} for url in urls]
-
-    # Trigger collection
-    snapshot_id = trigger_collection(BRIGHTDATA_FACEBOOK_DATASET_ID, inputs)
-
-    # Poll until ready
-    ready = poll_snapshot(snapshot_id)
-    if not ready:
-        logger.error("BrightData Facebook collection timed out.")
-        return []
-
-    # Download results
-    raw_data = download_snapshot(snapshot_id)
-
-    # Save raw data
-    raw_path = os.path.join(RAW_DIR, 'meta', f'snapshot_{snapshot_id}.json')
-    save_json_atomic(raw_data, raw_path)
+    # Build inputs for BrightData; MAX_POSTS caps posts per page
+    inputs = [{"url": url, "num_of_posts": MAX_POSTS} for url in dict.fromkeys(urls)]
 
-    # Normalize
+    # Reuse recently downloaded snapshots; uncached inputs are triggered in
+    # parallel chunks. Records are read to the end so raw archives are complete.
+    records = collect_snapshot_records(
+        BRIGHTDATA_FACEBOOK_DATASET_ID, inputs, "meta", "Facebook",
+        ttl=cache_ttl, chunk_size=chunk_size)
     posts = []
-    for item in raw_data:
-        if len(posts) >= MAX_POSTS:
-            break
-        posts.append(normalize_meta_post(item))
+    seen = set()
+    for post in iter_meta_posts(records):
+        # Chunks and cached snapshots can overlap; keep the first copy
+        if post["id"] in seen:
+            continue
+        seen.add(post["id"])
+        posts.append(post)
 
     logger.info("Collected %d Facebook posts.", len(posts))
     return posts
@@ -0,0 +1,245 @@
+"""
+Request and retry instrumentation.
+
+Collects, per decorated function and per HTTP endpoint (host), where a
+run's time goes:
+
+- functions (recorded by retry_utils.retry_with_backoff): calls, attempts,
+  retries, total backoff sleep, outcomes, and a latency histogram of the
+  whole call including retries
+- endpoints (recorded by http_client.request): requests, status-code
+  counts, transport errors, bytes received, rate-limiter wait, and a
+  latency histogram of single requests
+
+Histograms use fixed bucket bounds, so recording is O(1) and memory does
+not grow with the number of calls; percentiles are estimated from the
+buckets. report() logs a summary and writes the snapshot as JSON, which
+run_collection and run_extraction do at the end of every run.
+"""
+
+import bisect
+import logging
+import threading
+from datetime import datetime, timezone
+
+from collectors.file_utils import save_json_atomic
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the latency histogram buckets; the last is open
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+class Histogram:
+    """Fixed-bucket latency histogram."""
+
+    def __init__(self, bounds=LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        """Record one latency sample."""
+        self.counts[bisect.bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, fraction):
+        """
+        Estimate a percentile as the upper bound of the bucket holding it.
+
+        Args:
+            fraction: Percentile as a fraction (e.g., 0.95).
+
+        Returns:
+            Seconds (the observed max for the open last bucket, or if it
+            is lower than the bucket bound), or None with no samples.
+        """
+        if not self.count:
+            return None
+        rank = max(fraction * self.count, 1)
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return min(self.bounds[i], self.max) if i < len(self.bounds) else self.max
+        return self.max
+
+    def snapshot(self):
+        """Return the histogram as a JSON-serializable dict."""
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+            "max": self.max,
+            "buckets": {
+                **{f"le_{bound:g}": n for bound, n in zip(self.bounds, self.counts)},
+                "inf": self.counts[-1],
+            },
+        }
+
+
+class _FunctionStats:
+    def __init__(self):
+        self.calls = 0
+        self.attempts = 0
+        self.retries = 0
+        self.backoff_seconds = 0.0
+        self.outcomes = {}
+        self.latency = Histogram()
+
+
+class _EndpointStats:
+    def __init__(self):
+        self.requests = 0
+        self.statuses = {}
+        self.bytes_received = 0
+        self.rate_limit_wait = 0.0
+        self.latency = Histogram()
+
+
+class MetricsRegistry:
+    """Thread-safe registry of function and endpoint statistics."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Clear all statistics."""
+        with self._lock:
+            self._functions = {}
+            self._endpoints = {}
+            self.started_at = datetime.now(timezone.utc)
+
+    def record_call(self, name, seconds, attempts, retries, backoff_seconds, outcome):
+        """
+        Record one call of a retry-decorated function.
+
+        Args:
+            name: Function name (module-qualified).
+            seconds: Wall-clock duration including retries and sleeps.
+            attempts: Attempts made (0 if a circuit breaker refused it).
+            retries: Backoff sleeps taken between attempts.
+            backoff_seconds: Total time slept between attempts.
+            outcome: 'ok', 'error' (gave up or non-retryable error), or
+                'circuit_open'.
+        """
+        with self._lock:
+            stats = self._functions.setdefault(name, _FunctionStats())
+            stats.calls += 1
+            stats.attempts += attempts
+            stats.retries += retries
+            stats.backoff_seconds += backoff_seconds
+            stats.outcomes[outcome] = stats.outcomes.get(outcome, 0) + 1
+            stats.latency.observe(seconds)
+
+    def record_request(self, endpoint, status, seconds, bytes_received=0):
+        """
+        Record one HTTP request.
+
+        Args:
+            endpoint: Host the request went to.
+            status: HTTP status code, or an exception class name for
+                requests that got no response.
+            seconds: Duration of the request.
+            bytes_received: Response body size, if known.
+        """
+        with self._lock:
+            stats = self._endpoints.setdefault(endpoint, _EndpointStats())
+            stats.requests += 1
+            key = str(status)
+            stats.statuses[key] = stats.statuses.get(key, 0) + 1
+            stats.bytes_received += bytes_received
+            stats.latency.observe(seconds)
+
+    def record_wait(self, endpoint, seconds):
+        """
+        Record time a request spent waiting for the rate limiter.
+
+        Args:
+            endpoint: Host the request was for.
+            seconds: Seconds waited.
+        """
+        with self._lock:
+            self._endpoints.setdefault(endpoint, _EndpointStats()).rate_limit_wait += seconds
+
+    def snapshot(self):
+        """
+        Return all statistics as a JSON-serializable dict.
+
+        Returns:
+            Dict with 'started_at', 'functions' and 'endpoints'.
+        """
+        with self._lock:
+            return {
+                "started_at": self.started_at.isoformat(),
+                "functions": {
+                    name: {
+                        "calls": s.calls,
+                        "attempts": s.attempts,
+                        "retries": s.retries,
+                        "backoff_seconds": s.backoff_seconds,
+                        "outcomes": dict(s.outcomes),
+                        "latency": s.latency.snapshot(),
+                    }
+                    for name, s in sorted(self._functions.items())
+                },
+                "endpoints": {
+                    name: {
+                        "requests": s.requests,
+                        "statuses": dict(s.statuses),
+                        "bytes_received": s.bytes_received,
+                        "rate_limit_wait_seconds": s.rate_limit_wait,
+                        "latency": s.latency.snapshot(),
+                    }
+                    for name, s in sorted(self._endpoints.items())
+                },
+            }
+
+
+registry = MetricsRegistry()
+
+
+def _seconds(value):
+    return "-" if value is None else f"{value:.2f}s"
+
+
+def report(path, extra=None):
+    """
+    Log a summary of the run's statistics and write them as JSON.
+
+    Args:
+        path: Stats file to write (e.g., COLLECTION_STATS_FILE).
+        extra: Optional dict of further sections to include in the file
+            (e.g., circuit breaker states).
+
+    Returns:
+        The dict written to path.
+    """
+    snapshot = registry.snapshot()
+    snapshot["finished_at"] = datetime.now(timezone.utc).isoformat()
+    snapshot.update(extra or {})
+
+    for host, s in snapshot["endpoints"].items():
+        latency = s["latency"]
+        statuses = ", ".join(f"{k}: {v}" for k, v in sorted(s["statuses"].items()))
+        logger.info("Endpoint %s: %d requests, p50 %s, p95 %s, max %s, %.1f KB, "
+                    "rate-limit wait %.1fs, statuses {%s}",
+                    host, s["requests"], _seconds(latency["p50"]),
+                    _seconds(latency["p95"]), _seconds(latency["max"]),
+                    s["bytes_received"] / 1024, s["rate_limit_wait_seconds"], statuses)
+    for name, s in snapshot["functions"].items():
+        logger.info("Function %s: %d calls, %d attempts, %d retries, %.1fs backoff, "
+                    "p95 %s, outcomes %s", name, s["calls"], s["attempts"],
+                    s["retries"], s["backoff_seconds"], _seconds(s["latency"]["p95"]),
+                    s["outcomes"])
+
+    save_json_atomic(snapshot, path)
+    logger.info("Request stats written to %s", path)
+    return snapshot
@@ -0,0 +1,332 @@
+"""
+Persistent, deduplicated store of collected posts.
+
+Posts are kept in an append-only NDJSON data log, with a second NDJSON
+log holding the hash index: one line per (platform, id) key with the
+byte offset and length of the key's current data line, a content hash,
+and first-seen/last-seen timestamps. The index is loaded into a dict on
+open; post bodies are read from the data log by offset only when needed.
+
+Upserting a run's posts therefore costs a few appended lines per post,
+regardless of how large the history is:
+
+- a new key appends a data line and an index line
+- a changed post (e.g., refreshed engagement counts) appends a new data
+  line and an index line pointing at it
+- an unchanged post appends only an index line with a new last_seen
+
+Superseded lines are dropped by compact(), which runs automatically on
+close once they outnumber live entries. A compaction writes the new data
+log next to the old one, then swaps in an index that names it. The index
+rename is the commit point: a crash before it leaves the old logs in
+place, and a store opened after it finishes moving the new data log in,
+so index offsets never point into the wrong data log.
+export_json() streams the store to the posts.json file the extractor and
+dashboard read.
+"""
+
+import glob
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime, timezone
+
+from collectors.config import (
+    POSTS_STORE_FILE, POSTS_STORE_INDEX_FILE, JOURNAL_FSYNC_EVERY,
+)
+from collectors.file_utils import (
+    NdjsonJournal, read_ndjson, read_json_records, save_json_stream,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def post_key(post):
+    """
+    Return the store key of a post.
+
+    Args:
+        post: Dict in unified post schema format.
+
+    Returns:
+        Key string of the form 'platform:id'.
+    """
+    return f"{post.get('platform', '')}:{post.get('id', '')}"
+
+
+def content_hash(post):
+    """
+    Return a short hash of a post's content, ignoring when it was collected.
+
+    Args:
+        post: Dict in unified post schema format.
+
+    Returns:
+        First 16 hex characters of the SHA-256 digest of the post.
+    """
+    content = {k: v for k, v in post.items()
+               if k not in ("collected_at", "first_seen", "last_seen")}
+    payload = json.dumps(content, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class PostsStore:
+    """
+    Append-only posts store keyed by (platform, id).
+
+    Not safe for concurrent writers; a collection run owns the store.
+    Usable as a context manager.
+    """
+
+    def __init__(self, data_path=None, index_path=None, fsync_every=None):
+        """
+        Open (or create) the store and load its index.
+
+        Args:
+            data_path: Path of the NDJSON data log (default: POSTS_STORE_FILE).
+            index_path: Path of the NDJSON index log
+                (default: POSTS_STORE_INDEX_FILE).
+            fsync_every: Index records appended per fsync
+                (default: JOURNAL_FSYNC_EVERY).
+        """
+        self.data_path = data_path or POSTS_STORE_FILE
+        self.index_path = index_path or POSTS_STORE_INDEX_FILE
+        self.fsync_every = fsync_every or JOURNAL_FSYNC_EVERY
+        self._index = {}
+        self._index_lines = 0
+        self._compaction = 0
+        for entry in read_ndjson(self.index_path):
+            if "key" in entry:
+                self._index[entry["key"]] = entry
+                self._index_lines += 1
+            elif "compaction" in entry:
+                self._compaction = entry["compaction"]
+        self._finish_compaction()
+        self._open()
+
+    def _compacted_path(self, compaction):
+        """Return where compaction number ``compaction`` writes its data log."""
+        return f"{self.data_path}.compact-{compaction}"
+
+    def _finish_compaction(self):
+        """
+        Move in the data log the index was compacted against, if a crash
+        left it unmoved, and remove logs of compactions that never committed.
+        """
+        committed = self._compacted_path(self._compaction)
+        if self._compaction and os.path.exists(committed):
+            logger.warning("Finishing interrupted posts store compaction %d",
+                           self._compaction)
+            os.replace(committed, self.data_path)
+        for stale in glob.glob(glob.escape(self.data_path) + ".compact-*"):
+            os.remove(stale)
+
+    def _open(self):
+        """Open the data log for appending and the index journal."""
+        dirpath = os.path.dirname(self.data_path)
+        if dirpath:
+            os.makedirs(dirpath, exist_ok=True)
+        self._data = open(self.data_path, 'ab')
+        if self._data.tell() > 0:
+            with open(self.data_path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    # Terminate a line torn by an earlier crash
+                    self._data.write(b'\n')
+        self._reader = open(self.data_path, 'rb')
+        self._journal = NdjsonJournal(self.index_path, fsync_every=self.fsync_every)
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def _read(self, entry):
+        """Read the post an index entry points at from the data log."""
+        self._reader.seek(entry["offset"])
+        return json.loads(self._reader.read(entry["length"]).decode("utf-8"))
+
+    def get(self, platform, post_id):
+        """
+        Return a stored post with its first_seen/last_seen fields.
+
+        Args:
+            platform: Platform name (e.g., 'twitter').
+            post_id: Post id string.
+
+        Returns:
+            Post dict, or None if the store has no such post.
+        """
+        entry = self._index.get(f"{platform}:{post_id}")
+        if entry is None:
+            return None
+        return self._with_seen(self._read(entry), entry)
+
+    @staticmethod
+    def _with_seen(post, entry):
+        """Attach the index's first_seen/last_seen timestamps to a post."""
+        post["first_seen"] = entry["first_seen"]
+        post["last_seen"] = entry["last_seen"]
+        return post
+
+    def _append_data(self, post):
+        """Append a post to the data log and return (offset, length)."""
+        line = json.dumps(post, ensure_ascii=False).encode("utf-8")
+        offset = self._data.tell()
+        self._data.write(line + b'\n')
+        self._data.flush()
+        return offset, len(line)
+
+    def upsert(self, post, seen_at=None):
+        """
+        Insert a post or refresh the stored version of it.
+
+        Args:
+            post: Dict in unified post schema format.
+            seen_at: ISO timestamp of this sighting (default: the post's
+                collected_at, or now).
+
+        Returns:
+            'inserted', 'updated', or 'unchanged'.
+        """
+        seen_at = (seen_at or post.get("collected_at") or
+                   datetime.now(timezone.utc).isoformat())
+        key = post_key(post)
+        digest = content_hash(post)
+        old = self._index.get(key)
+
+        if old is not None and old["hash"] == digest:
+            entry = dict(old, last_seen=max(old["last_seen"], seen_at))
+            result = "unchanged"
+        else:
+            # Data first: an index line must always point at a written post
+            body = {k: v for k, v in post.items() if k not in ("first_seen", "last_seen")}
+            offset, length = self._append_data(body)
+            entry = {
+                "key": key, "offset": offset, "length": length, "hash": digest,
+                "first_seen": old["first_seen"] if old else seen_at,
+                "last_seen": max(old["last_seen"], seen_at) if old else seen_at,
+            }
+            result = "updated" if old else "inserted"
+
+        self._index[key] = entry
+        self._journal.append(entry)
+        self._index_lines += 1
+        return result
+
+    def upsert_many(self, posts, seen_at=None):
+        """
+        Upsert a sequence of posts.
+
+        Args:
+            posts: Iterable of post dicts.
+            seen_at: ISO timestamp applied to every post (see upsert()).
+
+        Returns:
+            Dict with counts of 'inserted', 'updated', and 'unchanged' posts.
+        """
+        counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+        for post in posts:
+            counts[self.upsert(post, seen_at=seen_at)] += 1
+        return counts
+
+    def import_json(self, path):
+        """
+        Load an existing posts JSON file into the store, streaming it.
+
+        Args:
+            path: Path to a JSON array of posts (e.g., POSTS_FILE).
+
+        Returns:
+            Upsert counts (see upsert_many()).
+        """
+        return self.upsert_many(read_json_records(path))
+
+    def iter_posts(self):
+        """
+        Yield every stored post, in first-seen insertion order.
+
+        Yields:
+            Post dicts with first_seen/last_seen fields.
+        """
+        self._data.flush()
+        for entry in list(self._index.values()):
+            yield self._with_seen(self._read(entry), entry)
+
+    def export_json(self, output_path):
+        """
+        Write all posts as a JSON array, streaming one post at a time.
+
+        The file is written to a temporary path and renamed over
+        output_path, so readers never see a partial file.
+
+        Args:
+            output_path: Destination JSON file (e.g., POSTS_FILE).
+
+        Returns:
+            Number of posts written.
+        """
+        return save_json_stream(self.iter_posts(), output_path)
+
+    def compact(self):
+        """
+        Rewrite both logs with only the current version of each post.
+
+        Returns:
+            Number of superseded index lines dropped.
+        """
+        dropped = self._index_lines - len(self._index)
+        self._close_files()
+        compaction = self._compaction + 1
+        data_tmp = self._compacted_path(compaction)
+        index_tmp = self.index_path + '.compact'
+        entries = {}
+        with open(self.data_path, 'rb') as src, open(data_tmp, 'wb') as dst:
+            for key, entry in self._index.items():
+                src.seek(entry["offset"])
+                line = src.read(entry["length"])
+                entries[key] = dict(entry, offset=dst.tell())
+                dst.write(line + b'\n')
+            dst.flush()
+            os.fsync(dst.fileno())
+        with NdjsonJournal(index_tmp, fsync_every=self.fsync_every, truncate=True) as journal:
+            # Names the data log the offsets below point into
+            journal.append({"compaction": compaction})
+            for entry in entries.values():
+                journal.append(entry)
+        # Commit point; _finish_compaction() redoes the second rename after a crash
+        os.replace(index_tmp, self.index_path)
+        os.replace(data_tmp, self.data_path)
+        self._compaction = compaction
+        self._index = entries
+        self._index_lines = len(entries)
+        self._open()
+        logger.info("Compacted posts store: %d posts, %d stale records dropped",
+                    len(entries), dropped)
+        return dropped
+
+    def _close_files(self):
+        """Sync and close the data log, reader, and index journal."""
+        if not self._data.closed:
+            self._data.flush()
+            os.fsync(self._data.fileno())
+            self._data.close()
+        self._reader.close()
+        self._journal.close()
+
+    def close(self):
+        """Compact if superseded records outnumber live ones, then close."""
+        if self._data.closed:
+            return
+        if self._index_lines - len(self._index) > len(self._index):
+            self.compact()
+        self._close_files()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
@@ -0,0 +1,246 @@
+"""
+Per-host token-bucket rate limiting for API calls.
+
+Every request sent through http_client first takes a token from its
+host's bucket. Buckets refill at the rate configured in HTTP_RATE_LIMITS,
+so concurrent workers (per-keyword Twitter searches, parallel snapshot
+triggers, extraction workers) share one budget per provider. Without
+this, workers only slow down after 429s arrive.
+
+Buckets also update from response headers:
+
+- Retry-After (seconds or an HTTP date) pauses the host until then.
+- X-RateLimit-Remaining / RateLimit-Remaining caps the tokens left, and
+  when it reaches 0 the host is paused until X-RateLimit-Reset /
+  RateLimit-Reset (epoch seconds, epoch milliseconds, or a delay in
+  seconds).
+
+Hosts without a configured limit are unlimited but still honor these
+headers.
+"""
+
+import logging
+import threading
+import time
+from collections.abc import Mapping
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from collectors.config import HTTP_RATE_LIMITS, HTTP_DEFAULT_RATE_LIMIT
+
+logger = logging.getLogger(__name__)
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket with an optional pause deadline.
+
+    A bucket with rate None never runs out of tokens, so only pauses
+    from response headers delay it.
+    """
+
+    def __init__(self, rate=None, capacity=None, clock=time.monotonic,
+                 sleep_func=time.sleep):
+        """
+        Args:
+            rate: Tokens added per second, or None for unlimited.
+            capacity: Maximum tokens held, i.e. the allowed burst
+                (default: max(rate, 1)).
+            clock: Monotonic clock function; override in tests.
+            sleep_func: Function to call for sleeping; override in tests.
+        """
+        self.rate = rate
+        self.capacity = capacity or max(rate or 1, 1)
+        self._clock = clock
+        self._sleep = sleep_func
+        self._tokens = float(self.capacity)
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        """Add the tokens earned since the last update."""
+        if self.rate is not None:
+            elapsed = max(now - self._updated, 0.0)
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        """
+        Take one token, sleeping until one is available.
+
+        Returns:
+            Total seconds spent waiting.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._refill(now)
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                elif self.rate is None:
+                    return waited
+                elif self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                else:
+                    wait = (1 - self._tokens) / self.rate
+            self._sleep(wait)
+            waited += wait
+
+    def pause(self, seconds):
+        """
+        Hold every acquirer back for the given number of seconds.
+
+        Args:
+            seconds: Delay from now; extends, never shortens, a pause.
+        """
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self._paused_until = max(self._paused_until, now + seconds)
+            self._tokens = 0.0
+
+    def limit_tokens(self, remaining):
+        """
+        Cap the available tokens at what the server says is left.
+
+        Args:
+            remaining: Requests the server reports remaining in its window.
+        """
+        with self._lock:
+            self._refill(self._clock())
+            self._tokens = min(self._tokens, max(remaining, 0))
+
+
+def get_bucket(host):
+    """
+    Return the shared token bucket for a host.
+
+    Buckets are created on first use from HTTP_RATE_LIMITS, falling back
+    to HTTP_DEFAULT_RATE_LIMIT.
+
+    Args:
+        host: Lower-cased host[:port] string.
+
+    Returns:
+        TokenBucket for the host.
+    """
+    with _buckets_lock:
+        bucket = _buckets.get(host)
+        if bucket is None:
+            rate, capacity = HTTP_RATE_LIMITS.get(host) or \
+                HTTP_DEFAULT_RATE_LIMIT or (None, None)
+            bucket = TokenBucket(rate, capacity)
+            _buckets[host] = bucket
+        return bucket
+
+
+def acquire(host):
+    """
+    Wait for the host's rate limit before sending a request.
+
+    Args:
+        host: Lower-cased host[:port] string.
+
+    Returns:
+        Seconds spent waiting.
+    """
+    waited = get_bucket(host).acquire()
+    if waited > 0:
+        logger.debug("Rate limiter held a request to %s for %.2fs", host, waited)
+    return waited
+
+
+def _header(response, *names):
+    """Return the first present header among names, or None."""
+    headers = getattr(response, "headers", None)
+    if not isinstance(headers, Mapping):
+        return None
+    for name in names:
+        value = headers.get(name)
+        if isinstance(value, str) and value.strip():
+            return value.strip()
+    return None
+
+
+def retry_after_seconds(response):
+    """
+    Return the delay a response's Retry-After header asks for.
+
+    Args:
+        response: requests.Response (or any object with a headers mapping).
+
+    Returns:
+        Non-negative seconds, or None if the header is absent or invalid.
+    """
+    value = _header(response, "Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def _reset_delay(value):
+    """Convert a rate-limit reset header to a delay in seconds."""
+    try:
+        reset = float(value)
+    except ValueError:
+        return None
+    if reset > 1e12:  # epoch milliseconds (OpenRouter)
+        return max(reset / 1000 - time.time(), 0.0)
+    if reset > 1e9:  # epoch seconds
+        return max(reset - time.time(), 0.0)
+    return max(reset, 0.0)  # seconds from now
+
+
+def update_from_response(host, response):
+    """
+    Adjust the host's bucket from a response's rate-limit headers.
+
+    Args:
+        host: Lower-cased host[:port] string.
+        response: The requests.Response just received.
+    """
+    bucket = get_bucket(host)
+    retry_after = retry_after_seconds(response)
+    if retry_after is not None and retry_after > 0:
+        logger.warning("%s asked to retry after %.1fs; pausing requests to it",
+                       host, retry_after)
+        bucket.pause(retry_after)
+        return
+
+    remaining = _header(response, "X-RateLimit-Remaining", "RateLimit-Remaining")
+    if remaining is None:
+        return
+    try:
+        remaining = float(remaining)
+    except ValueError:
+        return
+    bucket.limit_tokens(remaining)
+    if remaining <= 0:
+        reset = _header(response, "X-RateLimit-Reset", "RateLimit-Reset")
+        delay = _reset_delay(reset) if reset is not None else None
+        if delay:
+            logger.warning("%s rate limit exhausted; pausing requests for %.1fs",
+                           host, delay)
+            bucket.pause(delay)
+
+
+def reset_all():
+    """Forget every bucket (used by tests and between runs)."""
+    with _buckets_lock:
+        _buckets.clear()
@@ -3,30 +3,277 @@ Retry utilities with exponential backoff for API calls.
 
 Provides a decorator that retries functions on transient HTTP errors
 (429, 500, 502, 503, 504) and ConnectionError, with configurable
-backoff parameters.
+backoff parameters. When the failed response carried a Retry-After
+header, that delay (capped at HTTP_MAX_RETRY_AFTER) replaces the
+backoff for that attempt.
+
+Backoff uses full jitter: each sleep is drawn uniformly from zero to the
+exponential delay (capped at RETRY_MAX_BACKOFF), so workers that failed
+together do not retry in lockstep.
+
+Each decorated function also goes through a circuit breaker, shared by
+every function given the same ``endpoint`` name:
+
+- closed: calls go through; BREAKER_FAILURE_THRESHOLD consecutive calls
+  that fail after all their retries open the circuit
+- open: calls fail fast with CircuitOpenError, without touching the
+  network, for BREAKER_RECOVERY_TIMEOUT seconds; calls already retrying
+  stop before their next backoff sleep
+- half-open: one probe call goes through (with its retries); success
+  closes the circuit, failure opens it again
+
+The breaker counts calls, not attempts, so it never cuts a call's own
+retry budget short. Calls that end throttled (429 or Retry-After) do not
+count: the endpoint is up, and rate_limiter paces requests to it.
+
+Transitions are logged, and breaker_states() reports every breaker.
+
+Every call is recorded in metrics.registry under the function's
+module-qualified name: duration including retries, attempts, retries,
+total backoff sleep, and outcome ('ok', 'error' or 'circuit_open').
 """
 
 import functools
 import logging
+import random
+import threading
 import time
 
 import requests
 
+from collectors import metrics
+from collectors.config import (
+    HTTP_MAX_RETRY_AFTER, RETRY_MAX_BACKOFF, BREAKER_FAILURE_THRESHOLD,
+    BREAKER_RECOVERY_TIMEOUT,
+)
+from collectors.rate_limiter import retry_after_seconds
+
 logger = logging.getLogger(__name__)
 
 # HTTP status codes that should trigger a retry
 RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
 
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
 
 class RetryableError(Exception):
-    """Raised when a retryable error occurs during an API call."""
+    """
+    Raised when a retryable error occurs during an API call.
+
+    Attributes:
+        retry_after: Seconds the server asked to wait, or None.
+        status_code: HTTP status code of the response, or None.
+    """
+
+    def __init__(self, message, retry_after=None, status_code=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.status_code = status_code
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an endpoint whose circuit is open."""
     pass
 
 
+class CircuitBreaker:
+    """
+    Thread-safe closed/open/half-open circuit breaker for one endpoint.
+    """
+
+    def __init__(self, name, failure_threshold=None, recovery_timeout=None,
+                 clock=time.monotonic):
+        """
+        Args:
+            name: Endpoint name used in logs and breaker_states().
+            failure_threshold: Consecutive failed calls that open the
+                circuit (default: BREAKER_FAILURE_THRESHOLD).
+            recovery_timeout: Seconds before an open circuit allows a probe
+                (default: BREAKER_RECOVERY_TIMEOUT).
+            clock: Monotonic clock function; override in tests.
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold or BREAKER_FAILURE_THRESHOLD
+        self.recovery_timeout = (BREAKER_RECOVERY_TIMEOUT if recovery_timeout is None
+                                 else recovery_timeout)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.transitions = {OPEN: 0, HALF_OPEN: 0, CLOSED: 0}
+        self.rejected = 0
+        self._probing = False
+
+    def _transition(self, state):
+        """Move to a new state and log it (lock held)."""
+        old, self.state = self.state, state
+        self.transitions[state] += 1
+        if state == OPEN:
+            self.opened_at = self._clock()
+            logger.warning("Circuit for %s %s after %d consecutive failed calls; "
+                           "failing fast for %.0fs", self.name,
+                           "re-opened" if old == HALF_OPEN else "opened",
+                           self.failures, self.recovery_timeout)
+        elif state == HALF_OPEN:
+            logger.info("Circuit for %s half-open; sending a probe", self.name)
+        else:
+            logger.info("Circuit for %s closed; endpoint recovered", self.name)
+
+    def allow(self):
+        """
+        Check whether a call may go through, claiming the probe if half-open.
+
+        Returns:
+            True if the call may proceed.
+        """
+        with self._lock:
+            if self.state == OPEN and \
+                    self._clock() - self.opened_at >= self.recovery_timeout:
+                self._transition(HALF_OPEN)
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            self.rejected += 1
+            return False
+
+    def is_open(self):
+        """
+        Check whether the circuit is open, without claiming a probe.
+
+        Returns:
+            True while the circuit is open and its recovery timeout has
+            not yet passed.
+        """
+        with self._lock:
+            return self.state == OPEN and \
+                self._clock() - self.opened_at < self.recovery_timeout
+
+    def release(self):
+        """Give back a half-open probe without counting the call either way."""
+        with self._lock:
+            self._probing = False
+
+    def record_success(self):
+        """Record a call that reached the endpoint and got an answer."""
+        with self._lock:
+            self._probing = False
+            self.failures = 0
+            if self.state != CLOSED:
+                self._transition(CLOSED)
+
+    def record_failure(self):
+        """Record a call that failed with transient errors on every attempt."""
+        with self._lock:
+            self._probing = False
+            self.failures += 1
+            if self.state == HALF_OPEN or \
+                    (self.state == CLOSED and self.failures >= self.failure_threshold):
+                self._transition(OPEN)
+
+    def snapshot(self):
+        """
+        Return the breaker's state and counters.
+
+        Returns:
+            Dict with 'state', 'failures', 'rejected', and 'transitions'
+            (count of entries into each state).
+        """
+        with self._lock:
+            return {"state": self.state, "failures": self.failures,
+                    "rejected": self.rejected, "transitions": dict(self.transitions)}
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(endpoint):
+    """
+    Return the shared circuit breaker for an endpoint name.
+
+    Args:
+        endpoint: Endpoint name, e.g. 'openrouter'.
+
+    Returns:
+        CircuitBreaker, created on first use.
+    """
+    with _breakers_lock:
+        breaker = _breakers.get(endpoint)
+        if breaker is None:
+            breaker = _breakers[endpoint] = CircuitBreaker(endpoint)
+        return breaker
+
+
+def breaker_states():
+    """
+    Return a snapshot of every registered circuit breaker.
+
+    Returns:
+        Dict of endpoint name -> CircuitBreaker.snapshot().
+    """
+    with _breakers_lock:
+        breakers = dict(_breakers)
+    return {name: breaker.snapshot() for name, breaker in breakers.items()}
+
+
+def reset_breakers():
+    """Forget every registered circuit breaker (used by tests)."""
+    with _breakers_lock:
+        _breakers.clear()
+
+
+def _retry_delay(error, backoff, jitter, random_func):
+    """
+    Return how long to sleep before the next attempt.
+
+    A server-requested Retry-After delay is used as is (capped at
+    HTTP_MAX_RETRY_AFTER); otherwise the backoff, with full jitter.
+    """
+    retry_after = getattr(error, "retry_after", None)
+    if retry_after is None and isinstance(error, requests.exceptions.HTTPError):
+        retry_after = retry_after_seconds(error.response)
+    if retry_after is not None:
+        return min(retry_after, HTTP_MAX_RETRY_AFTER)
+    return random_func(0, backoff) if jitter else backoff
+
+
+def _is_transient(error):
+    """Check whether an exception is a transient failure worth retrying."""
+    if isinstance(error, (requests.exceptions.ConnectionError,
+                          requests.exceptions.Timeout, RetryableError)):
+        return True
+    return (isinstance(error, requests.exceptions.HTTPError) and
+            error.response is not None and
+            error.response.status_code in RETRYABLE_STATUS_CODES)
+
+
+def _is_throttled(error):
+    """Check whether a transient error was the endpoint rate-limiting us."""
+    if isinstance(error, RetryableError):
+        return error.status_code == 429 or error.retry_after is not None
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        return (error.response.status_code == 429 or
+                retry_after_seconds(error.response) is not None)
+    return False
+
+
+def _describe(error):
+    """Short description of a transient error for retry logs."""
+    if isinstance(error, requests.exceptions.HTTPError):
+        return f"HTTP {error.response.status_code}"
+    return str(error)
+
+
 def retry_with_backoff(max_retries=5, initial_backoff=1.0, multiplier=2.0,
-                       sleep_func=time.sleep):
+                       sleep_func=time.sleep, max_backoff=None, jitter=True,
+                       endpoint=None, random_func=random.uniform):
     """
-    Decorator that retries a function with exponential backoff.
+    Decorator that retries a function with jittered exponential backoff.
 
     Retries on:
     - requests.exceptions.ConnectionError
@@ -34,67 +281,102 @@ def retry_with_backoff(max_retries=5, initial_backoff=1.0, multiplier=2.0,
     - RetryableError (raised manually for retryable HTTP status codes)
     - requests.HTTPError with retryable status codes
 
+    Each call first asks the endpoint's circuit breaker; while the
+    circuit is open, the call raises CircuitOpenError without running.
+    A call that finds the circuit opened by other calls between attempts
+    raises CircuitOpenError instead of sleeping.
+
     Args:
         max_retries: Maximum number of retry attempts (default: 5).
         initial_backoff: Initial wait time in seconds (default: 1.0).
         multiplier: Backoff multiplier per retry (default: 2.0).
         sleep_func: Function to call for sleeping (default: time.sleep).
             Override with a mock in tests to avoid actual delays.
+        max_backoff: Cap on the exponential delay in seconds
+            (default: RETRY_MAX_BACKOFF).
+        jitter: If True, sleep a uniformly random time between zero and
+            the delay (full jitter); if False, sleep the delay exactly.
+        endpoint: Name of the circuit breaker shared with other functions
+            calling the same API. If None, the function gets its own.
+        random_func: Function (low, high) -> float used for jitter.
 
     Returns:
         Decorated function with retry behavior.
     """
+    if max_backoff is None:
+        max_backoff = RETRY_MAX_BACKOFF
+
     def decorator(func):
+        name = f"{func.__module__}.{func.__name__}"
+        breaker = get_breaker(endpoint) if endpoint else CircuitBreaker(name)
+
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
             backoff = initial_backoff
             last_exception = None
+            started = time.monotonic()
+            attempts = retries = 0
+            slept = 0.0
+            outcome = "error"
 
-            for attempt in range(max_retries + 1):
-                try:
-                    return func(*args, **kwargs)
-                except (requests.exceptions.ConnectionError,
-                        requests.exceptions.Timeout,
-                        RetryableError) as e:
-                    last_exception = e
-                    if attempt < max_retries:
-                        logger.warning(
-                            "Attempt %d/%d failed for %s: %s. "
-                            "Retrying in %.1fs...",
-                            attempt + 1, max_retries + 1,
-                            func.__name__, str(e), backoff
-                        )
-                        sleep_func(backoff)
-                        backoff *= multiplier
-                    else:
-                        logger.error(
-                            "All %d attempts failed for %s: %s",
-                            max_retries + 1, func.__name__, str(e)
-                        )
-                except requests.exceptions.HTTPError as e:
-                    if (e.response is not None and
-                            e.response.status_code in RETRYABLE_STATUS_CODES):
+            try:
+                if not breaker.allow():
+                    outcome = "circuit_open"
+                    raise CircuitOpenError(
+                        f"Circuit for {breaker.name} is open; not calling "
+                        f"{func.__name__}"
+                    )
+                for attempt in range(max_retries + 1):
+                    attempts += 1
+                    try:
+                        result = func(*args, **kwargs)
+                    except Exception as e:
+                        if not _is_transient(e):
+                            # The endpoint answered; the request itself was bad
+                            breaker.record_success()
+                            raise
                         last_exception = e
                         if attempt < max_retries:
+                            if breaker.is_open():
+                                # Other calls found the endpoint down meanwhile
+                                breaker.release()
+                                outcome = "circuit_open"
+                                raise CircuitOpenError(
+                                    f"Circuit for {breaker.name} opened; not "
+                                    f"retrying {func.__name__}"
+                                ) from e
+                            delay = _retry_delay(e, min(backoff, max_backoff),
+                                                 jitter, random_func)
                             logger.warning(
-                                "Attempt %d/%d failed for %s: HTTP %d. "
+                                "Attempt %d/%d failed for %s: %s. "
                                 "Retrying in %.1fs...",
                                 attempt + 1, max_retries + 1,
-                                func.__name__,
-                                e.response.status_code, backoff
+                                func.__name__, _describe(e), delay
                             )
-                            sleep_func(backoff)
+                            sleep_func(delay)
+                            slept += delay
+                            retries += 1
                             backoff *= multiplier
                         else:
                             logger.error(
-                                "All %d attempts failed for %s: HTTP %d",
-                                max_retries + 1, func.__name__,
-                                e.response.status_code
+                                "All %d attempts failed for %s: %s",
+                                max_retries + 1, func.__name__, _describe(e)
                             )
                     else:
-                        raise
+                        breaker.record_success()
+                        outcome = "ok"
+                        return result
 
-            raise last_exception
+                if _is_throttled(last_exception):
+                    # Rate limiting is paced by rate_limiter, not the breaker
+                    breaker.release()
+                else:
+                    breaker.record_failure()
+                raise last_exception
+            finally:
+                metrics.registry.record_call(name, time.monotonic() - started,
+                                             attempts, retries, slept, outcome)
+        wrapper.breaker = breaker
         return wrapper
     return decorator
 
@@ -109,11 +391,14 @@ def check_response_retryable(response):
         response: A requests.Response object.
 
     Raises:
-        RetryableError: If the status code is in RETRYABLE_STATUS_CODES.
+        RetryableError: If the status code is in RETRYABLE_STATUS_CODES,
+            carrying the response's Retry-After delay if it has one.
         requests.HTTPError: If the status code indicates a non-retryable error.
     """
     if response.status_code in RETRYABLE_STATUS_CODES:
         raise RetryableError(
-            f"HTTP {response.status_code}: {response.text[:200]}"
+            f"HTTP {response.status_code}: {response.text[:200]}",
+            retry_after=retry_after_seconds(response),
+            status_code=response.status_code,
         )
     response.raise_for_status()
@@ -2,24 +2,46 @@
 CLI entry point for data collection from social media platforms.
 
 Runs selected collectors (Twitter, Meta, TikTok) based on provided
-arguments, merges results into data/posts.json.
+arguments, one after another or concurrently with --parallel, and upserts
+results into the persistent posts store, which is exported to
+data/posts.json. With --resume, instead finishes BrightData
+snapshots left pending by an interrupted run, without triggering new ones.
+
+The export rewrites the whole history. Recurring runs can pass
+--no-export to only append to the store, and refresh posts.json with
+--export-only before extraction.
 
 Usage:
     python -m collectors.run_collection \\
         --twitter-keywords "AI" "machine learning" \\
         --meta-urls "https://facebook.com/page" \\
-        --tiktok-urls "https://tiktok.com/@user"
+        --tiktok-urls "https://tiktok.com/@user" \\
+        [--parallel]
+    python -m collectors.run_collection --resume
+    python -m collectors.run_collection --export-only
 """
 
 import argparse
 import logging
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
-from collectors.config import validate_keys, POSTS_FILE
-from collectors.file_utils import save_json_atomic, load_json_safe
+from collectors.config import (
+    validate_keys, POSTS_FILE, RAW_DIR, STORAGE_BACKEND, COLLECTION_STATS_FILE,
+    BRIGHTDATA_FACEBOOK_DATASET_ID, BRIGHTDATA_TIKTOK_DATASET_ID,
+)
+from collectors.posts_store import PostsStore
+from collectors import metrics, sqlite_store
+from collectors.file_utils import save_json_stream
+from collectors.retry_utils import breaker_states
+from collectors.brightdata_utils import (
+    find_pending_snapshots, poll_snapshots, stream_snapshot,
+)
 from collectors.twitter_collector import collect_twitter
-from collectors.meta_collector import collect_meta
-from collectors.tiktok_collector import collect_tiktok
+from collectors.meta_collector import collect_meta, iter_meta_posts
+from collectors.tiktok_collector import collect_tiktok, iter_tiktok_posts
 
 logging.basicConfig(
     level=logging.INFO,
@@ -27,6 +49,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# BrightData dataset ID -> (raw archive subdirectory, record normalizer)
+SNAPSHOT_NORMALIZERS = {
+    BRIGHTDATA_FACEBOOK_DATASET_ID: ("meta", iter_meta_posts),
+    BRIGHTDATA_TIKTOK_DATASET_ID: ("tiktok", iter_tiktok_posts),
+}
+
 
 def parse_args(argv=None):
     """
@@ -45,6 +73,16 @@ def parse_args(argv=None):
         "--twitter-keywords", nargs="+", default=[],
         help="Keywords to search on Twitter (e.g., 'AI' 'deep learning')"
     )
+    parser.add_argument(
+        "--twitter-per-keyword", action="store_true",
+        help=("Search each Twitter keyword concurrently with its own cursor "
+              "instead of one OR query; a keyword may be a group like 'AI OR ML'")
+    )
+    parser.add_argument(
+        "--twitter-incremental", action="store_true",
+        help=("Only fetch tweets newer than each query's high-water mark from "
+              "the previous run (data/twitter_state.json)")
+    )
     parser.add_argument(
         "--meta-urls", nargs="+", default=[],
         help="Facebook page URLs to collect from"
@@ -53,54 +91,283 @@ def parse_args(argv=None):
         "--tiktok-urls", nargs="+", default=[],
         help="TikTok VIDEO URLs to collect (e.g., 'https://tiktok.com/@user/video/123')"
     )
+    parser.add_argument(
+        "--parallel", action="store_true",
+        help="Run the selected platform collectors concurrently"
+    )
+    parser.add_argument(
+        "--snapshot-cache-ttl", type=float, default=None, metavar="SECONDS",
+        help=("Reuse BrightData snapshots downloaded within this many seconds "
+              "for the same inputs; 0 forces a fresh scrape "
+              "(default: BRIGHTDATA_CACHE_TTL)")
+    )
+    parser.add_argument(
+        "--snapshot-chunk-size", type=int, default=None, metavar="N",
+        help=("Split BrightData inputs into snapshots of at most N URLs, "
+              "triggered in parallel (default: BRIGHTDATA_CHUNK_SIZE)")
+    )
+    parser.add_argument(
+        "--resume", action="store_true",
+        help=("Download BrightData snapshots left pending by an interrupted run "
+              "and merge them into the posts file, without triggering new scrapes")
+    )
+    parser.add_argument(
+        "--no-export", action="store_true",
+        help=("Only append this run's posts to the posts store; skip rewriting "
+              "posts.json (run --export-only before extraction)")
+    )
+    parser.add_argument(
+        "--export-only", action="store_true",
+        help="Rewrite posts.json from the posts store without collecting"
+    )
     return parser.parse_args(argv)
 
 
+def _run_collector(label, collector, inputs):
+    """
+    Run one platform collector, isolating its failures.
+
+    Args:
+        label: Human-readable platform name for logging.
+        collector: Collector function taking the inputs list.
+        inputs: Keywords or URLs to pass to the collector.
+
+    Returns:
+        List of normalized posts, or an empty list if the collector raised.
+    """
+    logger.info("Starting %s collection...", label)
+    try:
+        posts = collector(inputs)
+    except Exception as e:
+        logger.error("%s collection failed: %s", label, str(e))
+        return []
+    logger.info("%s: collected %d posts", label, len(posts))
+    return posts
+
+
+def collect_platforms(args):
+    """
+    Run the collectors selected by the parsed arguments.
+
+    Every collector runs with its own failure isolation; a failing
+    platform contributes no posts but does not stop the others. With
+    args.parallel, all selected collectors run at once in a thread pool,
+    so wall-clock time is that of the slowest platform. Results are
+    merged in a fixed platform order (Twitter, Facebook, TikTok)
+    regardless of which finishes first.
+
+    Args:
+        args: Parsed argparse.Namespace from parse_args().
+
+    Returns:
+        List of normalized posts from all selected platforms.
+    """
+    snapshot_options = {
+        "cache_ttl": getattr(args, "snapshot_cache_ttl", None),
+        "chunk_size": getattr(args, "snapshot_chunk_size", None),
+    }
+    jobs = []
+    if args.twitter_keywords:
+        twitter = partial(
+            collect_twitter,
+            per_keyword=getattr(args, "twitter_per_keyword", False),
+            incremental=getattr(args, "twitter_incremental", False),
+        )
+        jobs.append(("Twitter", twitter, args.twitter_keywords))
+    if args.meta_urls:
+        jobs.append(("Facebook", partial(collect_meta, **snapshot_options),
+                     args.meta_urls))
+    if args.tiktok_urls:
+        jobs.append(("TikTok", partial(collect_tiktok, **snapshot_options),
+                     args.tiktok_urls))
+
+    if args.parallel and len(jobs) > 1:
+        with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+            futures = [executor.submit(_run_collector, *job) for job in jobs]
+            results = [future.result() for future in futures]
+    else:
+        results = [_run_collector(*job) for job in jobs]
+
+    all_posts = []
+    for posts in results:
+        all_posts.extend(posts)
+    return all_posts
+
+
+def resume_pending_snapshots():
+    """
+    Finish BrightData snapshots that were triggered but never downloaded.
+
+    Finds pending crash-recovery files, polls all of their snapshots
+    together, and streams each ready snapshot into the raw archive,
+    normalizing it with the platform normalizer for its stored dataset ID.
+    Nothing new is triggered.
+
+    Returns:
+        List of normalized posts from the recovered snapshots.
+    """
+    pending = find_pending_snapshots()
+    if not pending:
+        logger.info("No pending BrightData snapshots to resume.")
+        return []
+
+    resumable = []
+    for record in pending:
+        if record.get("dataset_id") in SNAPSHOT_NORMALIZERS:
+            resumable.append(record)
+        else:
+            logger.warning("Snapshot %s has unknown dataset %s, skipping",
+                           record["snapshot_id"], record.get("dataset_id"))
+
+    logger.info("Resuming %d pending snapshot(s)...", len(resumable))
+    statuses = poll_snapshots([r["snapshot_id"] for r in resumable])
+
+    posts = []
+    for record in resumable:
+        snapshot_id = record["snapshot_id"]
+        if statuses.get(snapshot_id) != "ready":
+            logger.warning("Snapshot %s is %s, leaving it for a later resume",
+                           snapshot_id, statuses.get(snapshot_id))
+            continue
+        subdir, normalize = SNAPSHOT_NORMALIZERS[record["dataset_id"]]
+        raw_path = os.path.join(RAW_DIR, subdir, f'snapshot_{snapshot_id}.json')
+        try:
+            recovered = list(normalize(stream_snapshot(snapshot_id, raw_path)))
+        except Exception as e:
+            logger.error("Failed to download snapshot %s: %s", snapshot_id, str(e))
+            continue
+        logger.info("Recovered %d %s posts from snapshot %s",
+                    len(recovered), subdir, snapshot_id)
+        posts.extend(recovered)
+    return posts
+
+
+def store_posts(posts, posts_file=None, data_path=None, index_path=None,
+                backend=None, export=True):
+    """
+    Upsert posts into the persistent posts store and re-export posts.json.
+
+    On first use, an existing posts file is imported so earlier runs are
+    kept. Each post costs a few appended log lines; the history is never
+    loaded into memory. The export streams one post at a time but writes
+    the whole history, so recurring runs can skip it with export=False
+    and export once before extraction.
+
+    Args:
+        posts: List of newly collected post dicts.
+        posts_file: JSON file to export to (default: POSTS_FILE).
+        data_path: Store data log, or database file for the SQLite
+            backend (default: POSTS_STORE_FILE / SQLITE_DB_FILE).
+        index_path: Store index log (default: POSTS_STORE_INDEX_FILE).
+        backend: 'json' or 'sqlite' (default: STORAGE_BACKEND).
+        export: If False, leave posts_file as it is.
+
+    Returns:
+        Dict of upsert counts ('inserted', 'updated', 'unchanged') and
+        'total' posts in the store.
+    """
+    if posts_file is None:
+        posts_file = POSTS_FILE
+    if (backend or STORAGE_BACKEND) == "sqlite":
+        counts = _store_posts_sqlite(posts, posts_file, data_path, export)
+    else:
+        with PostsStore(data_path, index_path) as store:
+            if not len(store) and os.path.exists(posts_file):
+                imported = store.import_json(posts_file)
+                logger.info("Imported %d existing posts from %s into the posts store",
+                            sum(imported.values()), posts_file)
+            counts = store.upsert_many(posts)
+            counts["total"] = store.export_json(posts_file) if export else len(store)
+    logger.info("Posts store: %d new, %d updated, %d unchanged; %d total posts",
+                counts["inserted"], counts["updated"], counts["unchanged"],
+                counts["total"])
+    if export:
+        logger.info("Exported %d posts to %s", counts["total"], posts_file)
+    else:
+        logger.info("Skipped exporting %s; run with --export-only to refresh it",
+                    posts_file)
+    return counts
+
+
+def _store_posts_sqlite(posts, posts_file, db_path=None, export=True):
+    """
+    SQLite variant of store_posts().
+
+    The database does not compare content hashes, so every re-collected
+    post counts as updated.
+    """
+    conn = sqlite_store.connect(db_path)
+    try:
+        def post_count():
+            return conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+
+        if not post_count() and os.path.exists(posts_file):
+            imported = sqlite_store.import_posts(conn, posts_file)
+            logger.info("Imported %d existing posts from %s into SQLite",
+                        imported, posts_file)
+        before = post_count()
+        written = sqlite_store.upsert_posts(conn, posts)
+        inserted = post_count() - before
+        if export:
+            total = save_json_stream(sqlite_store.iter_posts(conn), posts_file)
+        else:
+            total = post_count()
+    finally:
+        conn.close()
+    return {"inserted": inserted, "updated": written - inserted,
+            "unchanged": 0, "total": total}
+
+
 def main(argv=None):
     """
     Main entry point for data collection.
 
-    Validates required API keys, runs selected collectors, and merges
-    all results into data/posts.json.
+    Validates required API keys, runs selected collectors, and upserts
+    all results into the posts store, re-exporting data/posts.json. With
+    --resume, recovers pending BrightData snapshots and upserts those.
+    --no-export skips rewriting posts.json, and --export-only only
+    rewrites it. Logs request/retry stats at the end and writes them to
+    data/collection_stats.json.
 
     Args:
         argv: Optional list of argument strings for testing.
     """
     args = parse_args(argv)
 
-    if not args.twitter_keywords and not args.meta_urls and not args.tiktok_urls:
-        print("Error: Provide at least one of --twitter-keywords, --meta-urls, or --tiktok-urls")
-        sys.exit(1)
+    if args.export_only:
+        store_posts([])
+        return
 
-    all_posts = []
+    if args.resume:
+        validate_keys('brightdata')
+    else:
+        if not args.twitter_keywords and not args.meta_urls and not args.tiktok_urls:
+            print("Error: Provide at least one of --twitter-keywords, --meta-urls, "
+                  "--tiktok-urls, --resume, or --export-only")
+            sys.exit(1)
 
-    # Twitter collection
-    if args.twitter_keywords:
-        validate_keys('twitter')
-        logger.info("Starting Twitter collection...")
-        tweets = collect_twitter(args.twitter_keywords)
-        all_posts.extend(tweets)
-        logger.info("Twitter: collected %d posts", len(tweets))
+        # Validate every key up front so a missing key never aborts a
+        # collection that is already running on another platform.
+        if args.twitter_keywords:
+            validate_keys('twitter')
+        if args.meta_urls or args.tiktok_urls:
+            validate_keys('brightdata')
 
-    # Meta/Facebook collection
-    if args.meta_urls:
-        validate_keys('brightdata')
-        logger.info("Starting Facebook collection...")
-        meta_posts = collect_meta(args.meta_urls)
-        all_posts.extend(meta_posts)
-        logger.info("Facebook: collected %d posts", len(meta_posts))
+    metrics.registry.reset()
+    try:
+        if args.resume:
+            recovered = resume_pending_snapshots()
+            logger.info("Recovered %d posts", len(recovered))
+            store_posts(recovered, export=not args.no_export)
+            return
 
-    # TikTok collection
-    if args.tiktok_urls:
-        validate_keys('brightdata')
-        logger.info("Starting TikTok collection...")
-        tiktok_posts = collect_tiktok(args.tiktok_urls)
-        all_posts.extend(tiktok_posts)
-        logger.info("TikTok: collected %d posts", len(tiktok_posts))
-
-    # Save merged results
-    save_json_atomic(all_posts, POSTS_FILE)
-    logger.info("Saved %d total posts to %s", len(all_posts), POSTS_FILE)
+        all_posts = collect_platforms(args)
+        logger.info("Collected %d posts this run", len(all_posts))
+        store_posts(all_posts, export=not args.no_export)
+    finally:
+        # Also on failure: the stats show which endpoint broke the run
+        metrics.report(COLLECTION_STATS_FILE,
+                       {"circuit_breakers": breaker_states()})
 
 
 if __name__ == "__main__":
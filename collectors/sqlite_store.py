@@ -0,0 +1,308 @@
+"""
+Optional SQLite storage backend for posts and claims.
+
+Selected with STORAGE_BACKEND=sqlite. Posts and claims live in indexed
+tables of one database (SQLITE_DB_FILE) in WAL mode, so readers do not
+block the writer and queries by platform, timestamp, post, status,
+category, or confidence use an index instead of parsing a whole JSON
+file. Writes are batched into one transaction per call.
+
+export_json() still produces data/posts.json and data/claims.json in the
+format the dashboard reads today.
+
+Usage:
+    python -m collectors.sqlite_store import   # load the JSON files
+    python -m collectors.sqlite_store export   # rewrite the JSON files
+"""
+
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import sys
+from datetime import datetime, timezone
+
+from collectors.config import SQLITE_DB_FILE, POSTS_FILE, CLAIMS_FILE
+from collectors.file_utils import read_json_records, save_json_stream
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS posts (
+    platform TEXT NOT NULL,
+    id TEXT NOT NULL,
+    author TEXT,
+    text TEXT,
+    url TEXT,
+    timestamp TEXT,
+    likes INTEGER,
+    shares INTEGER,
+    comments INTEGER,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (platform, id)
+);
+CREATE INDEX IF NOT EXISTS idx_posts_timestamp ON posts (timestamp);
+CREATE INDEX IF NOT EXISTS idx_posts_platform_timestamp ON posts (platform, timestamp);
+
+CREATE TABLE IF NOT EXISTS claims (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    post_id TEXT NOT NULL,
+    platform TEXT,
+    claim_text TEXT,
+    category TEXT,
+    confidence REAL,
+    status TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_claims_post ON claims (platform, post_id);
+CREATE INDEX IF NOT EXISTS idx_claims_status ON claims (status);
+CREATE INDEX IF NOT EXISTS idx_claims_category ON claims (category);
+CREATE INDEX IF NOT EXISTS idx_claims_confidence ON claims (confidence);
+"""
+
+_UPSERT_POST = """
+INSERT INTO posts (platform, id, author, text, url, timestamp, likes, shares,
+                   comments, first_seen, last_seen, data)
+VALUES (:platform, :id, :author, :text, :url, :timestamp, :likes, :shares,
+        :comments, :seen, :seen, :data)
+ON CONFLICT (platform, id) DO UPDATE SET
+    author = excluded.author, text = excluded.text, url = excluded.url,
+    timestamp = excluded.timestamp, likes = excluded.likes,
+    shares = excluded.shares, comments = excluded.comments,
+    last_seen = MAX(posts.last_seen, excluded.last_seen), data = excluded.data
+"""
+
+
+def connect(path=None):
+    """
+    Open the database in WAL mode, creating the schema if needed.
+
+    Args:
+        path: Database file path (default: SQLITE_DB_FILE).
+
+    Returns:
+        sqlite3.Connection.
+    """
+    path = path or SQLITE_DB_FILE
+    dirpath = os.path.dirname(path)
+    if dirpath:
+        os.makedirs(dirpath, exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _post_row(post, seen_at):
+    """Map a unified-schema post to a posts table row."""
+    engagement = post.get("engagement") or {}
+    body = {k: v for k, v in post.items() if k not in ("first_seen", "last_seen")}
+    return {
+        "platform": post.get("platform", ""),
+        "id": str(post.get("id", "")),
+        "author": post.get("author"),
+        "text": post.get("text"),
+        "url": post.get("url"),
+        "timestamp": post.get("timestamp"),
+        "likes": engagement.get("likes"),
+        "shares": engagement.get("shares"),
+        "comments": engagement.get("comments"),
+        "seen": seen_at or post.get("collected_at") or datetime.now(timezone.utc).isoformat(),
+        "data": json.dumps(body, ensure_ascii=False),
+    }
+
+
+def upsert_posts(conn, posts, seen_at=None):
+    """
+    Insert or refresh posts in one transaction.
+
+    Existing posts keep their first_seen; every other column, including
+    engagement counts, is replaced by the new version.
+
+    Args:
+        conn: Connection from connect().
+        posts: Iterable of post dicts in unified schema.
+        seen_at: ISO timestamp of this sighting (default: each post's
+            collected_at, or now).
+
+    Returns:
+        Number of posts written.
+    """
+    with conn:
+        cursor = conn.executemany(_UPSERT_POST, (_post_row(p, seen_at) for p in posts))
+    return cursor.rowcount
+
+
+def replace_claims(conn, claims):
+    """
+    Replace the claims table with the given claims in one transaction.
+
+    The claims file is rebuilt from the extraction journal on every run,
+    so the table mirrors it rather than being patched.
+
+    Args:
+        conn: Connection from connect().
+        claims: Iterable of claim dicts.
+
+    Returns:
+        Number of claims written.
+    """
+    rows = (
+        (str(c.get("post_id", "")), c.get("platform"), c.get("claim_text"),
+         c.get("category"), c.get("confidence"), c.get("status"),
+         json.dumps(c, ensure_ascii=False))
+        for c in claims
+    )
+    with conn:
+        conn.execute("DELETE FROM claims")
+        cursor = conn.executemany(
+            "INSERT INTO claims (post_id, platform, claim_text, category, confidence,"
+            " status, data) VALUES (?, ?, ?, ?, ?, ?, ?)", rows,
+        )
+    return cursor.rowcount
+
+
+def iter_posts(conn, platform=None):
+    """
+    Yield stored posts in first-seen order.
+
+    Args:
+        conn: Connection from connect().
+        platform: Only yield posts of this platform, if given.
+
+    Yields:
+        Post dicts with first_seen/last_seen fields.
+    """
+    query = "SELECT data, first_seen, last_seen FROM posts"
+    params = ()
+    if platform:
+        query += " WHERE platform = ?"
+        params = (platform,)
+    for data, first_seen, last_seen in conn.execute(query + " ORDER BY rowid", params):
+        post = json.loads(data)
+        post["first_seen"] = first_seen
+        post["last_seen"] = last_seen
+        yield post
+
+
+def iter_claims(conn, status=None):
+    """
+    Yield stored claims in extraction order.
+
+    Args:
+        conn: Connection from connect().
+        status: Only yield claims with this status, if given.
+
+    Yields:
+        Claim dicts.
+    """
+    query = "SELECT data FROM claims"
+    params = ()
+    if status:
+        query += " WHERE status = ?"
+        params = (status,)
+    for (data,) in conn.execute(query + " ORDER BY seq", params):
+        yield json.loads(data)
+
+
+def export_json(conn, posts_path=None, claims_path=None):
+    """
+    Write the JSON files the dashboard reads from the database.
+
+    Args:
+        conn: Connection from connect().
+        posts_path: Posts JSON path (default: POSTS_FILE).
+        claims_path: Claims JSON path (default: CLAIMS_FILE).
+
+    Returns:
+        Tuple of (posts written, claims written).
+    """
+    posts = save_json_stream(iter_posts(conn), posts_path or POSTS_FILE)
+    claims = save_json_stream(iter_claims(conn), claims_path or CLAIMS_FILE)
+    return posts, claims
+
+
+def import_posts(conn, posts_path=None):
+    """
+    Upsert the posts of a JSON posts file into the database, streaming it.
+
+    Args:
+        conn: Connection from connect().
+        posts_path: Posts JSON path (default: POSTS_FILE).
+
+    Returns:
+        Number of posts loaded (0 if the file does not exist).
+    """
+    posts_path = posts_path or POSTS_FILE
+    if not os.path.exists(posts_path):
+        return 0
+    return upsert_posts(conn, read_json_records(posts_path))
+
+
+def import_claims(conn, claims_path=None):
+    """
+    Replace the claims table with the contents of a JSON claims file.
+
+    Args:
+        conn: Connection from connect().
+        claims_path: Claims JSON path (default: CLAIMS_FILE).
+
+    Returns:
+        Number of claims loaded (0, leaving the table as is, if the file
+        does not exist).
+    """
+    claims_path = claims_path or CLAIMS_FILE
+    if not os.path.exists(claims_path):
+        return 0
+    return replace_claims(conn, read_json_records(claims_path))
+
+
+def import_json(conn, posts_path=None, claims_path=None):
+    """
+    Load the JSON posts and claims files into the database.
+
+    Args:
+        conn: Connection from connect().
+        posts_path: Posts JSON path (default: POSTS_FILE).
+        claims_path: Claims JSON path (default: CLAIMS_FILE).
+
+    Returns:
+        Tuple of (posts loaded, claims loaded).
+    """
+    return import_posts(conn, posts_path), import_claims(conn, claims_path)
+
+
+def main(argv=None):
+    """
+    Import the JSON files into, or export them from, the SQLite database.
+
+    Args:
+        argv: Optional list of argument strings for testing.
+    """
+    logging.basicConfig(level=logging.INFO,
+                        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    parser = argparse.ArgumentParser(
+        description="Move posts and claims between the JSON files and SQLite."
+    )
+    parser.add_argument("command", choices=["import", "export"])
+    parser.add_argument("--db", default=SQLITE_DB_FILE, help="SQLite database path")
+    args = parser.parse_args(argv)
+
+    conn = connect(args.db)
+    try:
+        if args.command == "import":
+            posts, claims = import_json(conn)
+            logger.info("Imported %d posts and %d claims into %s", posts, claims, args.db)
+        else:
+            posts, claims = export_json(conn)
+            logger.info("Exported %d posts and %d claims from %s", posts, claims, args.db)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
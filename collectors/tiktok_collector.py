@@ -10,16 +10,12 @@ scraping — each input must be a direct video URL.
 """
 
 import logging
-import os
 from datetime import datetime, timezone
 
 from collectors.config import (
-    BRIGHTDATA_TIKTOK_DATASET_ID, MAX_POSTS, RAW_DIR,
+    BRIGHTDATA_TIKTOK_DATASET_ID,
 )
-from collectors.brightdata_utils import (
-    trigger_collection, poll_snapshot, download_snapshot,
-)
-from collectors.file_utils import save_json_atomic
+from collectors.brightdata_utils import collect_snapshot_records
 
 logger = logging.getLogger(__name__)
 
@@ -58,51 +54,62 @@ def normalize_tiktok_post(post):
     }
 
 
-def collect_tiktok(video_urls):
+def iter_tiktok_posts(records):
+    """
+    Lazily normalize raw BrightData TikTok records, skipping non-dict items.
+
+    Args:
+        records: Iterable of raw records (e.g., from stream_snapshot()).
+
+    Yields:
+        Dicts in unified post schema format.
+    """
+    for item in records:
+        if not isinstance(item, dict):
+            logger.warning("Skipping non-dict item in TikTok response: %s", type(item))
+            continue
+        yield normalize_tiktok_post(item)
+
+
+def collect_tiktok(video_urls, cache_ttl=None, chunk_size=None):
     """
     Collect TikTok posts by individual video URL via BrightData.
 
     Each URL must be a direct video link (tiktok.com/@user/video/ID).
     The BrightData TikTok Posts dataset does NOT support profile URLs
-    or num_of_posts — it scrapes one video per input URL.
+    or num_of_posts — it scrapes one video per input URL. Large URL lists
+    are split into chunks, each triggered as its own snapshot in parallel,
+    and posts are deduplicated by id.
 
     Args:
         video_urls: List of TikTok video URL strings.
             Format: https://www.tiktok.com/@username/video/1234567890
+        cache_ttl: Snapshot cache lifetime in seconds; videos scraped more
+            recently are served from their raw archive, and 0 forces a
+            fresh scrape (default: BRIGHTDATA_CACHE_TTL).
+        chunk_size: Maximum URLs per snapshot (default: BRIGHTDATA_CHUNK_SIZE).
 
     Returns:
-        List of normalized post dicts (up to MAX_POSTS).
+        List of normalized post dicts, at most one per video.
     """
     logger.info("Collecting %d TikTok video(s)...", len(video_urls))
 
     # Each URL is a separate input — no num_of_posts field allowed
-    inputs = [{"url": url} for url in video_urls[:MAX_POSTS]]
-
-    # Trigger collection
-    snapshot_id = trigger_collection(BRIGHTDATA_TIKTOK_DATASET_ID, inputs)
-
-    # Poll until ready
-    ready = poll_snapshot(snapshot_id)
-    if not ready:
-        logger.error("BrightData TikTok collection timed out.")
-        return []
+    inputs = [{"url": url} for url in dict.fromkeys(video_urls)]
 
-    # Download results
-    raw_data = download_snapshot(snapshot_id)
-
-    # Save raw data
-    raw_path = os.path.join(RAW_DIR, 'tiktok', f'snapshot_{snapshot_id}.json')
-    save_json_atomic(raw_data, raw_path)
-
-    # Normalize — filter out non-dict items
+    # Reuse recently downloaded snapshots; uncached inputs are triggered in
+    # parallel chunks. Records are read to the end so raw archives are complete.
+    records = collect_snapshot_records(
+        BRIGHTDATA_TIKTOK_DATASET_ID, inputs, "tiktok", "TikTok",
+        ttl=cache_ttl, chunk_size=chunk_size)
     posts = []
-    for item in raw_data:
-        if not isinstance(item, dict):
-            logger.warning("Skipping non-dict item in TikTok response: %s", type(item))
+    seen = set()
+    for post in iter_tiktok_posts(records):
+        # Chunks and cached snapshots can overlap; keep the first copy
+        if post["id"] in seen:
             continue
-        if len(posts) >= MAX_POSTS:
-            break
-        posts.append(normalize_tiktok_post(item))
+        seen.add(post["id"])
+        posts.append(post)
 
     logger.info("Collected %d TikTok posts.", len(posts))
     return posts
@@ -0,0 +1,42 @@
+"""
+Parsing of post timestamps.
+
+Collectors keep each platform's own timestamp format: ISO 8601 for
+TikTok and Facebook, RFC 2822 with the year last for Twitter ('Fri Feb
+20 07:20:53 +0000 2026'). Those strings do not sort chronologically, so
+anything that orders or filters posts by date parses them first.
+"""
+
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+
+def parse_timestamp(value):
+    """
+    Parse a post timestamp in any of the collectors' formats.
+
+    Args:
+        value: ISO 8601 string (TikTok, with 'Z'), RFC 2822 string
+            (Twitter's 'Fri Feb 20 07:20:53 +0000 2026'), or empty.
+
+    Returns:
+        Timezone-aware datetime, or None if the value cannot be parsed.
+        Naive values are taken as UTC.
+    """
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        try:
+            # Twitter puts the year last, which parsedate does not accept
+            parts = value.split()
+            if len(parts) == 6 and parts[-1].isdigit():
+                value = " ".join([parts[0] + ",", parts[2], parts[1], parts[5],
+                                  parts[3], parts[4]])
+            parsed = parsedate_to_datetime(value)
+        except (TypeError, ValueError, IndexError):
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
@@ -3,20 +3,28 @@ Twitter/X data collector using twitterapi.io.
 
 Searches for tweets by keyword using the advanced search endpoint,
 paginates through results until MAX_POSTS tweets are collected,
-and normalizes them to the unified post schema.
+and normalizes them to the unified post schema. By default all keywords
+are joined into one OR query; with per_keyword=True each keyword (or
+keyword group) is searched concurrently with its own cursor against a
+shared, evenly split post budget. With incremental=True, a per-query
+high-water mark in data/twitter_state.json bounds the search to tweets
+newer than the previous run's.
 """
 
 import logging
 import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 
-import requests
-
+from collectors import http_client
 from collectors.config import (
     TWITTERAPI_KEY, TWITTER_SEARCH_URL, MAX_POSTS, RAW_DIR,
+    TWITTER_SEARCH_WORKERS, TWITTER_STATE_FILE,
 )
 from collectors.retry_utils import retry_with_backoff, check_response_retryable
-from collectors.file_utils import save_json_atomic
+from collectors.file_utils import save_json_atomic, load_json_safe
 
 logger = logging.getLogger(__name__)
 
@@ -47,7 +55,108 @@ def normalize_tweet(tweet):
     }
 
 
-@retry_with_backoff()
+def _id_newer(tweet_id, mark):
+    """Return True if tweet_id is newer than the high-water mark id."""
+    try:
+        return int(tweet_id) > int(mark)
+    except (TypeError, ValueError):
+        return str(tweet_id) != str(mark)
+
+
+class HighWaterMark:
+    """
+    Tracks one query's previous newest tweet and the newest seen this run.
+
+    Results are requested newest first ('Latest'), so the first tweet at
+    or below ``since_id`` means everything after it was collected before.
+    """
+
+    def __init__(self, state=None):
+        """
+        Args:
+            state: The query's entry from the state file, or None.
+        """
+        state = state or {}
+        self.since_id = state.get("newest_id")
+        self.newest_id = self.since_id
+        self.newest_timestamp = state.get("newest_timestamp", "")
+        self.reached = False
+
+    def check(self, tweet):
+        """
+        Record a tweet and report whether it is at or below the mark.
+
+        Args:
+            tweet: Raw tweet dict.
+
+        Returns:
+            True if the tweet was already covered by a previous run.
+        """
+        tweet_id = tweet.get("id", "")
+        if self.since_id is not None and not _id_newer(tweet_id, self.since_id):
+            self.reached = True
+            return True
+        if tweet_id and (self.newest_id is None or _id_newer(tweet_id, self.newest_id)):
+            self.newest_id = tweet_id
+            self.newest_timestamp = tweet.get("createdAt", "")
+        return False
+
+    def bounded_query(self, query):
+        """Return the query restricted to tweets newer than the mark."""
+        if self.since_id is None:
+            return query
+        return f"({query}) since_id:{self.since_id}"
+
+
+def load_twitter_state(path=None):
+    """
+    Load per-query high-water marks.
+
+    Args:
+        path: State file path (default: TWITTER_STATE_FILE).
+
+    Returns:
+        Dict mapping query strings to their state dicts.
+    """
+    return load_json_safe(path or TWITTER_STATE_FILE, default={})
+
+
+def _save_mark(query, mark, cursor, exhausted, failed=False, path=None):
+    """
+    Persist a query's high-water mark after a run.
+
+    The newest id only advances when the run covered everything back to
+    the old mark (or ran out of results, or there was no mark yet). A run
+    stopped early by the post budget or by an error keeps the old mark,
+    so the tweets it skipped are fetched next time instead of being left
+    in a gap.
+
+    Args:
+        query: Query string the mark belongs to.
+        mark: HighWaterMark used during the run.
+        cursor: Last pagination cursor of the run (None if none).
+        exhausted: True if the search ran out of results.
+        failed: True if the search stopped on an error.
+        path: State file path (default: TWITTER_STATE_FILE).
+    """
+    path = path or TWITTER_STATE_FILE
+    state = load_twitter_state(path)
+    entry = dict(state.get(query, {}))
+    if failed:
+        logger.info("Run for %r failed before its high-water mark; keeping it", query)
+    elif mark.reached or exhausted or mark.since_id is None:
+        if mark.newest_id is not None:
+            entry["newest_id"] = mark.newest_id
+            entry["newest_timestamp"] = mark.newest_timestamp
+    else:
+        logger.info("Run for %r stopped before its high-water mark; keeping it", query)
+    entry["last_cursor"] = cursor
+    entry["updated_at"] = datetime.now(timezone.utc).isoformat()
+    state[query] = entry
+    save_json_atomic(state, path)
+
+
+@retry_with_backoff(endpoint="twitterapi.io")
 def _search_page(query, cursor=None):
     """
     Fetch a single page of Twitter search results.
@@ -67,17 +176,209 @@ def _search_page(query, cursor=None):
     if cursor:
         params["cursor"] = cursor
 
-    resp = requests.get(
+    resp = http_client.get(
         TWITTER_SEARCH_URL,
         headers={"x-api-key": TWITTERAPI_KEY},
         params=params,
-        timeout=30,
     )
     check_response_retryable(resp)
     return resp.json()
 
 
-def collect_twitter(keywords):
+class _PostBudget:
+    """
+    Thread-safe post budget shared by concurrent keyword searches.
+
+    Deduplicates tweets by id across all searches and stops accepting
+    posts once the total budget is spent.
+    """
+
+    def __init__(self, total):
+        self._lock = threading.Lock()
+        self._seen = set()
+        self.total = total
+        self.used = 0
+
+    def remaining(self):
+        """Return how many more posts can be accepted."""
+        with self._lock:
+            return self.total - self.used
+
+    def claim(self, tweet_id):
+        """
+        Try to reserve budget for one tweet.
+
+        Args:
+            tweet_id: The tweet's id.
+
+        Returns:
+            True if the tweet is new and the budget had room for it.
+        """
+        with self._lock:
+            if self.used >= self.total or tweet_id in self._seen:
+                return False
+            self._seen.add(tweet_id)
+            self.used += 1
+            return True
+
+
+class _KeywordSearch:
+    """
+    Pagination state of one keyword query.
+
+    Holds the cursor, page count, collected posts, and any tweets of the
+    last page that were not consumed because the quota ran out.
+    """
+
+    def __init__(self, query, mark=None):
+        self.query = query
+        self.mark = mark or HighWaterMark()
+        self.request_query = self.mark.bounded_query(query)
+        self.slug = re.sub(r"[^\w-]+", "_", query).strip("_")[:40] or "query"
+        self.cursor = None
+        self.pages = 0
+        self.exhausted = False
+        self.failed = False
+        self.buffered = []
+        self.posts = []
+
+    def take(self, tweets, budget, quota):
+        """
+        Add tweets to this search's posts until the quota or budget is spent.
+
+        Args:
+            tweets: Raw tweets in page order.
+            budget: _PostBudget shared by all searches.
+            quota: Maximum number of posts to add.
+
+        Returns:
+            Number of posts added. Unconsumed tweets are kept in
+            ``buffered`` for the next call. Reaching the high-water mark
+            ends the search.
+        """
+        added = 0
+        for n, tweet in enumerate(tweets):
+            if added >= quota or budget.remaining() <= 0:
+                self.buffered = tweets[n:]
+                return added
+            if self.mark.check(tweet):
+                self.exhausted = True
+                break
+            if budget.claim(tweet.get("id", "")):
+                self.posts.append(normalize_tweet(tweet))
+                added += 1
+        self.buffered = []
+        return added
+
+    @property
+    def done(self):
+        """True once every page has been fetched and consumed."""
+        return self.exhausted and not self.buffered
+
+
+def _run_keyword_search(search, budget, quota):
+    """
+    Page through one keyword query until its quota or the budget is spent.
+
+    The next page is requested in the background while the current page
+    is saved and normalized. Search state is kept on ``search``, so a
+    later call continues where this one stopped.
+
+    Args:
+        search: _KeywordSearch to advance.
+        budget: _PostBudget shared by all searches.
+        quota: Maximum number of posts this call may add to ``search``.
+    """
+    added = search.take(search.buffered, budget, quota)
+    if search.exhausted or added >= quota or budget.remaining() <= 0:
+        return
+
+    with ThreadPoolExecutor(max_workers=1) as prefetcher:
+        future = prefetcher.submit(_search_page, search.request_query, search.cursor)
+        while future is not None:
+            data = future.result()
+            search.pages += 1
+            tweets = data.get("tweets", [])
+            has_next = bool(tweets and data.get("has_next_page") and data.get("next_cursor"))
+            search.cursor = data.get("next_cursor") if has_next else None
+            search.exhausted = not has_next
+
+            # Prefetch the next page while this one is processed. At worst
+            # one page is fetched that the quota turns out not to need.
+            future = None
+            if has_next and added + len(tweets) < quota and budget.remaining() > len(tweets):
+                future = prefetcher.submit(_search_page, search.request_query, search.cursor)
+
+            raw_path = os.path.join(RAW_DIR, 'twitter',
+                                    f'{search.slug}_page_{search.pages}.json')
+            save_json_atomic(data, raw_path)
+            added += search.take(tweets, budget, quota - added)
+            if search.exhausted:
+                # Reached the high-water mark; drop any prefetched page
+                return
+            if future is None and has_next and added < quota and budget.remaining() > 0:
+                # Duplicates left room after all; keep paging
+                future = prefetcher.submit(_search_page, search.request_query, search.cursor)
+
+
+def _collect_per_keyword(keywords, max_posts, workers, incremental=False):
+    """
+    Search each keyword concurrently with its own cursor.
+
+    Each keyword first gets an even share of ``max_posts``. If budget is
+    left after that round (some keywords ran out of results), keywords
+    that still have pages continue from their cursors and share the rest.
+
+    Args:
+        keywords: List of keyword or keyword-group query strings.
+        max_posts: Total post budget across all keywords.
+        workers: Maximum number of keyword searches in flight.
+        incremental: If True, bound each keyword by its high-water mark and
+            save the updated marks afterwards.
+
+    Returns:
+        List of normalized posts, deduplicated by tweet id and grouped in
+        keyword order.
+    """
+    state = load_twitter_state() if incremental else {}
+    searches = [_KeywordSearch(query, HighWaterMark(state.get(query)))
+                for query in dict.fromkeys(keywords)]
+    budget = _PostBudget(max_posts)
+    # Split the budget exactly; the first keywords get the remainder
+    base, extra = divmod(max_posts, len(searches)) if searches else (0, 0)
+    shares = [base + (n < extra) for n in range(len(searches))]
+
+    def run_round(active, quotas):
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(active)))) as executor:
+            futures = [executor.submit(_run_keyword_search, search, budget, quota)
+                       for search, quota in zip(active, quotas)]
+        for search, future in zip(active, futures):
+            try:
+                future.result()
+            except Exception as e:
+                # Stop the search, but do not treat it as complete
+                search.exhausted = True
+                search.failed = True
+                search.buffered = []
+                logger.error("Twitter search for %r failed: %s", search.query, str(e))
+
+    run_round(searches, shares)
+    leftover = [search for search in searches if not search.done]
+    if leftover and budget.remaining() > 0:
+        logger.info("Redistributing %d unused posts across %d keywords",
+                    budget.remaining(), len(leftover))
+        run_round(leftover, [max_posts] * len(leftover))
+
+    for search in searches:
+        logger.info("  %r: %d tweets from %d pages", search.query,
+                    len(search.posts), search.pages)
+        if incremental:
+            _save_mark(search.query, search.mark, search.cursor, search.done,
+                       failed=search.failed)
+    return [post for search in searches for post in search.posts]
+
+
+def collect_twitter(keywords, per_keyword=False, workers=None, incremental=False):
     """
     Collect tweets matching the given keywords.
 
@@ -85,25 +386,52 @@ def collect_twitter(keywords):
     through results until MAX_POSTS tweets are collected, and saves
     raw responses incrementally to data/raw/twitter/.
 
+    By default the keywords are joined into one OR query. With
+    ``per_keyword``, each keyword (a keyword may itself be an OR group,
+    e.g. "AI OR ML") is searched concurrently with its own cursor and an
+    even share of MAX_POSTS, the next page is prefetched while the current
+    one is processed, and tweets are deduplicated by id.
+
+    With ``incremental``, each query's newest tweet id from the previous
+    run (its high-water mark in TWITTER_STATE_FILE) is sent as a since_id
+    bound, and paging stops at the first tweet at or below it, so a
+    recurring run fetches only new tweets. The mark, its timestamp, and
+    the last cursor are saved after the run.
+
     Args:
         keywords: List of keyword strings to search for.
+        per_keyword: If True, search each keyword separately and concurrently.
+        workers: Maximum concurrent keyword searches with per_keyword
+            (default: TWITTER_SEARCH_WORKERS).
+        incremental: If True, collect only tweets newer than the saved
+            high-water mark of each query.
 
     Returns:
         List of normalized post dicts in unified schema.
     """
+    if per_keyword:
+        if workers is None:
+            workers = TWITTER_SEARCH_WORKERS
+        logger.info("Searching Twitter for %d keywords separately", len(keywords))
+        all_posts = _collect_per_keyword(keywords, MAX_POSTS, workers, incremental)
+        logger.info("Collected %d tweets.", len(all_posts))
+        return all_posts
+
     all_posts = []
     query = " OR ".join(keywords)
+    mark = HighWaterMark(load_twitter_state().get(query) if incremental else None)
     cursor = None
     page = 0
+    exhausted = False
 
     logger.info("Searching Twitter for: %s", query)
 
-    while len(all_posts) < MAX_POSTS:
+    while len(all_posts) < MAX_POSTS and not mark.reached:
         page += 1
         logger.info("Fetching page %d (collected %d/%d)...",
                      page, len(all_posts), MAX_POSTS)
 
-        data = _search_page(query, cursor)
+        data = _search_page(mark.bounded_query(query), cursor)
 
         # Save raw response incrementally
         raw_path = os.path.join(RAW_DIR, 'twitter', f'page_{page}.json')
@@ -112,18 +440,25 @@ def collect_twitter(keywords):
         tweets = data.get("tweets", [])
         if not tweets:
             logger.info("No more tweets found.")
+            exhausted = True
             break
 
         for tweet in tweets:
             if len(all_posts) >= MAX_POSTS:
                 break
+            if mark.check(tweet):
+                logger.info("Reached tweets collected by a previous run.")
+                break
             all_posts.append(normalize_tweet(tweet))
 
         # Check for next page
         if data.get("has_next_page") and data.get("next_cursor"):
             cursor = data["next_cursor"]
         else:
+            exhausted = True
             break
 
+    if incremental:
+        _save_mark(query, mark, cursor, exhausted)
     logger.info("Collected %d tweets.", len(all_posts))
     return all_posts
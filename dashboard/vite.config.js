@@ -4,4 +4,10 @@ import react from '@vitejs/plugin-react'
 // https://vite.dev/config/
 export default defineConfig({
   plugins: [react()],
+  server: {
+    // Local query server (python -m server.query_server)
+    proxy: {
+      '/api': 'http://127.0.0.1:8787',
+    },
+  },
 })
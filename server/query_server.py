@@ -0,0 +1,483 @@
+"""
+Local read-only query server for the dashboard.
+
+Serves paginated, filtered and sorted views of data/posts.json and
+data/claims.json, so the dashboard fetches one page instead of the whole
+dataset. Both storage backends export these files, so the server works
+with either.
+
+Endpoints (all GET, JSON):
+    /api/posts   platform, since, until, sort=date|likes|shares,
+                 order=desc|asc, page, page_size
+    /api/claims  status, category, platform, post_id, min_confidence,
+                 max_confidence, since, until, sort=file|confidence|date,
+                 order, page, page_size
+    /api/stats   per-platform, per-status and per-category counts
+
+platform, status and category accept comma-separated values (e.g.
+status=auto_rejected,rejected). since/until are ISO dates or datetimes
+compared against the post's timestamp; claims use their post's. Every
+claim carries its 'position' in claims.json, which the dashboard's review
+decisions are keyed by.
+
+Responses are gzip-compressed when the client accepts it, and carry a
+weak ETag derived from the data files' version and the normalized query.
+A request whose If-None-Match matches gets an empty 304, so reloads and
+tab switches cost a few hundred bytes until the data changes. The files
+are reloaded when their size or mtime changes.
+
+Usage:
+    python -m server.query_server [--host HOST] [--port PORT]
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+from datetime import datetime, timezone
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+from collectors.config import (
+    POSTS_FILE, CLAIMS_FILE, QUERY_SERVER_HOST, QUERY_SERVER_PORT,
+    QUERY_PAGE_SIZE, QUERY_MAX_PAGE_SIZE,
+)
+from collectors.file_utils import read_json_records
+from collectors.timestamps import parse_timestamp
+
+logger = logging.getLogger(__name__)
+
+GZIP_MIN_BYTES = 512  # smaller bodies are sent uncompressed
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+class QueryError(ValueError):
+    """Raised for an invalid query parameter; answered with 400."""
+
+
+def _number(value):
+    """Coerce a count or score to a float, treating junk as 0."""
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class Dataset:
+    """Posts and claims loaded from disk, with precomputed sort keys."""
+
+    def __init__(self, posts, claims):
+        """
+        Index posts and claims for querying.
+
+        Args:
+            posts: List of post dicts.
+            claims: List of claim dicts, in claims.json order.
+        """
+        self.posts = posts
+        self.claims = claims
+        self.post_dates = [parse_timestamp(p.get("timestamp")) for p in posts]
+        dates_by_post = {
+            (p.get("platform"), str(p.get("id"))): date
+            for p, date in zip(posts, self.post_dates)
+        }
+        self.claim_dates = [
+            dates_by_post.get((c.get("platform"), str(c.get("post_id"))))
+            for c in claims
+        ]
+        self.post_keys = {
+            "date": [d or _EPOCH for d in self.post_dates],
+            "likes": [_number((p.get("engagement") or {}).get("likes")) for p in posts],
+            "shares": [_number((p.get("engagement") or {}).get("shares")) for p in posts],
+        }
+        self.claim_keys = {
+            "file": list(range(len(claims))),
+            "confidence": [_number(c.get("confidence")) for c in claims],
+            "date": [d or _EPOCH for d in self.claim_dates],
+        }
+
+
+class DataSource:
+    """Loads the posts and claims files, reloading them when they change."""
+
+    def __init__(self, posts_path=None, claims_path=None):
+        """
+        Args:
+            posts_path: Posts JSON path (default: POSTS_FILE).
+            claims_path: Claims JSON path (default: CLAIMS_FILE).
+        """
+        self.posts_path = posts_path or POSTS_FILE
+        self.claims_path = claims_path or CLAIMS_FILE
+        self._lock = threading.Lock()
+        self._signature = None
+        self._dataset = None
+        self._version = None
+
+    def _stat_signature(self):
+        """Return (size, mtime_ns) of each file, or None if it is missing."""
+        signature = []
+        for path in (self.posts_path, self.claims_path):
+            try:
+                st = os.stat(path)
+                signature.append((st.st_size, st.st_mtime_ns))
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+
+    @staticmethod
+    def _load(path):
+        """Read a JSON array file, or an empty list if it is missing."""
+        return list(read_json_records(path)) if os.path.exists(path) else []
+
+    def current(self):
+        """
+        Return the current dataset and its version string.
+
+        Returns:
+            Tuple of (Dataset, version), reloading the files first if their
+            size or mtime changed since the last load.
+        """
+        signature = self._stat_signature()
+        with self._lock:
+            if signature != self._signature:
+                self._dataset = Dataset(self._load(self.posts_path),
+                                        self._load(self.claims_path))
+                self._signature = signature
+                self._version = hashlib.sha256(repr(signature).encode()).hexdigest()[:16]
+                logger.info("Loaded %d posts and %d claims",
+                            len(self._dataset.posts), len(self._dataset.claims))
+            return self._dataset, self._version
+
+
+def _values(params, name):
+    """Return the set of comma-separated values of a parameter, or None."""
+    raw = params.get(name)
+    if not raw:
+        return None
+    return {v.strip() for v in raw.split(",") if v.strip()} or None
+
+
+def _date_param(params, name):
+    """Parse a since/until parameter into an aware datetime, or None."""
+    raw = params.get(name)
+    if not raw:
+        return None
+    parsed = parse_timestamp(raw)
+    if parsed is None:
+        raise QueryError(f"{name} must be an ISO date or datetime")
+    if name == "until" and len(raw) == 10:
+        # A bare date includes the whole day
+        parsed = parsed.replace(hour=23, minute=59, second=59, microsecond=999999)
+    return parsed
+
+
+def _float_param(params, name):
+    """Parse a float parameter, or None if absent."""
+    raw = params.get(name)
+    if raw in (None, ""):
+        return None
+    try:
+        return float(raw)
+    except ValueError:
+        raise QueryError(f"{name} must be a number")
+
+
+def _int_param(params, name, default, minimum, maximum=None):
+    """Parse a bounded integer parameter."""
+    raw = params.get(name)
+    if raw in (None, ""):
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        raise QueryError(f"{name} must be an integer")
+    if value < minimum or (maximum is not None and value > maximum):
+        bound = f"between {minimum} and {maximum}" if maximum is not None \
+            else f"at least {minimum}"
+        raise QueryError(f"{name} must be {bound}")
+    return value
+
+
+def _choice_param(params, name, choices, default):
+    """Parse a parameter restricted to a set of choices."""
+    value = params.get(name) or default
+    if value not in choices:
+        raise QueryError(f"{name} must be one of: {', '.join(sorted(choices))}")
+    return value
+
+
+def _in_range(date, since, until):
+    """Check a record date against since/until; undated records fail any bound."""
+    if since is None and until is None:
+        return True
+    if date is None:
+        return False
+    return (since is None or date >= since) and (until is None or date <= until)
+
+
+def _page(positions, keys, params, default_sort, records, annotate=None):
+    """
+    Sort matching positions and slice out the requested page.
+
+    Args:
+        positions: List of matching record positions, in file order.
+        keys: Dict of sort name -> list of sort keys by position.
+        params: Query parameters.
+        default_sort: Sort used when none is given.
+        records: The record list positions index into.
+        annotate: Optional function (record, position) -> response item.
+
+    Returns:
+        Response dict with 'total', 'page', 'page_size', 'pages', 'sort',
+        'order' and 'items'.
+    """
+    sort = _choice_param(params, "sort", set(keys), default_sort)
+    default_order = "asc" if sort == "file" else "desc"
+    order = _choice_param(params, "order", {"asc", "desc"}, default_order)
+    page = _int_param(params, "page", 1, 1)
+    page_size = _int_param(params, "page_size", QUERY_PAGE_SIZE, 1, QUERY_MAX_PAGE_SIZE)
+
+    # sorted() is stable in both directions, so ties keep file order
+    ordered = sorted(positions, key=keys[sort].__getitem__, reverse=order == "desc")
+    start = (page - 1) * page_size
+    items = [
+        annotate(records[p], p) if annotate else records[p]
+        for p in ordered[start:start + page_size]
+    ]
+    return {
+        "total": len(ordered),
+        "page": page,
+        "page_size": page_size,
+        "pages": -(-len(ordered) // page_size),
+        "sort": sort,
+        "order": order,
+        "items": items,
+    }
+
+
+def query_posts(dataset, params):
+    """
+    Answer a /api/posts query.
+
+    Args:
+        dataset: Dataset to query.
+        params: Dict of query parameter name -> string value.
+
+    Returns:
+        Page response dict (see _page()).
+
+    Raises:
+        QueryError: If a parameter is invalid.
+    """
+    platforms = _values(params, "platform")
+    since, until = _date_param(params, "since"), _date_param(params, "until")
+    positions = [
+        i for i, post in enumerate(dataset.posts)
+        if (platforms is None or post.get("platform") in platforms)
+        and _in_range(dataset.post_dates[i], since, until)
+    ]
+    return _page(positions, dataset.post_keys, params, "date", dataset.posts)
+
+
+def query_claims(dataset, params):
+    """
+    Answer a /api/claims query.
+
+    Args:
+        dataset: Dataset to query.
+        params: Dict of query parameter name -> string value.
+
+    Returns:
+        Page response dict (see _page()); each item has a 'position' field.
+
+    Raises:
+        QueryError: If a parameter is invalid.
+    """
+    statuses = _values(params, "status")
+    categories = _values(params, "category")
+    platforms = _values(params, "platform")
+    post_ids = _values(params, "post_id")
+    low = _float_param(params, "min_confidence")
+    high = _float_param(params, "max_confidence")
+    since, until = _date_param(params, "since"), _date_param(params, "until")
+    confidences = dataset.claim_keys["confidence"]
+    positions = [
+        i for i, claim in enumerate(dataset.claims)
+        if (statuses is None or claim.get("status") in statuses)
+        and (categories is None or claim.get("category") in categories)
+        and (platforms is None or claim.get("platform") in platforms)
+        and (post_ids is None or str(claim.get("post_id")) in post_ids)
+        and (low is None or confidences[i] >= low)
+        and (high is None or confidences[i] <= high)
+        and _in_range(dataset.claim_dates[i], since, until)
+    ]
+    return _page(positions, dataset.claim_keys, params, "file", dataset.claims,
+                 annotate=lambda claim, position: dict(claim, position=position))
+
+
+def query_stats(dataset, params):
+    """
+    Answer a /api/stats query with record counts.
+
+    Args:
+        dataset: Dataset to query.
+        params: Unused; accepted for a uniform route signature.
+
+    Returns:
+        Dict with post and claim totals and per-field counts.
+    """
+    def count(records, field):
+        counts = {}
+        for record in records:
+            value = record.get(field) or "unknown"
+            counts[value] = counts.get(value, 0) + 1
+        return counts
+
+    return {
+        "posts": {"total": len(dataset.posts),
+                  "platform": count(dataset.posts, "platform")},
+        "claims": {"total": len(dataset.claims),
+                   "status": count(dataset.claims, "status"),
+                   "category": count(dataset.claims, "category"),
+                   "platform": count(dataset.claims, "platform")},
+    }
+
+
+ROUTES = {
+    "/api/posts": query_posts,
+    "/api/claims": query_claims,
+    "/api/stats": query_stats,
+}
+
+
+def make_etag(version, path, params):
+    """
+    Return the weak ETag of a query against a data version.
+
+    Args:
+        version: DataSource version string.
+        path: Request path.
+        params: Dict of query parameters (order-insensitive).
+
+    Returns:
+        Quoted weak ETag string.
+    """
+    canonical = json.dumps([version, path, sorted(params.items())])
+    return 'W/"%s"' % hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32]
+
+
+def _etag_matches(header, etag):
+    """Check an If-None-Match header against an ETag (weak comparison)."""
+    if not header:
+        return False
+    opaque = etag.removeprefix("W/")
+    tags = [t.strip().removeprefix("W/") for t in header.split(",")]
+    return "*" in tags or opaque in tags
+
+
+class QueryHandler(BaseHTTPRequestHandler):
+    """Request handler; the server's 'source' attribute supplies the data."""
+
+    server_version = "ClaimsQueryServer/1.0"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        route = ROUTES.get(url.path.rstrip("/") or "/")
+        if route is None:
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": f"Unknown path {url.path}"})
+            return
+        # Repeated parameters keep their last value
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+
+        dataset, version = self.server.source.current()
+        etag = make_etag(version, url.path, params)
+        if _etag_matches(self.headers.get("If-None-Match"), etag):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            return
+
+        try:
+            payload = route(dataset, params)
+        except QueryError as e:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": str(e)})
+            return
+        self._send_json(HTTPStatus.OK, payload, etag=etag)
+
+    def _send_json(self, status, payload, etag=None):
+        """Send a JSON body, gzip-compressed if the client accepts it."""
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        accepts_gzip = "gzip" in (self.headers.get("Accept-Encoding") or "")
+        compress = accepts_gzip and len(body) >= GZIP_MIN_BYTES
+        if compress:
+            body = gzip.compress(body)
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Vary", "Accept-Encoding")
+        if compress:
+            self.send_header("Content-Encoding", "gzip")
+        if etag:
+            self.send_header("ETag", etag)
+            # Cache, but revalidate every time; unchanged data costs a 304
+            self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+class QueryServer(ThreadingHTTPServer):
+    """Threaded HTTP server bound to a DataSource."""
+
+    daemon_threads = True
+
+    def __init__(self, address, source=None):
+        """
+        Args:
+            address: (host, port) tuple to listen on.
+            source: DataSource to serve (default: the data/ JSON files).
+        """
+        super().__init__(address, QueryHandler)
+        self.source = source or DataSource()
+
+
+def main(argv=None):
+    """
+    Run the query server until interrupted.
+
+    Args:
+        argv: Optional list of argument strings for testing.
+    """
+    logging.basicConfig(level=logging.INFO,
+                        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    parser = argparse.ArgumentParser(
+        description="Serve paginated, filtered posts and claims to the dashboard."
+    )
+    parser.add_argument("--host", default=QUERY_SERVER_HOST,
+                        help=f"Address to bind (default: {QUERY_SERVER_HOST})")
+    parser.add_argument("--port", type=int, default=QUERY_SERVER_PORT,
+                        help=f"Port to listen on (default: {QUERY_SERVER_PORT})")
+    args = parser.parse_args(argv)
+
+    server = QueryServer((args.host, args.port))
+    logger.info("Serving posts and claims on http://%s:%d/api/", args.host, args.port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,46 @@
+"""Shared fixtures for the test suite."""
+
+import pytest
+
+from collectors import metrics, rate_limiter, retry_utils
+
+
+class FakeClock:
+    """Monotonic clock that only advances when set or slept on."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    """Provide a FakeClock; pass it as clock= and its sleep as sleep_func=."""
+    return FakeClock()
+
+
+@pytest.fixture(autouse=True)
+def fresh_shared_limits():
+    """Keep circuit breakers and rate-limit buckets from leaking between tests."""
+    retry_utils.reset_breakers()
+    rate_limiter.reset_all()
+    yield
+    retry_utils.reset_breakers()
+    rate_limiter.reset_all()
+
+
+@pytest.fixture(autouse=True)
+def isolated_run_stats(tmp_path, monkeypatch):
+    """Start each test with empty metrics and keep run stats out of data/."""
+    metrics.registry.reset()
+    monkeypatch.setattr("collectors.run_collection.COLLECTION_STATS_FILE",
+                        str(tmp_path / "collection_stats.json"))
+    monkeypatch.setattr("claims.run_extraction.EXTRACTION_STATS_FILE",
+                        str(tmp_path / "extraction_stats.json"))
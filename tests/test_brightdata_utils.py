@@ -1,15 +1,21 @@
 """Tests for collectors.brightdata_utils module."""
 
+import json
+import os
+import tempfile
 import pytest
+import requests
 from unittest.mock import patch, MagicMock, Mock
 
 from collectors.brightdata_utils import (
-    trigger_collection, poll_snapshot, download_snapshot,
+    _check_progress, trigger_collection, poll_snapshot, poll_snapshots, download_snapshot,
+    stream_snapshot, find_pending_snapshots, input_cache_key,
+    collect_snapshot_records,
 )
 
 
 @patch('collectors.brightdata_utils.save_json_atomic')
-@patch('collectors.brightdata_utils.requests.post')
+@patch('collectors.brightdata_utils.http_client.post')
 def test_trigger_collection_success(mock_post, mock_save):
     """trigger_collection should return snapshot_id on success."""
     mock_resp = MagicMock()
@@ -24,7 +30,7 @@ def test_trigger_collection_success(mock_post, mock_save):
 
 
 @patch('collectors.brightdata_utils.save_json_atomic')
-@patch('collectors.brightdata_utils.requests.post')
+@patch('collectors.brightdata_utils.http_client.post')
 def test_trigger_collection_no_snapshot_id(mock_post, mock_save):
     """trigger_collection should raise ValueError if no snapshot_id."""
     mock_resp = MagicMock()
@@ -61,14 +67,14 @@ def test_poll_snapshot_transitions_to_ready(mock_progress):
 
 
 @patch('collectors.brightdata_utils._check_progress')
-def test_poll_snapshot_timeout(mock_progress):
+def test_poll_snapshot_timeout(mock_progress, clock):
     """poll_snapshot should return False on timeout."""
     mock_progress.return_value = "running"
-    mock_sleep = MagicMock()
 
     result = poll_snapshot("snap_123", timeout=15, poll_interval=10,
-                           sleep_func=mock_sleep)
+                           sleep_func=clock.sleep, clock=clock)
     assert result is False
+    assert clock.now == 15
 
 
 @patch('collectors.brightdata_utils._check_progress')
@@ -82,7 +88,7 @@ def test_poll_snapshot_failed(mock_progress):
                       sleep_func=mock_sleep)
 
 
-@patch('collectors.brightdata_utils.requests.get')
+@patch('collectors.brightdata_utils.http_client.get')
 def test_download_snapshot_success(mock_get):
     """download_snapshot should return parsed data."""
     mock_resp = MagicMock()
@@ -94,3 +100,378 @@ def test_download_snapshot_success(mock_get):
     result = download_snapshot("snap_123")
     assert len(result) == 2
     assert result[0]["id"] == "1"
+
+
+@patch('collectors.brightdata_utils._check_progress')
+def test_poll_snapshots_tracks_many_snapshots(mock_progress, clock):
+    """poll_snapshots should wait for several snapshots in one loop."""
+    statuses = {
+        "snap_a": iter(["running", "ready"]),
+        "snap_b": iter(["running", "running", "failed"]),
+        "snap_c": iter(["ready"]),
+    }
+    mock_progress.side_effect = lambda snapshot_id, timeout:  next(statuses[snapshot_id])
+
+    results = poll_snapshots(["snap_a", "snap_b", "snap_c"], timeout=60,
+                             initial_interval=2, sleep_func=clock.sleep, clock=clock)
+    assert results == {"snap_a": "ready", "snap_b": "failed", "snap_c": "ready"}
+    assert mock_progress.call_count == 6
+
+
+@patch('collectors.brightdata_utils._check_progress')
+def test_poll_snapshots_adaptive_intervals(mock_progress, clock):
+    """Poll intervals should grow by the backoff factor up to the cap."""
+    mock_progress.return_value = "running"
+
+    results = poll_snapshots(["snap_a"], timeout=30, initial_interval=2,
+                             max_interval=8, backoff=2, sleep_func=clock.sleep,
+                             clock=clock)
+    assert results == {"snap_a": "timeout"}
+    assert clock.sleeps == [2, 4, 8, 8, 8]
+
+
+@patch('collectors.brightdata_utils._check_progress')
+def test_poll_snapshots_deadline_counts_request_latency(mock_progress, clock):
+    """Time spent in progress requests should count against the timeout."""
+
+    def slow_progress(snapshot_id, timeout):
+        clock.now += 10  # Each progress request takes 10s
+        return "running"
+
+    mock_progress.side_effect = slow_progress
+
+    results = poll_snapshots(["snap_a"], timeout=25, initial_interval=1,
+                             sleep_func=clock.sleep, clock=clock)
+    assert results == {"snap_a": "timeout"}
+    assert mock_progress.call_count == 3
+    assert len(clock.sleeps) == 2
+
+
+@patch('collectors.brightdata_utils._check_progress')
+def test_poll_snapshots_stops_round_at_deadline(mock_progress, clock):
+    """A slow check should not push later checks past the deadline."""
+    timeouts = []
+
+    def progress(snapshot_id, timeout):
+        timeouts.append(timeout)
+        clock.now += timeout  # The request runs until it times out
+        raise RuntimeError("read timed out")
+
+    mock_progress.side_effect = progress
+
+    results = poll_snapshots(["snap_a", "snap_b", "snap_c"], timeout=20,
+                             initial_interval=1, sleep_func=clock.sleep, clock=clock)
+    assert results == dict.fromkeys(["snap_a", "snap_b", "snap_c"], "timeout")
+    assert timeouts == [20]
+    assert clock.now == 20
+
+
+@patch('collectors.brightdata_utils.http_client.get')
+def test_check_progress_makes_a_single_attempt(mock_get):
+    """Progress checks should not retry; the poll loop checks again later."""
+    mock_get.side_effect = requests.exceptions.ConnectionError("reset")
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        _check_progress("snap_123", timeout=5)
+    assert mock_get.call_count == 1
+    assert mock_get.call_args.kwargs["timeout"] == 5
+
+
+@patch('collectors.brightdata_utils._check_progress')
+def test_poll_snapshots_survives_progress_errors(mock_progress, clock):
+    """A failed progress check should be retried on the next round."""
+    mock_progress.side_effect = [RuntimeError("connection reset"), "ready"]
+
+    results = poll_snapshots(["snap_a"], timeout=30, initial_interval=1,
+                             sleep_func=clock.sleep, clock=clock)
+    assert results == {"snap_a": "ready"}
+
+
+def _streaming_response(body, chunk_size=7):
+    """Build a mock streaming response that yields body in small chunks."""
+    resp = MagicMock()
+    resp.status_code = 200
+    resp.raise_for_status = MagicMock()
+    resp.iter_content.return_value = [
+        body[i:i + chunk_size] for i in range(0, len(body), chunk_size)
+    ]
+    return resp
+
+
+@pytest.mark.parametrize("body", [
+    json.dumps([{"id": "1", "text": "é"}, {"id": "2"}]).encode("utf-8"),
+    b'{"id": "1", "text": "\xc3\xa9"}\n{"id": "2"}\n',
+])
+@patch('collectors.brightdata_utils.http_client.get')
+def test_stream_snapshot_yields_records_and_archives_body(mock_get, body):
+    """stream_snapshot should parse JSON or NDJSON incrementally and archive it."""
+    mock_get.return_value = _streaming_response(body)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        raw_path = os.path.join(tmp_dir, "meta", "snapshot_snap_123.json")
+        records = list(stream_snapshot("snap_123", raw_path))
+
+        assert records == [{"id": "1", "text": "é"}, {"id": "2"}]
+        with open(raw_path, 'rb') as f:
+            assert f.read() == body
+        assert os.listdir(os.path.dirname(raw_path)) == ["snapshot_snap_123.json"]
+    assert mock_get.call_args.kwargs["stream"] is True
+
+
+@patch('collectors.brightdata_utils.http_client.get')
+def test_stream_snapshot_truncated_body_leaves_no_archive(mock_get):
+    """A body cut off mid-record should raise and leave no raw file."""
+    mock_get.return_value = _streaming_response(b'[{"id": "1"}, {"id": ')
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        raw_path = os.path.join(tmp_dir, "snapshot_snap_123.json")
+        with pytest.raises(ValueError, match="Truncated"):
+            list(stream_snapshot("snap_123", raw_path))
+        assert os.listdir(tmp_dir) == []
+
+
+@patch('collectors.brightdata_utils.http_client.get')
+@patch('collectors.brightdata_utils.http_client.post')
+def test_recovery_file_tracks_snapshot_status(mock_post, mock_get, monkeypatch):
+    """Triggered snapshots should stay pending until streamed to disk."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        monkeypatch.setattr('collectors.brightdata_utils.RAW_DIR', tmp_dir)
+        mock_post.return_value = MagicMock(status_code=200)
+        mock_post.return_value.json.return_value = {"snapshot_id": "snap_1"}
+        trigger_collection("dataset_abc", [{"url": "https://example.com"}])
+
+        pending = find_pending_snapshots()
+        assert [(p["snapshot_id"], p["dataset_id"]) for p in pending] == [
+            ("snap_1", "dataset_abc"),
+        ]
+
+        mock_get.return_value = _streaming_response(b'[{"id": "1"}]')
+        list(stream_snapshot("snap_1", os.path.join(tmp_dir, "meta", "snapshot_snap_1.json")))
+        assert find_pending_snapshots() == []
+
+
+def test_find_pending_snapshots_treats_legacy_files_as_pending(monkeypatch):
+    """Recovery files without a status should be treated as pending."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        monkeypatch.setattr('collectors.brightdata_utils.RAW_DIR', tmp_dir)
+        with open(os.path.join(tmp_dir, "snapshot_old.json"), 'w') as f:
+            json.dump({"snapshot_id": "old", "dataset_id": "dataset_abc"}, f)
+        with open(os.path.join(tmp_dir, "snapshot_bad.json"), 'w') as f:
+            f.write("{not json")
+
+        assert [p["snapshot_id"] for p in find_pending_snapshots()] == ["old"]
+
+
+def test_input_cache_key_normalizes_urls():
+    """Equivalent URLs should share a cache key; other fields still count."""
+    key = input_cache_key({"url": "https://www.Facebook.com/page/?ref=x&utm_source=t#top"})
+    assert key == input_cache_key({"url": "https://facebook.com/page"})
+    assert key != input_cache_key({"url": "https://facebook.com/page", "num_of_posts": 5})
+
+
+@patch('collectors.brightdata_utils.stream_snapshot')
+@patch('collectors.brightdata_utils.poll_snapshots')
+@patch('collectors.brightdata_utils.trigger_collection')
+def test_collect_snapshot_records_reuses_cached_inputs(mock_trigger, mock_poll, mock_stream,
+                                                       monkeypatch):
+    """Only inputs without a fresh cached snapshot should be scraped again."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        monkeypatch.setattr('collectors.brightdata_utils.RAW_DIR', tmp_dir)
+        cache_path = os.path.join(tmp_dir, "cache.json")
+        mock_poll.side_effect = lambda ids: {sid: "ready" for sid in ids}
+
+        def stream(snapshot_id, raw_path, records):
+            os.makedirs(os.path.dirname(raw_path), exist_ok=True)
+            with open(raw_path, 'w') as f:
+                json.dump(records, f)
+            yield from records
+
+        page_a = {"url": "https://facebook.com/a"}
+        page_b = {"url": "https://facebook.com/b"}
+        first = [{"id": "a1", "input": page_a}, {"id": "b1", "input": page_b}]
+        mock_trigger.return_value = "snap_1"
+        mock_stream.side_effect = lambda sid, path: stream(sid, path, first)
+        assert list(collect_snapshot_records(
+            "ds", [page_a, page_b], "meta", "Facebook", ttl=60, cache_path=cache_path,
+        )) == first
+
+        # Page a is cached; only page c is triggered. Page b's record is
+        # filtered out of the cached snapshot.
+        page_c = {"url": "https://www.facebook.com/c/"}
+        mock_trigger.return_value = "snap_2"
+        mock_stream.side_effect = lambda sid, path: stream(sid, path, [{"id": "c1"}])
+        records = list(collect_snapshot_records(
+            "ds", [page_a, page_c], "meta", "Facebook", ttl=60, cache_path=cache_path,
+        ))
+        assert [r["id"] for r in records] == ["a1", "c1"]
+        mock_trigger.assert_called_with("ds", [page_c])
+
+        # A zero TTL ignores the cache entirely
+        mock_trigger.return_value = "snap_3"
+        mock_stream.side_effect = lambda sid, path: stream(sid, path, [])
+        list(collect_snapshot_records(
+            "ds", [page_a], "meta", "Facebook", ttl=0, cache_path=cache_path,
+        ))
+        mock_trigger.assert_called_with("ds", [page_a])
+        assert mock_trigger.call_count == 3
+
+
+@patch('collectors.brightdata_utils.stream_snapshot')
+@patch('collectors.brightdata_utils.poll_snapshots')
+@patch('collectors.brightdata_utils.trigger_collection')
+def test_collect_snapshot_records_rescrapes_unattributable_inputs(mock_trigger, mock_poll,
+                                                                  mock_stream, monkeypatch):
+    """Inputs a shared cached snapshot cannot attribute records to are scraped again."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        monkeypatch.setattr('collectors.brightdata_utils.RAW_DIR', tmp_dir)
+        cache_path = os.path.join(tmp_dir, "cache.json")
+        mock_poll.side_effect = lambda ids: {sid: "ready" for sid in ids}
+
+        def stream(snapshot_id, raw_path, records):
+            os.makedirs(os.path.dirname(raw_path), exist_ok=True)
+            with open(raw_path, 'w') as f:
+                json.dump(records, f)
+            yield from records
+
+        page_a = {"url": "https://facebook.com/a"}
+        page_b = {"url": "https://facebook.com/b"}
+        # Facebook records carry the post URL, not the page URL
+        first = [{"id": "a1", "url": "https://facebook.com/a/posts/1"},
+                 {"id": "b1", "url": "https://facebook.com/b/posts/1"}]
+        mock_trigger.return_value = "snap_1"
+        mock_stream.side_effect = lambda sid, path: stream(sid, path, first)
+        list(collect_snapshot_records(
+            "ds", [page_a, page_b], "meta", "Facebook", ttl=60, cache_path=cache_path,
+        ))
+
+        page_c = {"url": "https://facebook.com/c"}
+        mock_trigger.return_value = "snap_2"
+        mock_stream.side_effect = lambda sid, path: stream(
+            sid, path, [{"id": "c1"}, {"id": "a1"}])
+        records = list(collect_snapshot_records(
+            "ds", [page_a, page_c], "meta", "Facebook", ttl=60, cache_path=cache_path,
+        ))
+        assert [r["id"] for r in records] == ["c1", "a1"]
+        mock_trigger.assert_called_with("ds", [page_c, page_a])
+
+
+@patch('collectors.brightdata_utils.stream_snapshot')
+@patch('collectors.brightdata_utils.poll_snapshots')
+@patch('collectors.brightdata_utils.trigger_collection')
+def test_collect_snapshot_records_timeout_is_not_cached(mock_trigger, mock_poll, mock_stream):
+    """A timed-out snapshot should yield nothing and leave the cache empty."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache_path = os.path.join(tmp_dir, "cache.json")
+        mock_trigger.return_value = "snap_1"
+        mock_poll.side_effect = lambda ids: {sid: "timeout" for sid in ids}
+
+        assert list(collect_snapshot_records(
+            "ds", [{"url": "https://facebook.com/a"}], "meta", "Facebook",
+            ttl=60, cache_path=cache_path,
+        )) == []
+        mock_stream.assert_not_called()
+        assert not os.path.exists(cache_path)
+
+
+@patch('collectors.brightdata_utils.stream_snapshot')
+@patch('collectors.brightdata_utils.poll_snapshots')
+@patch('collectors.brightdata_utils.trigger_collection')
+def test_collect_snapshot_records_triggers_chunks_and_polls_together(
+        mock_trigger, mock_poll, mock_stream):
+    """Inputs should be split into chunks awaited in one poll_snapshots() call."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        inputs = [{"url": f"https://facebook.com/p{i}"} for i in range(5)]
+        mock_trigger.side_effect = lambda dataset_id, chunk: "snap_" + chunk[0]["url"][-2:]
+        mock_poll.side_effect = lambda ids: {sid: "ready" for sid in ids}
+        mock_stream.side_effect = lambda sid, path: iter([{"id": sid}])
+
+        records = list(collect_snapshot_records(
+            "ds", inputs, "meta", "Facebook", ttl=0,
+            cache_path=os.path.join(tmp_dir, "cache.json"), chunk_size=2,
+        ))
+
+        chunks = sorted((call.args[1] for call in mock_trigger.call_args_list),
+                        key=lambda chunk: chunk[0]["url"])
+        assert chunks == [inputs[0:2], inputs[2:4], inputs[4:5]]
+        mock_poll.assert_called_once()
+        assert sorted(mock_poll.call_args.args[0]) == ["snap_p0", "snap_p2", "snap_p4"]
+        assert [r["id"] for r in records] == ["snap_p0", "snap_p2", "snap_p4"]
+
+
+@patch('collectors.brightdata_utils.stream_snapshot')
+@patch('collectors.brightdata_utils.poll_snapshots')
+@patch('collectors.brightdata_utils.trigger_collection')
+def test_collect_snapshot_records_isolates_failed_chunks(mock_trigger, mock_poll, mock_stream):
+    """A chunk that fails to trigger or fails upstream should not sink the others."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        inputs = [{"url": f"https://facebook.com/p{i}"} for i in range(3)]
+
+        def trigger(dataset_id, chunk):
+            if chunk[0]["url"].endswith("p0"):
+                raise RuntimeError("trigger rejected")
+            return "snap_" + chunk[0]["url"][-2:]
+
+        mock_trigger.side_effect = trigger
+        mock_poll.return_value = {"snap_p1": "ready", "snap_p2": "failed"}
+        mock_stream.side_effect = lambda sid, path: iter([{"id": sid}])
+
+        records = list(collect_snapshot_records(
+            "ds", inputs, "meta", "Facebook", ttl=0,
+            cache_path=os.path.join(tmp_dir, "cache.json"), chunk_size=1,
+        ))
+        assert records == [{"id": "snap_p1"}]
+        mock_stream.assert_called_once()
+
+
+@patch('collectors.brightdata_utils.poll_snapshots')
+@patch('collectors.brightdata_utils.trigger_collection')
+def test_collect_snapshot_records_raises_when_every_chunk_fails(mock_trigger, mock_poll):
+    """With no usable snapshot at all, the collector should see an error."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache_path = os.path.join(tmp_dir, "cache.json")
+        inputs = [{"url": "https://facebook.com/a"}, {"url": "https://facebook.com/b"}]
+
+        mock_trigger.side_effect = RuntimeError("trigger rejected")
+        with pytest.raises(RuntimeError, match="trigger rejected"):
+            list(collect_snapshot_records("ds", inputs, "meta", "Facebook", ttl=0,
+                                          cache_path=cache_path, chunk_size=1))
+
+        mock_trigger.side_effect = ["snap_a", "snap_b"]
+        mock_poll.return_value = {"snap_a": "failed", "snap_b": "failed"}
+        with pytest.raises(RuntimeError, match="All Facebook snapshots failed"):
+            list(collect_snapshot_records("ds", inputs, "meta", "Facebook", ttl=0,
+                                          cache_path=cache_path, chunk_size=1))
+
+
+@patch('collectors.brightdata_utils.stream_snapshot')
+@patch('collectors.brightdata_utils.poll_snapshots')
+@patch('collectors.brightdata_utils.trigger_collection')
+def test_collect_snapshot_records_keeps_query_selected_pages_apart(
+        mock_trigger, mock_poll, mock_stream, monkeypatch):
+    """Pages that differ only by a content query parameter must not share a cache entry."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        monkeypatch.setattr('collectors.brightdata_utils.RAW_DIR', tmp_dir)
+        cache_path = os.path.join(tmp_dir, "cache.json")
+        page_1 = {"url": "https://www.facebook.com/profile.php?id=1", "num_of_posts": 5}
+        page_2 = {"url": "https://facebook.com/profile.php?id=2", "num_of_posts": 5}
+        assert input_cache_key(page_1) != input_cache_key(page_2)
+
+        def stream(snapshot_id, raw_path):
+            records = [{"id": snapshot_id}]
+            os.makedirs(os.path.dirname(raw_path), exist_ok=True)
+            with open(raw_path, 'w') as f:
+                json.dump(records, f)
+            return iter(records)
+
+        mock_poll.side_effect = lambda ids: {sid: "ready" for sid in ids}
+        mock_stream.side_effect = stream
+        mock_trigger.side_effect = ["snap_1", "snap_2"]
+        for page in (page_1, page_2):
+            list(collect_snapshot_records("ds", [page], "meta", "Facebook",
+                                          ttl=60, cache_path=cache_path))
+        assert mock_trigger.call_count == 2
+
+        # Both are now cached; each page gets only its own snapshot's records
+        assert list(collect_snapshot_records("ds", [page_2], "meta", "Facebook",
+                                             ttl=60, cache_path=cache_path)) == [{"id": "snap_2"}]
+        assert mock_trigger.call_count == 2
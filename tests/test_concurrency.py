@@ -0,0 +1,116 @@
+"""Tests for claims.concurrency module."""
+
+import threading
+import time
+import pytest
+import requests
+
+from claims.concurrency import AdaptiveConcurrency
+from collectors.retry_utils import RetryableError
+
+
+def _request(controller, clock, latency=1.0, error=None):
+    """Run one request through a slot, advancing the fake clock."""
+    try:
+        with controller.slot():
+            clock.now += latency
+            if error is not None:
+                raise error
+    except type(error) if error is not None else ():
+        pass
+
+
+def test_additive_increase_per_limit_successes(clock):
+    """The limit should grow by one after `limit` healthy completions."""
+    controller = AdaptiveConcurrency(initial=2, maximum=4, adaptive=True, clock=clock)
+    _request(controller, clock)
+    assert controller.limit == 2
+    _request(controller, clock)
+    assert controller.limit == 3
+    for _ in range(3):
+        _request(controller, clock)
+    assert controller.limit == 4
+    for _ in range(10):
+        _request(controller, clock)
+    assert controller.limit == 4  # capped at maximum
+
+
+@pytest.mark.parametrize("error", [
+    RetryableError("HTTP 429"), requests.exceptions.Timeout(),
+    requests.exceptions.ConnectionError(),
+])
+def test_congestion_errors_cut_limit_multiplicatively(clock, error):
+    controller = AdaptiveConcurrency(initial=8, maximum=8, adaptive=True, clock=clock)
+    _request(controller, clock, error=error)
+    assert controller.limit == 4
+    _request(controller, clock, error=error)
+    assert controller.limit == 2
+
+
+def test_other_errors_do_not_cut_limit(clock):
+    controller = AdaptiveConcurrency(initial=4, maximum=4, adaptive=True, clock=clock)
+    _request(controller, clock, error=ValueError("bad JSON"))
+    assert controller.limit == 4
+    assert controller.stats()["errors"] == 1
+
+
+def test_one_cut_per_congestion_episode(clock):
+    """Failures of requests started before a cut should not cut again."""
+    controller = AdaptiveConcurrency(initial=8, maximum=8, adaptive=True, clock=clock)
+    slots = [controller.slot() for _ in range(3)]
+    for slot in slots:
+        slot.__enter__()
+    clock.now += 1
+    for slot in slots:
+        error = RetryableError("HTTP 429")
+        assert slot.__exit__(RetryableError, error, None) is False
+    assert controller.limit == 4
+
+
+def test_rising_latency_cuts_limit(clock):
+    controller = AdaptiveConcurrency(initial=4, maximum=4, adaptive=True,
+                                     latency_factor=2.0, min_samples=3, clock=clock)
+    for _ in range(3):
+        _request(controller, clock, latency=1.0)
+    assert controller.limit == 4
+    for _ in range(5):
+        _request(controller, clock, latency=5.0)
+    assert controller.limit == 2
+
+
+def test_fixed_limit_only_collects_stats(clock):
+    controller = AdaptiveConcurrency(initial=3, clock=clock)
+    for latency in (1.0, 2.0, 3.0, 4.0):
+        _request(controller, clock, latency=latency)
+    _request(controller, clock, error=RetryableError("HTTP 503"))
+
+    stats = controller.stats()
+    assert stats["limit"] == 3
+    assert (stats["requests"], stats["errors"], stats["in_flight"]) == (5, 1, 0)
+    assert stats["error_rate"] == pytest.approx(0.2)
+    assert (stats["p50"], stats["p95"]) == (2.0, 4.0)
+
+
+def test_slot_blocks_beyond_limit():
+    """No more than `limit` threads should hold a slot at once."""
+    controller = AdaptiveConcurrency(initial=2)
+    active = peak = 0
+    lock = threading.Lock()
+
+    def work():
+        nonlocal active, peak
+        with controller.slot():
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.02)
+            with lock:
+                active -= 1
+
+    threads = [threading.Thread(target=work) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert peak == 2
+    assert controller.stats()["requests"] == 6
@@ -0,0 +1,68 @@
+"""Tests for claims.dedup module."""
+
+import random
+
+from claims.dedup import (
+    tokenize, simhash, hamming_distance, cluster_posts, link_claims,
+)
+
+
+BASE = ("India's AI mission has allocated 10,372 crore rupees to build "
+        "compute capacity and support startups across the country this year")
+
+
+def _post(post_id, text):
+    return {"id": post_id, "platform": "twitter", "text": text,
+            "url": f"https://x.com/i/{post_id}"}
+
+
+def test_tokenize_strips_retweet_prefix_urls_and_mentions():
+    """Share-specific noise should not affect the tokens."""
+    assert tokenize("RT @news: Big NEWS today https://t.co/abc @someone") == ["big", "news", "today"]
+
+
+def test_simhash_is_close_for_near_duplicates():
+    """A one-word edit should move the fingerprint only a few bits."""
+    near = BASE.replace("this year", "this fiscal year")
+    other = "Completely unrelated text about cricket scores and the weather in Mumbai today"
+    base_hash = simhash(tokenize(BASE))
+    assert hamming_distance(base_hash, simhash(tokenize(BASE))) == 0
+    assert hamming_distance(base_hash, simhash(tokenize(near))) < \
+        hamming_distance(base_hash, simhash(tokenize(other)))
+
+
+def test_cluster_posts_groups_copies_and_keeps_first_as_representative():
+    """Retweets and copies should cluster; unrelated and short posts stay alone."""
+    posts = [
+        _post("1", "Totally different post about elections in Karnataka and turnout figures"),
+        _post("2", BASE),
+        _post("3", f"RT @pib_india: {BASE} https://t.co/xyz"),
+        _post("4", BASE + "!"),
+        _post("5", "Wow"),
+        _post("6", "Wow"),
+    ]
+    assert cluster_posts(posts, max_distance=3) == [[0], [1, 2, 3], [4], [5]]
+
+
+def test_cluster_posts_finds_near_duplicates_via_bands():
+    """Fingerprints within max_distance bits must always land in one cluster."""
+    rng = random.Random(7)
+    posts = [_post(str(n), " ".join(rng.choice("abcdefghij") * 3 for _ in range(12)))
+             for n in range(200)]
+    fingerprints = [simhash(tokenize(p["text"])) for p in posts]
+    clusters = cluster_posts(posts, max_distance=3)
+    cluster_of = {i: n for n, cluster in enumerate(clusters) for i in cluster}
+    for i in range(len(posts)):
+        for j in range(i):
+            if hamming_distance(fingerprints[i], fingerprints[j]) <= 3:
+                assert cluster_of[i] == cluster_of[j]
+
+
+def test_link_claims_reattributes_to_member():
+    """Linked claims should point at the member and name the representative."""
+    claims = [{"claim_text": "c", "confidence": 0.9, "post_id": "2", "platform": "twitter"}]
+    linked = link_claims(claims, _post("3", BASE), _post("2", BASE))
+    assert linked == [{"claim_text": "c", "confidence": 0.9, "post_id": "3",
+                       "platform": "twitter", "post_url": "https://x.com/i/3",
+                       "duplicate_of": "2"}]
+    assert claims[0]["post_id"] == "2"
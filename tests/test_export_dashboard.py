@@ -0,0 +1,126 @@
+"""Tests for collectors.export_dashboard module."""
+
+import json
+import os
+import tempfile
+import pytest
+
+from collectors.export_dashboard import export_dashboard, main
+from collectors.file_utils import save_json_atomic
+
+POSTS = [
+    {"id": "1", "platform": "twitter", "timestamp": "2026-01-02",
+     "engagement": {"likes": 5, "shares": 1}},
+    {"id": "2", "platform": "meta", "timestamp": "2026-01-03",
+     "engagement": {"likes": 1, "shares": 9}},
+    {"id": "3", "platform": "twitter", "timestamp": "2026-01-01",
+     "engagement": {"likes": 5}},
+    {"id": "4", "platform": "tiktok", "engagement": {"likes": "n/a", "shares": "12"}},
+    {"id": "5", "platform": "meta", "timestamp": "2026-01-04",
+     "engagement": {"likes": 7, "shares": 0}},
+]
+CLAIMS = [
+    {"post_id": "1", "platform": "twitter", "status": "needs_review",
+     "category": "health", "confidence": 0.7},
+    {"post_id": "2", "platform": "meta", "status": "auto_accepted",
+     "category": "economy", "confidence": 0.95},
+    {"post_id": "1", "platform": "twitter", "status": "needs_review",
+     "category": "health/policy", "confidence": 0.8},
+]
+
+
+@pytest.fixture
+def paths():
+    """Provide source files and an export directory in a temp dir."""
+    with tempfile.TemporaryDirectory() as d:
+        posts_path = os.path.join(d, "posts.json")
+        claims_path = os.path.join(d, "claims.json")
+        save_json_atomic(POSTS, posts_path)
+        save_json_atomic(CLAIMS, claims_path)
+        yield posts_path, claims_path, os.path.join(d, "dashboard")
+
+
+def _load(out_dir, relpath):
+    with open(os.path.join(out_dir, relpath)) as f:
+        return json.load(f)
+
+
+def test_export_writes_pages_in_source_order(paths):
+    """Posts should be split into fixed-size pages in posts.json order."""
+    posts_path, claims_path, out_dir = paths
+    manifest = export_dashboard(posts_path, claims_path, out_dir, page_size=2)
+
+    assert (manifest["posts"]["total"], manifest["posts"]["pages"]) == (5, 3)
+    pages = [_load(out_dir, f"posts/page-{n:05d}.json") for n in range(3)]
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert [p["id"] for page in pages for p in page] == ["1", "2", "3", "4", "5"]
+    assert _load(out_dir, "manifest.json") == manifest
+
+
+def test_export_sorts_dates_across_timestamp_formats():
+    """Twitter and ISO timestamps should be ordered by time, not as strings."""
+    posts = [
+        {"id": "a", "platform": "twitter", "timestamp": "Fri Feb 20 07:13:16 +0000 2026"},
+        {"id": "b", "platform": "tiktok", "timestamp": "2026-02-21T10:00:00.000Z"},
+        {"id": "c", "platform": "twitter", "timestamp": "Wed Feb 25 09:00:00 +0000 2026"},
+        {"id": "d", "platform": "meta", "timestamp": "2026-02-19T08:00:00+00:00"},
+    ]
+    with tempfile.TemporaryDirectory() as d:
+        posts_path = os.path.join(d, "posts.json")
+        save_json_atomic(posts, posts_path)
+        out_dir = os.path.join(d, "dashboard")
+        export_dashboard(posts_path, os.path.join(d, "missing.json"), out_dir)
+
+        assert _load(out_dir, "posts/index/all.date.json") == [2, 1, 0, 3]
+
+
+def test_export_precomputes_sort_orders_with_stable_ties(paths):
+    """Orders should match the dashboard's sorts, keeping file order on ties."""
+    posts_path, claims_path, out_dir = paths
+    indexes = export_dashboard(posts_path, claims_path, out_dir, page_size=2)["posts"]["indexes"]
+
+    assert _load(out_dir, "posts/" + indexes["all"]["date"]) == [4, 1, 0, 2, 3]
+    assert _load(out_dir, "posts/" + indexes["all"]["likes"]) == [4, 0, 2, 1, 3]
+    # Numeric strings sort as numbers, like the dashboard's subtraction
+    assert _load(out_dir, "posts/" + indexes["all"]["shares"]) == [3, 1, 0, 2, 4]
+    assert _load(out_dir, "posts/" + indexes["platform-meta"]["likes"]) == [4, 1]
+    assert _load(out_dir, "posts/" + indexes["platform-twitter"]["file"]) == [0, 2]
+
+
+def test_export_counts_and_filters_claims(paths):
+    """Claims should get status/category counts and file-safe filter names."""
+    posts_path, claims_path, out_dir = paths
+    claims = export_dashboard(posts_path, claims_path, out_dir)["claims"]
+
+    assert claims["counts"]["status"] == {"needs_review": 2, "auto_accepted": 1}
+    assert claims["counts"]["category"]["health/policy"] == 1
+    assert _load(out_dir, "claims/" + claims["indexes"]["status-needs_review"]["file"]) == [0, 2]
+    assert _load(out_dir, "claims/" + claims["indexes"]["all"]["confidence"]) == [1, 2, 0]
+    assert "category-health_policy" in claims["indexes"]
+
+
+def test_export_replaces_previous_export(paths):
+    """A re-export should drop stale pages and leave no build directories."""
+    posts_path, claims_path, out_dir = paths
+    export_dashboard(posts_path, claims_path, out_dir, page_size=1)
+    save_json_atomic(POSTS[:1], posts_path)
+    export_dashboard(posts_path, claims_path, out_dir, page_size=1)
+
+    assert sorted(os.listdir(os.path.join(out_dir, "posts"))) == ["index", "page-00000.json"]
+    assert sorted(os.listdir(os.path.dirname(out_dir))) == ["claims.json", "dashboard", "posts.json"]
+    assert not os.path.exists(out_dir + ".tmp")
+    assert not os.path.exists(out_dir + ".old")
+
+
+def test_export_handles_missing_sources_and_bad_page_size():
+    """Missing files export as empty; a page size below 1 is rejected."""
+    with tempfile.TemporaryDirectory() as d:
+        out_dir = os.path.join(d, "dashboard")
+        manifest = export_dashboard(os.path.join(d, "none.json"),
+                                    os.path.join(d, "none2.json"), out_dir)
+        assert (manifest["posts"]["total"], manifest["posts"]["pages"]) == (0, 0)
+        assert _load(out_dir, "posts/index/all.date.json") == []
+        with pytest.raises(ValueError):
+            export_dashboard(os.path.join(d, "none.json"), output_dir=out_dir, page_size=0)
+        with pytest.raises(SystemExit):
+            main(["--page-size", "0"])
@@ -1,6 +1,7 @@
 """Tests for claims.extractor module."""
 
 import json
+import logging
 import os
 import tempfile
 import pytest
@@ -8,6 +9,10 @@ from unittest.mock import patch, MagicMock
 
 from claims.extractor import (
     classify_claim, extract_claims_from_post, extract_all_claims,
+    claims_journal_path, compact_claims, claims_index_path,
+    load_processed_index, processed_key, prefiltered_key, extract_claims_from_batch,
+    cascade_stats, CASCADE_MODEL, OPENROUTER_MODEL, openrouter_concurrency,
+    _request_completion,
 )
 
 
@@ -60,6 +65,9 @@ SAMPLE_POST = {
     "url": "https://twitter.com/user/status/001",
 }
 
+OTHER_POST = dict(SAMPLE_POST, id="post_002",
+                  url="https://twitter.com/user/status/002")
+
 
 @patch('claims.extractor._call_openrouter')
 def test_extract_claims_from_post_success(mock_call):
@@ -106,12 +114,12 @@ def test_extract_claims_from_post_invalid_json(mock_call):
 
 @patch('claims.extractor._call_openrouter')
 def test_extract_all_claims_saves_incrementally(mock_call):
-    """extract_all_claims should save after each post."""
+    """extract_all_claims should write every post's claims to the output file."""
     mock_call.return_value = MOCK_API_RESPONSE
 
     with tempfile.TemporaryDirectory() as tmp_dir:
         output_path = os.path.join(tmp_dir, "claims.json")
-        posts = [SAMPLE_POST, SAMPLE_POST]
+        posts = [SAMPLE_POST, OTHER_POST]
 
         claims = extract_all_claims(posts, output_path)
         assert len(claims) == 4  # 2 claims per post * 2 posts
@@ -123,6 +131,22 @@ def test_extract_all_claims_saves_incrementally(mock_call):
         assert len(saved) == 4
 
 
+@patch('claims.extractor._call_openrouter')
+def test_extract_all_claims_extracts_in_run_duplicates_once(mock_call, caplog):
+    """Repeats of the same post in one run should cost one call, not count as resumed."""
+    mock_call.return_value = MOCK_API_RESPONSE
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output_path = os.path.join(tmp_dir, "claims.json")
+        with caplog.at_level(logging.INFO, logger="claims.extractor"):
+            claims = extract_all_claims([SAMPLE_POST, SAMPLE_POST], output_path)
+
+    assert mock_call.call_count == 1
+    assert len(claims) == 2
+    assert "1 duplicate posts" in caplog.text
+    assert "already-processed" not in caplog.text
+
+
 @patch('claims.extractor._call_openrouter')
 def test_extract_all_claims_continues_on_failure(mock_call):
     """extract_all_claims should continue when a single post fails."""
@@ -133,7 +157,7 @@ def test_extract_all_claims_continues_on_failure(mock_call):
 
     with tempfile.TemporaryDirectory() as tmp_dir:
         output_path = os.path.join(tmp_dir, "claims.json")
-        posts = [SAMPLE_POST, SAMPLE_POST]
+        posts = [SAMPLE_POST, OTHER_POST]
 
         claims = extract_all_claims(posts, output_path)
         assert len(claims) == 2  # Only second post's claims
@@ -150,3 +174,332 @@ def test_extract_claims_adds_metadata(mock_call):
         assert "platform" in claim
         assert "post_url" in claim
         assert "status" in claim
+
+
+def _numbered_posts(n):
+    """Build n distinct posts whose text encodes their position."""
+    return [
+        {"id": f"post_{i}", "platform": "twitter", "text": f"Post number {i}",
+         "url": f"https://twitter.com/user/status/{i}"}
+        for i in range(n)
+    ]
+
+
+def _claim_for_prompt(messages, model=None):
+    """Return a one-claim response echoing the post text in the prompt."""
+    text = messages[-1]["content"].split('"')[1]
+    if text == "Post number 3":
+        raise Exception("API error")
+    return json.dumps({"claims": [{"claim_text": text, "confidence": 0.9}]})
+
+
+@patch('claims.extractor._call_openrouter')
+def test_extract_all_claims_concurrent_preserves_order(mock_call):
+    """Concurrent extraction should keep claims in input order."""
+    mock_call.side_effect = _claim_for_prompt
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output_path = os.path.join(tmp_dir, "claims.json")
+        posts = _numbered_posts(10)
+
+        claims = extract_all_claims(posts, output_path, workers=4)
+
+        expected = [f"post_{i}" for i in range(10) if i != 3]
+        assert [c["post_id"] for c in claims] == expected
+        with open(output_path, 'r') as f:
+            saved = json.load(f)
+        assert [c["post_id"] for c in saved] == expected
+
+
+@patch('claims.extractor._call_openrouter')
+def test_extract_all_claims_journals_each_post(mock_call):
+    """Each processed post should be one journal line, compactable on demand."""
+    mock_call.return_value = MOCK_API_RESPONSE
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output_path = os.path.join(tmp_dir, "claims.json")
+        extract_all_claims([SAMPLE_POST, OTHER_POST], output_path)
+
+        journal_path = claims_journal_path(output_path)
+        with open(journal_path, 'r') as f:
+            records = [json.loads(line) for line in f]
+        assert len(records) == 2
+        assert records[0]["post_id"] == "post_001"
+        assert len(records[0]["claims"]) == 2
+
+        os.remove(output_path)
+        assert len(compact_claims(output_path)) == 4
+        assert os.path.exists(output_path)
+
+
+@patch('claims.extractor._call_openrouter')
+def test_extract_all_claims_resumes_from_index(mock_call):
+    """A rerun should only extract posts that are new or changed."""
+    mock_call.return_value = MOCK_API_RESPONSE
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output_path = os.path.join(tmp_dir, "claims.json")
+        extract_all_claims([SAMPLE_POST], output_path)
+        assert mock_call.call_count == 1
+        assert load_processed_index(output_path) == {processed_key(SAMPLE_POST)}
+        assert os.path.exists(claims_index_path(output_path))
+
+        edited = dict(SAMPLE_POST, text="Government invested 20000 crore.")
+        claims = extract_all_claims([SAMPLE_POST, edited, OTHER_POST], output_path)
+
+        # Only the edited post and the new post hit the API
+        assert mock_call.call_count == 3
+        # The edited post replaces its earlier claims instead of duplicating them
+        assert len(claims) == 4
+        assert [c["post_id"] for c in claims] == ["post_001"] * 2 + ["post_002"] * 2
+
+
+@patch('claims.extractor._call_openrouter')
+def test_extract_all_claims_retries_failed_posts_on_rerun(mock_call):
+    """Failed posts should not be indexed, so a rerun retries them."""
+    mock_call.side_effect = [Exception("API error"), MOCK_API_RESPONSE]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output_path = os.path.join(tmp_dir, "claims.json")
+        assert extract_all_claims([SAMPLE_POST], output_path) == []
+        assert len(extract_all_claims([SAMPLE_POST], output_path)) == 2
+
+
+@patch('claims.extractor._call_openrouter')
+def test_extract_all_claims_no_resume_starts_over(mock_call):
+    """resume=False should discard the journal and re-extract every post."""
+    mock_call.return_value = MOCK_API_RESPONSE
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output_path = os.path.join(tmp_dir, "claims.json")
+        extract_all_claims([SAMPLE_POST, OTHER_POST], output_path)
+        claims = extract_all_claims([SAMPLE_POST], output_path, resume=False)
+        assert mock_call.call_count == 3
+        assert len(claims) == 2
+
+
+@patch('claims.extractor._request_completion')
+def test_call_openrouter_uses_response_cache(mock_request):
+    """Repeated identical requests should be served from the cache."""
+    from claims.extractor import _call_openrouter, configure_response_cache
+    mock_request.return_value = MOCK_API_RESPONSE
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = configure_response_cache(path=os.path.join(tmp_dir, "cache.sqlite3"))
+        try:
+            messages = [{"role": "user", "content": "same text"}]
+            assert _call_openrouter(messages) == MOCK_API_RESPONSE
+            assert _call_openrouter(messages) == MOCK_API_RESPONSE
+            assert mock_request.call_count == 1
+            assert cache.stats()["hits"] == 1
+
+            # Malformed responses are not cached
+            mock_request.return_value = "not json"
+            other = [{"role": "user", "content": "other text"}]
+            _call_openrouter(other)
+            _call_openrouter(other)
+            assert mock_request.call_count == 3
+        finally:
+            configure_response_cache(enabled=False)
+
+
+def _batch_response(*post_ids):
+    """Build a batch response giving each post id one claim."""
+    return json.dumps({"posts": {
+        post_id: {"claims": [{"claim_text": f"claim from {post_id}", "confidence": 0.9}]}
+        for post_id in post_ids
+    }})
+
+
+@patch('claims.extractor._call_openrouter')
+def test_extract_claims_from_batch_splits_by_post_id(mock_call):
+    """A batch response should be split back out to each post."""
+    mock_call.return_value = _batch_response("post_001", "post_002")
+
+    results = extract_claims_from_batch([SAMPLE_POST, OTHER_POST])
+    assert mock_call.call_count == 1
+    assert results[0][0]["claim_text"] == "claim from post_001"
+    assert results[0][0]["post_id"] == "post_001"
+    assert results[1][0]["post_id"] == "post_002"
+    assert results[1][0]["status"] == "auto_accepted"
+
+
+@patch('claims.extractor._call_openrouter')
+def test_extract_claims_from_batch_falls_back_on_bad_response(mock_call):
+    """Unparseable batch responses should fall back to single-post calls."""
+    mock_call.side_effect = ["not json", MOCK_API_RESPONSE, '{"claims": []}']
+
+    results = extract_claims_from_batch([SAMPLE_POST, OTHER_POST])
+    assert mock_call.call_count == 3
+    assert len(results[0]) == 2
+    assert results[1] == []
+
+
+@patch('claims.extractor._call_openrouter')
+def test_extract_claims_from_batch_retries_missing_posts(mock_call):
+    """Posts missing from a batch response should be retried alone."""
+    mock_call.side_effect = [_batch_response("post_001"), MOCK_API_RESPONSE]
+
+    results = extract_claims_from_batch([SAMPLE_POST, OTHER_POST])
+    assert mock_call.call_count == 2
+    assert len(results[0]) == 1
+    assert len(results[1]) == 2
+
+
+@patch('claims.extractor._call_openrouter')
+def test_extract_all_claims_batch_with_malformed_claims(mock_call):
+    """Malformed claim entries in a batch should fall back for that post only."""
+    mock_call.side_effect = [
+        json.dumps({"posts": {
+            "post_001": {"claims": ["GDP grew 5%"]},
+            "post_002": {"claims": [{"claim_text": "ok", "confidence": 0.9}]},
+        }}),
+        MOCK_API_RESPONSE,
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output_path = os.path.join(tmp_dir, "claims.json")
+        claims = extract_all_claims([SAMPLE_POST, OTHER_POST], output_path, batch_size=2)
+
+    assert mock_call.call_count == 2
+    assert [c["post_id"] for c in claims] == ["post_001", "post_001", "post_002"]
+
+
+@patch('claims.extractor._call_openrouter')
+def test_extract_all_claims_batched(mock_call):
+    """batch_size should pack posts into fewer API calls, in input order."""
+    posts = _numbered_posts(5)
+    mock_call.side_effect = [
+        _batch_response("post_0", "post_1"),
+        _batch_response("post_2", "post_3"),
+        MOCK_API_RESPONSE,
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output_path = os.path.join(tmp_dir, "claims.json")
+        claims = extract_all_claims(posts, output_path, batch_size=2)
+
+    assert mock_call.call_count == 3
+    assert [c["post_id"] for c in claims] == [
+        "post_0", "post_1", "post_2", "post_3", "post_4", "post_4",
+    ]
+
+
+@patch('claims.extractor._call_openrouter')
+def test_extract_all_claims_prefilter_records_skips(mock_call):
+    """Pre-filtered posts should skip the API but be journaled with a reason."""
+    mock_call.return_value = MOCK_API_RESPONSE
+    opinion = {"id": "post_003", "platform": "twitter", "text": "So excited!! 🚀🔥"}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output_path = os.path.join(tmp_dir, "claims.json")
+        claims = extract_all_claims([opinion, SAMPLE_POST], output_path,
+                                    prefilter_threshold=0.2)
+
+        assert mock_call.call_count == 1
+        assert len(claims) == 2
+        with open(claims_journal_path(output_path), 'r') as f:
+            records = [json.loads(line) for line in f]
+        assert records[0]["post_id"] == "post_003"
+        assert records[0]["claims"] == []
+        assert "prefilter score" in records[0]["skipped"]
+        index = load_processed_index(output_path)
+        assert processed_key(opinion) not in index
+        assert prefiltered_key(processed_key(opinion), 0.2) in index
+
+        # Same threshold: still skipped. No pre-filter: reconsidered.
+        extract_all_claims([opinion], output_path, prefilter_threshold=0.2)
+        assert mock_call.call_count == 1
+        extract_all_claims([opinion], output_path)
+        assert mock_call.call_count == 2
+
+
+def _response_with_confidence(confidence):
+    """Build a single-claim response with the given confidence."""
+    return json.dumps({"claims": [{"claim_text": "c", "confidence": confidence}]})
+
+
+@patch('claims.extractor._request_completion')
+def test_extract_all_claims_cascade_escalates_ambiguous_posts(mock_request):
+    """The cascade should keep confident cheap results and escalate the rest."""
+    responses = {
+        (CASCADE_MODEL, "Post number 0"): _response_with_confidence(0.95),
+        (CASCADE_MODEL, "Post number 1"): _response_with_confidence(0.70),
+        (CASCADE_MODEL, "Post number 2"): "not json",
+        (OPENROUTER_MODEL, "Post number 1"): _response_with_confidence(0.90),
+        (OPENROUTER_MODEL, "Post number 2"): _response_with_confidence(0.40),
+    }
+    mock_request.side_effect = (
+        lambda messages, model: responses[(model, messages[-1]["content"].split('"')[1])]
+    )
+    cascade_stats.reset()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output_path = os.path.join(tmp_dir, "claims.json")
+        claims = extract_all_claims(_numbered_posts(3), output_path, cascade=True)
+
+    assert [c["status"] for c in claims] == [
+        "auto_accepted", "auto_accepted", "auto_rejected",
+    ]
+    summary = cascade_stats.summary()
+    assert summary["settled"] == 1
+    assert summary["escalated"] == 2
+    assert summary["tiers"][CASCADE_MODEL]["calls"] == 3
+    assert summary["tiers"][OPENROUTER_MODEL]["calls"] == 2
+
+
+@patch('claims.extractor._request_completion')
+def test_extract_all_claims_cascade_escalates_malformed_claims(mock_request):
+    """Malformed claims from the cheap model should escalate, not abort the run."""
+    responses = {
+        CASCADE_MODEL: json.dumps({"claims": ["GDP grew 5%"]}),
+        OPENROUTER_MODEL: _response_with_confidence(0.95),
+    }
+    mock_request.side_effect = lambda messages, model: responses[model]
+    cascade_stats.reset()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output_path = os.path.join(tmp_dir, "claims.json")
+        claims = extract_all_claims([SAMPLE_POST], output_path, cascade=True)
+
+    assert [c["status"] for c in claims] == ["auto_accepted"]
+    assert cascade_stats.summary()["escalated"] == 1
+
+
+@patch('claims.extractor._call_openrouter')
+def test_extract_all_claims_dedup_extracts_one_post_per_cluster(mock_call):
+    """Near-duplicate posts should share the representative's claims."""
+    mock_call.return_value = MOCK_API_RESPONSE
+    copy = dict(SAMPLE_POST, id="post_009", url="https://twitter.com/x/status/9",
+                text="RT @user: " + SAMPLE_POST["text"])
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output_path = os.path.join(tmp_dir, "claims.json")
+        other = dict(OTHER_POST, text="Bengaluru hosts 40% of India's AI startups, "
+                                       "according to a new NASSCOM survey.")
+        claims = extract_all_claims([SAMPLE_POST, copy, other], output_path,
+                                    dedup_distance=3)
+
+        assert mock_call.call_count == 2
+        linked = [c for c in claims if c["post_id"] == "post_009"]
+        assert len(linked) == 2
+        assert all(c["duplicate_of"] == "post_001" for c in linked)
+        assert processed_key(copy) in load_processed_index(output_path)
+
+
+@patch('claims.extractor.http_client.post')
+def test_request_completion_reports_throttling_to_concurrency(mock_post):
+    """A 429 inside the retry loop should cut the adaptive request limit."""
+    ok = MagicMock(status_code=200)
+    ok.json.return_value = {"choices": [{"message": {"content": "{}"}}]}
+    mock_post.side_effect = [
+        MagicMock(status_code=429, text="slow down", headers={"Retry-After": "0"}),
+        ok,
+    ]
+    openrouter_concurrency.configure(4, maximum=8, adaptive=True)
+    try:
+        assert _request_completion([{"role": "user", "content": "hi"}]) == "{}"
+        stats = openrouter_concurrency.stats()
+        assert (stats["limit"], stats["requests"], stats["errors"]) == (2, 2, 1)
+    finally:
+        openrouter_concurrency.configure(1)
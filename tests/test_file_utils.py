@@ -5,7 +5,10 @@ import os
 import tempfile
 import pytest
 
-from collectors.file_utils import save_json_atomic, load_json_safe
+from collectors.file_utils import (
+    save_json_atomic, load_json_safe, NdjsonJournal, read_ndjson, compact_ndjson,
+    iter_json_records, read_json_records, save_json_stream,
+)
 
 
 @pytest.fixture
@@ -62,6 +65,16 @@ def test_save_json_atomic_no_temp_file_on_success(tmp_dir):
     assert files == ["test.json"]
 
 
+def test_save_json_stream_writes_array_from_generator(tmp_dir):
+    """save_json_stream should write a valid array and leave no temp file."""
+    filepath = os.path.join(tmp_dir, "out", "records.json")
+    assert save_json_stream(({"n": n} for n in range(3)), filepath) == 3
+    assert load_json_safe(filepath) == [{"n": 0}, {"n": 1}, {"n": 2}]
+    assert save_json_stream(iter(()), filepath) == 0
+    assert load_json_safe(filepath) == []
+    assert os.listdir(os.path.dirname(filepath)) == ["records.json"]
+
+
 def test_save_json_atomic_handles_unicode(tmp_dir):
     """save_json_atomic should handle Unicode characters correctly."""
     filepath = os.path.join(tmp_dir, "unicode.json")
@@ -105,3 +118,102 @@ def test_load_json_safe_raises_on_invalid_json(tmp_dir):
 
     with pytest.raises(json.JSONDecodeError):
         load_json_safe(filepath)
+
+
+def test_ndjson_journal_appends_one_line_per_record(tmp_dir):
+    """NdjsonJournal should append each record as a single JSON line."""
+    filepath = os.path.join(tmp_dir, "journal.ndjson")
+    with NdjsonJournal(filepath, fsync_every=2) as journal:
+        journal.append({"n": 1})
+        journal.append({"n": 2, "text": "こんにちは"})
+        journal.append({"n": 3})
+
+    with open(filepath, 'r') as f:
+        lines = f.read().splitlines()
+    assert len(lines) == 3
+    assert list(read_ndjson(filepath)) == [
+        {"n": 1}, {"n": 2, "text": "こんにちは"}, {"n": 3},
+    ]
+
+
+def test_ndjson_journal_truncate_and_append(tmp_dir):
+    """NdjsonJournal should append by default and reset when truncating."""
+    filepath = os.path.join(tmp_dir, "journal.ndjson")
+    with NdjsonJournal(filepath) as journal:
+        journal.append({"run": 1})
+    with NdjsonJournal(filepath) as journal:
+        journal.append({"run": 2})
+    assert list(read_ndjson(filepath)) == [{"run": 1}, {"run": 2}]
+
+    with NdjsonJournal(filepath, truncate=True) as journal:
+        journal.append({"run": 3})
+    assert list(read_ndjson(filepath)) == [{"run": 3}]
+
+
+def test_ndjson_journal_recovers_from_torn_line(tmp_dir):
+    """A line torn by a crash should be skipped and not corrupt later appends."""
+    filepath = os.path.join(tmp_dir, "journal.ndjson")
+    with open(filepath, 'w') as f:
+        f.write('{"n": 1}\n{"n": 2, "cla')
+
+    with NdjsonJournal(filepath) as journal:
+        journal.append({"n": 3})
+
+    assert list(read_ndjson(filepath)) == [{"n": 1}, {"n": 3}]
+
+
+def test_read_ndjson_missing_file_yields_nothing():
+    """read_ndjson should yield nothing for a missing file."""
+    assert list(read_ndjson("/nonexistent/path/journal.ndjson")) == []
+
+
+def test_compact_ndjson_writes_json_array(tmp_dir):
+    """compact_ndjson should write the transformed journal as a JSON array."""
+    journal_path = os.path.join(tmp_dir, "journal.ndjson")
+    output_path = os.path.join(tmp_dir, "out.json")
+    with NdjsonJournal(journal_path) as journal:
+        journal.append({"items": [1, 2]})
+        journal.append({"items": [3]})
+
+    def flatten(records):
+        for record in records:
+            yield from record["items"]
+
+    result = compact_ndjson(journal_path, output_path, transform=flatten)
+    assert result == [1, 2, 3]
+    with open(output_path, 'r') as f:
+        assert json.load(f) == [1, 2, 3]
+
+
+def _chunks(data, size):
+    """Split bytes into fixed-size chunks."""
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def test_iter_json_records_parses_array_across_chunks():
+    """iter_json_records should decode a JSON array split at any byte."""
+    data = json.dumps([{"n": 1, "text": "こんにちは"}, {"n": 2}],
+                      ensure_ascii=False).encode("utf-8")
+    for size in (1, 3, 1024):
+        assert list(iter_json_records(_chunks(data, size))) == [
+            {"n": 1, "text": "こんにちは"}, {"n": 2},
+        ]
+
+
+def test_iter_json_records_parses_ndjson():
+    """iter_json_records should decode newline-delimited JSON."""
+    data = b'{"n": 1}\n\n{"n": 2}\n'
+    assert list(iter_json_records(_chunks(data, 4))) == [{"n": 1}, {"n": 2}]
+
+
+def test_iter_json_records_raises_on_truncated_stream():
+    """iter_json_records should raise if the stream ends mid-record."""
+    with pytest.raises(ValueError):
+        list(iter_json_records([b'[{"n": 1}, {"n"']))
+
+
+def test_read_json_records_streams_file(tmp_dir):
+    """read_json_records should stream records from a file on disk."""
+    filepath = os.path.join(tmp_dir, "records.json")
+    save_json_atomic([{"n": 1}, {"n": 2}], filepath)
+    assert list(read_json_records(filepath, chunk_size=5)) == [{"n": 1}, {"n": 2}]
@@ -0,0 +1,84 @@
+"""Tests for collectors.http_client module."""
+
+import pytest
+import requests
+from unittest.mock import patch, MagicMock
+
+from collectors import http_client, metrics
+
+
+@pytest.fixture(autouse=True)
+def fresh_sessions():
+    """Start and end each test with no pooled sessions."""
+    http_client.close_all()
+    yield
+    http_client.close_all()
+
+
+def test_get_session_reuses_session_per_host():
+    """Requests to the same host should share one pooled session."""
+    first = http_client.get_session("https://api.brightdata.com/datasets/v3/trigger")
+    second = http_client.get_session("https://api.brightdata.com/datasets/v3/progress/x")
+    other = http_client.get_session("https://openrouter.ai/api/v1/chat/completions")
+    assert first is second
+    assert first is not other
+
+
+def test_get_session_mounts_pooled_adapter_without_retries():
+    """Sessions should use a pooled adapter that leaves retries to the caller."""
+    session = http_client.get_session("https://api.twitterapi.io/twitter/tweet")
+    adapter = session.get_adapter("https://api.twitterapi.io/")
+    assert adapter._pool_maxsize == http_client.HTTP_POOL_MAXSIZE
+    assert adapter.max_retries.total == 0
+
+
+def test_timeout_for_uses_per_host_defaults():
+    """timeout_for should return the configured timeout for known hosts."""
+    assert http_client.timeout_for("https://openrouter.ai/api/v1/x") == 60
+    assert http_client.timeout_for("https://example.com/") == http_client.HTTP_DEFAULT_TIMEOUT
+
+
+@patch('collectors.http_client.rate_limiter')
+@patch('requests.Session.request')
+def test_request_goes_through_rate_limiter(mock_request, mock_limiter):
+    """request should take a token first and report the response after."""
+    response = MagicMock(status_code=200)
+    mock_request.return_value = response
+
+    http_client.get("https://API.twitterapi.io/twitter/tweet/advanced_search")
+    mock_limiter.acquire.assert_called_once_with("api.twitterapi.io")
+    mock_limiter.update_from_response.assert_called_once_with("api.twitterapi.io", response)
+
+
+@patch('requests.Session.request')
+def test_request_applies_default_timeout(mock_request):
+    """request should pass the per-host timeout unless one is given."""
+    mock_request.return_value = MagicMock(status_code=200)
+
+    http_client.get("https://openrouter.ai/api/v1/models")
+    assert mock_request.call_args.kwargs["timeout"] == 60
+
+    http_client.post("https://openrouter.ai/api/v1/models", json={}, timeout=5)
+    assert mock_request.call_args.kwargs["timeout"] == 5
+    assert mock_request.call_args.args[0] == "POST"
+
+
+@patch('requests.Session.request')
+def test_request_records_status_latency_and_bytes(mock_request):
+    """Responses should be recorded per host with their status and body size."""
+    mock_request.side_effect = [
+        MagicMock(status_code=200, headers={}, content=b"x" * 300),
+        MagicMock(status_code=429, headers={"Content-Length": "12"}),
+        requests.exceptions.ConnectTimeout("timed out"),
+    ]
+
+    http_client.get("https://openrouter.ai/api/v1/models")
+    http_client.get("https://openrouter.ai/api/v1/models", stream=True)
+    with pytest.raises(requests.exceptions.ConnectTimeout):
+        http_client.get("https://openrouter.ai/api/v1/models")
+
+    stats = metrics.registry.snapshot()["endpoints"]["openrouter.ai"]
+    assert stats["requests"] == 3
+    assert stats["statuses"] == {"200": 1, "429": 1, "ConnectTimeout": 1}
+    assert stats["bytes_received"] == 312
+    assert stats["latency"]["count"] == 3
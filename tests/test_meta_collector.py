@@ -1,11 +1,22 @@
 """Tests for collectors.meta_collector module."""
 
+import os
+import tempfile
 import pytest
 from unittest.mock import patch, MagicMock
 
 from collectors.meta_collector import normalize_meta_post, collect_meta
 
 
+@pytest.fixture(autouse=True)
+def snapshot_cache():
+    """Point the BrightData snapshot cache at a temporary file."""
+    with tempfile.TemporaryDirectory() as d:
+        with patch('collectors.brightdata_utils.BRIGHTDATA_CACHE_FILE',
+                   os.path.join(d, 'cache.json')):
+            yield
+
+
 SAMPLE_FB_POST = {
     "post_id": "fb_001",
     "author_name": "AI News Page",
@@ -58,28 +69,46 @@ def test_normalize_meta_post_missing_fields():
     assert result["engagement"]["likes"] == 0
 
 
-@patch('collectors.meta_collector.save_json_atomic')
-@patch('collectors.meta_collector.download_snapshot')
-@patch('collectors.meta_collector.poll_snapshot')
-@patch('collectors.meta_collector.trigger_collection')
-def test_collect_meta_success(mock_trigger, mock_poll, mock_download, mock_save):
+@patch('collectors.brightdata_utils.stream_snapshot')
+@patch('collectors.brightdata_utils.poll_snapshots')
+@patch('collectors.brightdata_utils.trigger_collection')
+def test_collect_meta_success(mock_trigger, mock_poll, mock_stream):
     """collect_meta should return normalized posts on success."""
     mock_trigger.return_value = "snap_fb_001"
-    mock_poll.return_value = True
-    mock_download.return_value = [SAMPLE_FB_POST] * 5
+    mock_poll.side_effect = lambda ids: {sid: "ready" for sid in ids}
+    mock_stream.return_value = [dict(SAMPLE_FB_POST, post_id=f"fb_{i}") for i in range(5)]
 
     results = collect_meta(["https://facebook.com/ainews"])
     assert len(results) == 5
     assert all(r["platform"] == "meta" for r in results)
 
 
-@patch('collectors.meta_collector.save_json_atomic')
-@patch('collectors.meta_collector.poll_snapshot')
-@patch('collectors.meta_collector.trigger_collection')
-def test_collect_meta_timeout(mock_trigger, mock_poll, mock_save):
+@patch('collectors.brightdata_utils.poll_snapshots')
+@patch('collectors.brightdata_utils.trigger_collection')
+def test_collect_meta_timeout(mock_trigger, mock_poll):
     """collect_meta should return empty list on timeout."""
     mock_trigger.return_value = "snap_fb_002"
-    mock_poll.return_value = False
+    mock_poll.side_effect = lambda ids: {sid: "timeout" for sid in ids}
 
     results = collect_meta(["https://facebook.com/page"])
     assert results == []
+
+
+@patch('collectors.brightdata_utils.stream_snapshot')
+@patch('collectors.brightdata_utils.poll_snapshots')
+@patch('collectors.brightdata_utils.trigger_collection')
+def test_collect_meta_chunks_and_dedups_by_post_id(mock_trigger, mock_poll, mock_stream):
+    """Pages should be split across snapshots and repeated posts kept once."""
+    mock_trigger.side_effect = lambda dataset_id, chunk: "snap_" + chunk[0]["url"][-1]
+    mock_poll.side_effect = lambda ids: {sid: "ready" for sid in ids}
+    # Both snapshots return fb_001 (e.g., a post shared onto two pages)
+    mock_stream.side_effect = lambda sid, path: iter([
+        SAMPLE_FB_POST, dict(SAMPLE_FB_POST, post_id=f"fb_{sid}"),
+    ])
+
+    urls = [f"https://facebook.com/page{i}" for i in range(4)]
+    results = collect_meta(urls + urls[:1], chunk_size=2)
+
+    assert mock_trigger.call_count == 2
+    assert sum(len(call.args[1]) for call in mock_trigger.call_args_list) == 4
+    assert sorted(r["id"] for r in results) == ["fb_001", "fb_snap_0", "fb_snap_2"]
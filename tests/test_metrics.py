@@ -0,0 +1,77 @@
+"""Tests for collectors.metrics module."""
+
+import json
+import os
+import tempfile
+
+import pytest
+
+from collectors.metrics import Histogram, MetricsRegistry, registry, report
+
+
+def test_histogram_buckets_and_percentiles():
+    """Samples should land in their buckets and percentiles use bucket bounds."""
+    histogram = Histogram(bounds=(0.1, 1.0, 10.0))
+    for seconds in [0.05] * 90 + [0.5] * 9 + [42.0]:
+        histogram.observe(seconds)
+
+    snapshot = histogram.snapshot()
+    assert snapshot["buckets"] == {"le_0.1": 90, "le_1": 9, "le_10": 0, "inf": 1}
+    assert snapshot["count"] == 100
+    assert snapshot["p50"] == 0.1
+    assert snapshot["p95"] == 1.0
+    assert snapshot["max"] == 42.0
+    assert histogram.percentile(1.0) == 42.0  # open bucket reports the max
+    assert snapshot["mean"] == pytest.approx((90 * 0.05 + 9 * 0.5 + 42.0) / 100)
+
+
+def test_histogram_percentile_never_exceeds_max():
+    """A bucket bound above every sample should be clipped to the max."""
+    histogram = Histogram(bounds=(10.0,))
+    histogram.observe(0.3)
+    assert histogram.percentile(0.5) == 0.3
+    assert Histogram().snapshot()["p50"] is None
+
+
+def test_registry_aggregates_calls_and_requests():
+    """Calls and requests should be summed per function and per endpoint."""
+    metrics = MetricsRegistry()
+    metrics.record_call("mod.search", 1.5, attempts=3, retries=2,
+                        backoff_seconds=1.25, outcome="ok")
+    metrics.record_call("mod.search", 0.2, attempts=1, retries=0,
+                        backoff_seconds=0.0, outcome="error")
+    metrics.record_request("api.example.com", 200, 0.2, bytes_received=1000)
+    metrics.record_request("api.example.com", 429, 0.1)
+    metrics.record_request("api.example.com", "ConnectTimeout", 5.0)
+    metrics.record_wait("api.example.com", 0.75)
+
+    snapshot = metrics.snapshot()
+    search = snapshot["functions"]["mod.search"]
+    assert (search["calls"], search["attempts"], search["retries"]) == (2, 4, 2)
+    assert search["backoff_seconds"] == 1.25
+    assert search["outcomes"] == {"ok": 1, "error": 1}
+    assert search["latency"]["count"] == 2
+
+    endpoint = snapshot["endpoints"]["api.example.com"]
+    assert endpoint["requests"] == 3
+    assert endpoint["statuses"] == {"200": 1, "429": 1, "ConnectTimeout": 1}
+    assert endpoint["bytes_received"] == 1000
+    assert endpoint["rate_limit_wait_seconds"] == 0.75
+
+    metrics.reset()
+    assert metrics.snapshot()["functions"] == {}
+
+
+def test_report_writes_stats_file_with_extra_sections():
+    """report should write the snapshot plus extra sections as JSON."""
+    registry.record_request("openrouter.ai", 200, 0.4, bytes_received=2048)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "stats.json")
+        returned = report(path, {"circuit_breakers": {"openrouter": {"state": "closed"}}})
+
+        with open(path, encoding="utf-8") as f:
+            written = json.load(f)
+    assert written == returned
+    assert written["endpoints"]["openrouter.ai"]["bytes_received"] == 2048
+    assert written["circuit_breakers"]["openrouter"]["state"] == "closed"
+    assert "started_at" in written and "finished_at" in written
@@ -0,0 +1,148 @@
+"""Tests for collectors.posts_store module."""
+
+import json
+import os
+import tempfile
+import pytest
+from unittest.mock import patch
+
+from collectors.posts_store import PostsStore, post_key, content_hash
+
+
+@pytest.fixture
+def store_paths():
+    """Provide temporary data and index log paths for a store."""
+    with tempfile.TemporaryDirectory() as d:
+        yield os.path.join(d, "store.ndjson"), os.path.join(d, "store.index.ndjson")
+
+
+def _post(post_id, likes=0, collected_at="2026-02-19T10:00:00+00:00"):
+    """Build a minimal twitter post."""
+    return {"id": post_id, "platform": "twitter", "text": f"text {post_id}",
+            "engagement": {"likes": likes}, "collected_at": collected_at}
+
+
+def _line_count(path):
+    with open(path, 'r') as f:
+        return sum(1 for _ in f)
+
+
+def test_post_key_and_content_hash_ignore_collection_time():
+    """The content hash should not change just because a post was re-collected."""
+    assert post_key(_post("1")) == "twitter:1"
+    assert content_hash(_post("1")) == content_hash(_post("1", collected_at="later"))
+    assert content_hash(_post("1")) != content_hash(_post("1", likes=5))
+
+
+def test_upsert_inserts_updates_and_tracks_seen_times(store_paths):
+    """Upserts should refresh engagement and keep first_seen/last_seen."""
+    with PostsStore(*store_paths) as store:
+        assert store.upsert(_post("1", collected_at="2026-01-01")) == "inserted"
+        assert store.upsert(_post("1", collected_at="2026-01-02")) == "unchanged"
+        assert store.upsert(_post("1", likes=7, collected_at="2026-01-03")) == "updated"
+
+        post = store.get("twitter", "1")
+        assert post["engagement"]["likes"] == 7
+        assert (post["first_seen"], post["last_seen"]) == ("2026-01-01", "2026-01-03")
+        assert len(store) == 1
+
+
+def test_unchanged_posts_do_not_grow_the_data_log(store_paths):
+    """Re-seeing an identical post should append only an index line."""
+    data_path, index_path = store_paths
+    with PostsStore(*store_paths, fsync_every=1) as store:
+        store.upsert_many([_post(str(n)) for n in range(3)])
+        store.upsert_many([_post(str(n), collected_at="2026-03-01") for n in range(3)])
+        assert _line_count(data_path) == 3
+        assert _line_count(index_path) == 6
+
+
+def test_store_reopens_from_index(store_paths):
+    """A reopened store should find posts through its persisted index."""
+    with PostsStore(*store_paths) as store:
+        store.upsert_many([_post("1"), _post("2", likes=3)])
+
+    reopened = PostsStore(*store_paths)
+    assert "twitter:2" in reopened
+    assert reopened.get("twitter", "2")["engagement"]["likes"] == 3
+    assert reopened.get("twitter", "missing") is None
+    reopened.close()
+
+
+def test_export_json_streams_all_posts_in_insertion_order(store_paths):
+    """export_json should write a valid JSON array of current post versions."""
+    with tempfile.TemporaryDirectory() as d:
+        output = os.path.join(d, "posts.json")
+        with PostsStore(*store_paths) as store:
+            assert store.export_json(output) == 0
+            with open(output) as f:
+                assert json.load(f) == []
+
+            store.upsert_many([_post("b"), _post("a"), _post("b", likes=2)])
+            assert store.export_json(output) == 2
+
+        with open(output) as f:
+            saved = json.load(f)
+        assert [p["id"] for p in saved] == ["b", "a"]
+        assert saved[0]["engagement"]["likes"] == 2
+        assert os.listdir(d) == ["posts.json"]
+
+
+def test_close_compacts_superseded_records(store_paths):
+    """Stale lines outnumbering live posts should be compacted away on close."""
+    data_path, index_path = store_paths
+    with PostsStore(*store_paths) as store:
+        for likes in range(5):
+            store.upsert(_post("1", likes=likes))
+        store.upsert(_post("2"))
+
+    assert _line_count(data_path) == 2
+    assert _line_count(index_path) == 3  # compaction header + 2 entries
+    with PostsStore(*store_paths) as store:
+        assert store.get("twitter", "1")["engagement"]["likes"] == 4
+        assert store.get("twitter", "2")["text"] == "text 2"
+
+
+@pytest.mark.parametrize("crash_at", [1, 2])
+def test_compaction_interrupted_between_renames_recovers(store_paths, crash_at):
+    """A crash at either rename should leave a store whose offsets match its data."""
+    data_path, _ = store_paths
+    with PostsStore(*store_paths) as store:
+        store.upsert(_post("1"))
+        for likes in range(3):
+            store.upsert(_post("2", likes=likes))
+
+    store = PostsStore(*store_paths)
+    real_replace = os.replace
+    calls = []
+
+    def crashing_replace(src, dst):
+        calls.append(src)
+        if len(calls) == crash_at:
+            raise OSError("simulated crash")
+        real_replace(src, dst)
+
+    with patch("collectors.posts_store.os.replace", side_effect=crashing_replace):
+        with pytest.raises(OSError):
+            store.compact()
+
+    with PostsStore(*store_paths) as reopened:
+        assert reopened.get("twitter", "1")["text"] == "text 1"
+        assert reopened.get("twitter", "2")["engagement"]["likes"] == 2
+        reopened.upsert(_post("3"))
+        assert reopened.get("twitter", "3")["id"] == "3"
+    assert not [f for f in os.listdir(os.path.dirname(data_path)) if ".compact-" in f]
+
+
+def test_store_survives_torn_data_line(store_paths):
+    """A partial data line left by a crash should not corrupt new records."""
+    data_path, _ = store_paths
+    with PostsStore(*store_paths) as store:
+        store.upsert(_post("1"))
+    with open(data_path, 'a') as f:
+        f.write('{"id": "torn"')
+
+    with PostsStore(*store_paths) as store:
+        store.upsert(_post("2"))
+        assert store.get("twitter", "2")["id"] == "2"
+        assert store.get("twitter", "1")["id"] == "1"
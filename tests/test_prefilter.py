@@ -0,0 +1,47 @@
+"""Tests for claims.prefilter module."""
+
+from claims.prefilter import score_post, prefilter_post
+
+
+def test_score_post_factual_post_scores_high():
+    """Posts with numbers, entities, and attribution should score high."""
+    score, signals = score_post(
+        "India's AI market is expected to reach $17 billion by 2027, "
+        "according to a NASSCOM report."
+    )
+    assert score >= 0.9
+    assert signals == ["numbers", "quantities", "entities", "attribution"]
+
+
+def test_score_post_opinion_scores_low():
+    """Pure opinion posts should score low."""
+    score, signals = score_post(
+        "I think AI is going to be amazing for everyone! So excited about the future 🚀🔥"
+    )
+    assert score < 0.2
+    assert "numbers" not in signals
+
+
+def test_score_post_short_posts_are_penalized():
+    """Posts below the minimum word count should have their score halved."""
+    long_score, _ = score_post("The summit drew 5000 delegates from many different countries")
+    short_score, signals = score_post("5000 delegates")
+    assert "short" in signals
+    assert short_score < long_score
+
+
+def test_score_post_ignores_mentions_and_urls():
+    """Mentions, hashtags, and URLs should not count as entities or numbers."""
+    score, signals = score_post("@User123 #Summit2026 https://t.co/abc123 so true, love it")
+    assert score == 0.0
+
+
+def test_prefilter_post_returns_reason_for_skips():
+    """prefilter_post should explain why a post was skipped."""
+    keep, reason = prefilter_post({"text": "lol"}, threshold=0.2)
+    assert keep is False
+    assert "0.00 < 0.20" in reason
+
+    keep, reason = prefilter_post({"text": "OpenAI laid off 20% of its safety team"}, 0.2)
+    assert keep is True
+    assert reason is None
@@ -1,6 +1,11 @@
 """Tests for claims.prompts module."""
 
-from claims.prompts import build_extraction_prompt, SYSTEM_PROMPT, FEW_SHOT_EXAMPLES
+import json
+
+from claims.prompts import (
+    build_extraction_prompt, SYSTEM_PROMPT, FEW_SHOT_EXAMPLES,
+    build_batch_extraction_prompt, BATCH_FEW_SHOT_EXAMPLES,
+)
 
 
 def test_system_prompt_exists():
@@ -62,3 +67,26 @@ def test_build_extraction_prompt_wraps_text():
     messages = build_extraction_prompt("Some specific post text here")
     assert "Some specific post text here" in messages[-1]["content"]
     assert "Analyze this social media post" in messages[-1]["content"]
+
+
+def test_build_batch_extraction_prompt_tags_each_post():
+    """Batch prompt should send the prefix once and tag every post by id."""
+    messages = build_batch_extraction_prompt([("111", "First post"), ("222", "Second post")])
+    assert messages[0]["role"] == "system"
+    assert "Batch" in messages[0]["content"]
+    assert len(messages) == 1 + len(BATCH_FEW_SHOT_EXAMPLES) + 1
+
+    last = messages[-1]["content"]
+    assert "[post_id: 111]" in last
+    assert '"First post"' in last
+    assert "[post_id: 222]" in last
+
+
+def test_batch_few_shot_examples_cover_single_examples():
+    """The batch few-shot example should pack every single-post example."""
+    user, assistant = BATCH_FEW_SHOT_EXAMPLES
+    assert user["role"] == "user"
+    assert assistant["role"] == "assistant"
+    parsed = json.loads(assistant["content"])
+    assert len(parsed["posts"]) == len(FEW_SHOT_EXAMPLES) // 2
+    assert parsed["posts"]["example_2"] == {"claims": []}
@@ -0,0 +1,150 @@
+"""Tests for server.query_server module."""
+
+import gzip
+import json
+import os
+import tempfile
+import threading
+import urllib.error
+import urllib.request
+import pytest
+
+from collectors.file_utils import save_json_atomic
+from server.query_server import (
+    Dataset, DataSource, QueryServer, QueryError,
+    query_posts, query_claims, query_stats, make_etag,
+)
+
+POSTS = [
+    {"id": "1", "platform": "twitter", "timestamp": "Fri Feb 20 07:20:53 +0000 2026",
+     "engagement": {"likes": 5, "shares": 1}},
+    {"id": "2", "platform": "tiktok", "timestamp": "2026-02-21T10:00:00.000Z",
+     "engagement": {"likes": 1, "shares": "9"}},
+    {"id": "3", "platform": "meta", "timestamp": "", "engagement": {"likes": 7}},
+]
+CLAIMS = [
+    {"post_id": "1", "platform": "twitter", "status": "needs_review",
+     "category": "health", "confidence": 0.7},
+    {"post_id": "2", "platform": "tiktok", "status": "auto_accepted",
+     "category": "economy", "confidence": 0.95},
+    {"post_id": "3", "platform": "meta", "status": "auto_rejected",
+     "category": "health", "confidence": 0.3},
+]
+
+
+@pytest.fixture
+def dataset():
+    return Dataset(POSTS, CLAIMS)
+
+
+def _ids(response, field="id"):
+    return [item[field] for item in response["items"]]
+
+
+def test_query_posts_filters_sorts_and_pages(dataset):
+    """Posts should sort by parsed date/engagement and page correctly."""
+    assert _ids(query_posts(dataset, {})) == ["2", "1", "3"]
+    assert _ids(query_posts(dataset, {"sort": "shares"})) == ["2", "1", "3"]
+    assert _ids(query_posts(dataset, {"sort": "likes", "order": "asc"})) == ["2", "1", "3"]
+    assert _ids(query_posts(dataset, {"platform": "twitter,meta"})) == ["1", "3"]
+    assert _ids(query_posts(dataset, {"since": "2026-02-21"})) == ["2"]
+    assert _ids(query_posts(dataset, {"until": "2026-02-20"})) == ["1"]
+
+    page = query_posts(dataset, {"sort": "likes", "page": "2", "page_size": "2"})
+    assert (page["total"], page["pages"], _ids(page)) == (3, 2, ["2"])
+
+
+def test_query_claims_filters_and_keeps_positions(dataset):
+    """Claims should filter by status/category/confidence/date and report positions."""
+    result = query_claims(dataset, {"category": "health"})
+    assert _ids(result, "position") == [0, 2]
+    assert _ids(query_claims(dataset, {"status": "auto_accepted,auto_rejected"}),
+                "position") == [1, 2]
+    assert _ids(query_claims(dataset, {"min_confidence": "0.5", "sort": "confidence"}),
+                "position") == [1, 0]
+    assert _ids(query_claims(dataset, {"max_confidence": "0.5"}), "position") == [2]
+    assert _ids(query_claims(dataset, {"since": "2026-02-21T00:00:00Z"}), "position") == [1]
+    assert "position" not in CLAIMS[0]
+
+
+@pytest.mark.parametrize("params", [
+    {"sort": "views"}, {"order": "up"}, {"page": "0"}, {"page_size": "100000"},
+    {"page": "x"}, {"since": "yesterday"}, {"min_confidence": "high"},
+])
+def test_invalid_parameters_raise_query_error(dataset, params):
+    with pytest.raises(QueryError):
+        query_claims(dataset, params)
+
+
+def test_query_stats_counts(dataset):
+    stats = query_stats(dataset, {})
+    assert stats["posts"]["platform"] == {"twitter": 1, "tiktok": 1, "meta": 1}
+    assert stats["claims"]["category"] == {"health": 2, "economy": 1}
+
+
+def test_etag_ignores_parameter_order():
+    assert make_etag("v1", "/api/posts", {"a": "1", "b": "2"}) == \
+        make_etag("v1", "/api/posts", {"b": "2", "a": "1"})
+    assert make_etag("v1", "/api/posts", {}) != make_etag("v2", "/api/posts", {})
+
+
+@pytest.fixture
+def server():
+    """Run a query server over temporary data files on a free port."""
+    with tempfile.TemporaryDirectory() as d:
+        posts_path = os.path.join(d, "posts.json")
+        claims_path = os.path.join(d, "claims.json")
+        save_json_atomic(POSTS * 20, posts_path)
+        save_json_atomic(CLAIMS, claims_path)
+        httpd = QueryServer(("127.0.0.1", 0), DataSource(posts_path, claims_path))
+        thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+        thread.start()
+        yield httpd, posts_path
+        httpd.shutdown()
+        httpd.server_close()
+
+
+def _get(httpd, path, headers=None):
+    """GET a path, returning (status, headers, decoded JSON or None)."""
+    url = f"http://127.0.0.1:{httpd.server_address[1]}{path}"
+    request = urllib.request.Request(url, headers=headers or {})
+    try:
+        with urllib.request.urlopen(request) as response:
+            status, resp_headers, body = response.status, response.headers, response.read()
+    except urllib.error.HTTPError as e:
+        status, resp_headers, body = e.code, e.headers, e.read()
+    if resp_headers.get("Content-Encoding") == "gzip":
+        body = gzip.decompress(body)
+    return status, resp_headers, json.loads(body) if body else None
+
+
+def test_server_gzips_and_revalidates_with_etag(server):
+    """Responses should be gzipped and answer a matching If-None-Match with 304."""
+    httpd, posts_path = server
+    status, headers, body = _get(httpd, "/api/posts?page_size=50",
+                                 {"Accept-Encoding": "gzip"})
+    assert status == 200
+    assert headers["Content-Encoding"] == "gzip"
+    assert (body["total"], len(body["items"])) == (60, 50)
+    etag = headers["ETag"]
+
+    status, headers, body = _get(httpd, "/api/posts?page_size=50",
+                                 {"If-None-Match": etag})
+    assert (status, body, headers["ETag"]) == (304, None, etag)
+
+    save_json_atomic(POSTS, posts_path)
+    status, headers, body = _get(httpd, "/api/posts?page_size=50",
+                                 {"If-None-Match": etag})
+    assert status == 200 and headers["ETag"] != etag
+    assert body["total"] == 3
+
+
+def test_server_reports_bad_requests_and_unknown_paths(server):
+    httpd, _ = server
+    status, _, body = _get(httpd, "/api/claims?page=0")
+    assert status == 400 and "page" in body["error"]
+    status, _, _ = _get(httpd, "/api/nothing")
+    assert status == 404
+    status, headers, body = _get(httpd, "/api/stats")
+    assert status == 200 and "Content-Encoding" not in headers
+    assert body["claims"]["total"] == 3
@@ -0,0 +1,86 @@
+"""Tests for collectors.rate_limiter module."""
+
+import time
+import pytest
+from unittest.mock import patch
+from requests.structures import CaseInsensitiveDict
+
+from collectors import rate_limiter
+from collectors.rate_limiter import TokenBucket, retry_after_seconds
+
+
+class FakeResponse:
+    def __init__(self, **headers):
+        self.headers = CaseInsensitiveDict(
+            {k.replace("_", "-"): v for k, v in headers.items()})
+
+
+def test_bucket_allows_burst_then_paces(clock):
+    """A full bucket should serve its burst at once, then one token per 1/rate."""
+    bucket = TokenBucket(rate=2, capacity=3, clock=clock, sleep_func=clock.sleep)
+    waits = [bucket.acquire() for _ in range(5)]
+    assert waits[:3] == [0, 0, 0]
+    assert waits[3:] == pytest.approx([0.5, 0.5])
+
+
+def test_bucket_refills_over_time(clock):
+    bucket = TokenBucket(rate=1, capacity=2, clock=clock, sleep_func=clock.sleep)
+    bucket.acquire(), bucket.acquire()
+    clock.now += 10  # refill caps at capacity
+    assert [bucket.acquire() for _ in range(3)] == pytest.approx([0, 0, 1.0])
+
+
+def test_unlimited_bucket_still_honors_pause(clock):
+    bucket = TokenBucket(clock=clock, sleep_func=clock.sleep)
+    assert bucket.acquire() == 0
+    bucket.pause(4)
+    assert bucket.acquire() == pytest.approx(4)
+    assert bucket.acquire() == 0
+
+
+def test_limit_tokens_caps_remaining(clock):
+    bucket = TokenBucket(rate=1, capacity=10, clock=clock, sleep_func=clock.sleep)
+    bucket.limit_tokens(1)
+    assert [bucket.acquire(), bucket.acquire()] == pytest.approx([0, 1.0])
+
+
+def test_retry_after_seconds_parses_delay_and_date():
+    assert retry_after_seconds(FakeResponse(Retry_After="12")) == 12.0
+    future = time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(time.time() + 30))
+    assert 25 < retry_after_seconds(FakeResponse(Retry_After=future)) <= 30
+    assert retry_after_seconds(FakeResponse(Retry_After="soon")) is None
+    assert retry_after_seconds(FakeResponse()) is None
+    assert retry_after_seconds(object()) is None
+
+
+@pytest.mark.parametrize("reset", [
+    lambda now: "5",                           # seconds from now
+    lambda now: str(int(now) + 5),             # epoch seconds
+    lambda now: str(int((now + 5) * 1000)),    # epoch milliseconds (OpenRouter)
+])
+def test_update_pauses_host_when_rate_limit_exhausted(reset):
+    # Build the header at run time; a value fixed at collection goes stale
+    with patch.object(TokenBucket, "pause") as mock_pause:
+        rate_limiter.update_from_response(
+            "openrouter.ai",
+            FakeResponse(X_RateLimit_Remaining="0", X_RateLimit_Reset=reset(time.time())))
+    assert 3 < mock_pause.call_args.args[0] <= 5
+
+
+def test_update_from_retry_after_and_remaining():
+    with patch.object(TokenBucket, "pause") as mock_pause, \
+            patch.object(TokenBucket, "limit_tokens") as mock_limit:
+        rate_limiter.update_from_response("api.brightdata.com", FakeResponse(Retry_After="2"))
+        mock_pause.assert_called_once_with(2.0)
+        rate_limiter.update_from_response("api.brightdata.com",
+                                          FakeResponse(RateLimit_Remaining="4"))
+        mock_limit.assert_called_once_with(4.0)
+        rate_limiter.update_from_response("api.brightdata.com", FakeResponse())
+    assert mock_pause.call_count == 1
+
+
+def test_get_bucket_uses_configured_limits():
+    bucket = rate_limiter.get_bucket("api.brightdata.com")
+    assert (bucket.rate, bucket.capacity) == (5, 10)
+    assert rate_limiter.get_bucket("api.brightdata.com") is bucket
+    assert rate_limiter.get_bucket("example.com").rate is None
@@ -0,0 +1,109 @@
+"""Tests for claims.response_cache module."""
+
+import itertools
+import os
+import sqlite3
+import tempfile
+import pytest
+from unittest.mock import patch
+
+from claims.response_cache import ResponseCache, cache_key
+
+
+MESSAGES = [{"role": "user", "content": "Analyze this post"}]
+
+
+@pytest.fixture
+def cache_path():
+    """Provide a temporary SQLite path for the cache."""
+    with tempfile.TemporaryDirectory() as d:
+        yield os.path.join(d, "cache.sqlite3")
+
+
+def test_cache_key_depends_on_model_temperature_and_messages():
+    """cache_key should change when any part of the request changes."""
+    base = cache_key("openai/gpt-4o", 0.1, MESSAGES)
+    assert base == cache_key("openai/gpt-4o", 0.1, list(MESSAGES))
+    assert base != cache_key("openai/gpt-4o-mini", 0.1, MESSAGES)
+    assert base != cache_key("openai/gpt-4o", 0.2, MESSAGES)
+    assert base != cache_key("openai/gpt-4o", 0.1, [{"role": "user", "content": "x"}])
+
+
+def test_cache_get_put_counts_hits_and_misses(cache_path):
+    """ResponseCache should return stored responses and count hits/misses."""
+    cache = ResponseCache(cache_path, max_bytes=1024)
+    assert cache.get("k1") is None
+    cache.put("k1", '{"claims": []}')
+    assert cache.get("k1") == '{"claims": []}'
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["entries"] == 1
+
+
+def test_cache_persists_across_instances(cache_path):
+    """Cached responses should survive reopening the database."""
+    cache = ResponseCache(cache_path, max_bytes=1024)
+    cache.put("k1", "response")
+    cache.close()
+
+    reopened = ResponseCache(cache_path, max_bytes=1024)
+    assert reopened.get("k1") == "response"
+    assert reopened.stats()["bytes"] == len("response")
+
+
+def test_cache_evicts_least_recently_used(cache_path):
+    """Entries beyond max_bytes should be evicted oldest-access first."""
+    cache = ResponseCache(cache_path, max_bytes=20, touch_resolution=0)
+    cache.put("a", "x" * 8)
+    cache.put("b", "y" * 8)
+    cache.get("a")  # "b" is now least recently used
+    cache.put("c", "z" * 8)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "x" * 8
+    assert cache.get("c") == "z" * 8
+    assert cache.stats()["bytes"] == 16
+
+
+def test_cache_eviction_spans_several_batches(cache_path):
+    """Eviction should keep reading oldest entries until under max_bytes."""
+    clock = itertools.count(1000)
+    with patch("claims.response_cache.EVICT_BATCH", 2), \
+            patch("claims.response_cache.time.time", side_effect=lambda: next(clock)):
+        cache = ResponseCache(cache_path, max_bytes=40, touch_resolution=0)
+        for key in "abcde":
+            cache.put(key, "x" * 8)
+        cache.put("big", "y" * 32)
+
+        assert [key for key in "abcde" if cache.get(key)] == ["e"]
+        assert cache.get("big") == "y" * 32
+        assert cache.stats() == {"hits": 2, "misses": 4, "entries": 2, "bytes": 40}
+
+
+def test_cache_bypass_skips_lookups_but_stores(cache_path):
+    """A bypassed cache should always miss but still store new responses."""
+    cache = ResponseCache(cache_path, max_bytes=1024)
+    cache.put("k1", "old")
+
+    bypassed = ResponseCache(cache_path, max_bytes=1024, bypass=True)
+    assert bypassed.get("k1") is None
+    bypassed.put("k1", "new")
+
+    assert ResponseCache(cache_path, max_bytes=1024).get("k1") == "new"
+
+
+def test_cache_hits_skip_writes_within_touch_resolution(cache_path):
+    """Repeated hits should not rewrite last_access, and the DB should use WAL."""
+    cache = ResponseCache(cache_path, max_bytes=1024, touch_resolution=3600)
+    cache.put("k1", "response")
+    conn = sqlite3.connect(cache_path)
+    before = conn.execute("SELECT last_access FROM responses").fetchone()[0]
+
+    for _ in range(5):
+        assert cache.get("k1") == "response"
+
+    assert conn.execute("SELECT last_access FROM responses").fetchone()[0] == before
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    conn.close()
@@ -4,9 +4,11 @@ import pytest
 import requests
 from unittest.mock import MagicMock, Mock
 
+from collectors import metrics
 from collectors.retry_utils import (
     retry_with_backoff, RetryableError, check_response_retryable,
-    RETRYABLE_STATUS_CODES,
+    RETRYABLE_STATUS_CODES, CircuitBreaker, CircuitOpenError, get_breaker,
+    breaker_states,
 )
 
 
@@ -120,12 +122,12 @@ def test_no_retry_on_non_retryable_http_error():
 
 
 def test_exponential_backoff_timing():
-    """Backoff should double each retry."""
+    """Without jitter, backoff should double each retry."""
     sleep_times = []
     mock_sleep = MagicMock(side_effect=lambda t: sleep_times.append(t))
 
     @retry_with_backoff(max_retries=3, initial_backoff=1.0, multiplier=2.0,
-                        sleep_func=mock_sleep)
+                        sleep_func=mock_sleep, jitter=False)
     def always_fails():
         raise RetryableError("fail")
 
@@ -171,3 +173,198 @@ def test_check_response_retryable_raises_http_error_on_400():
     )
     with pytest.raises(requests.exceptions.HTTPError):
         check_response_retryable(resp)
+
+
+def test_retry_honors_retry_after_header():
+    """A Retry-After delay should replace the backoff, capped at the maximum."""
+    sleep_times = []
+    responses = iter([
+        Mock(status_code=429, text="slow down", headers={"Retry-After": "7"}),
+        Mock(status_code=503, text="busy", headers={"Retry-After": "100000"}),
+        Mock(status_code=503, text="busy", headers={}),
+        Mock(status_code=503, text="busy", headers={}),
+    ])
+
+    @retry_with_backoff(max_retries=3, initial_backoff=1.0, multiplier=2.0,
+                        sleep_func=sleep_times.append, jitter=False)
+    def call():
+        check_response_retryable(next(responses))
+
+    with pytest.raises(RetryableError):
+        call()
+    assert sleep_times == [7.0, 120, 4.0]
+
+
+def test_check_response_retryable_attaches_retry_after():
+    resp = Mock(status_code=429, text="", headers={"Retry-After": "3"})
+    with pytest.raises(RetryableError) as excinfo:
+        check_response_retryable(resp)
+    assert excinfo.value.retry_after == 3.0
+
+
+def test_backoff_uses_full_jitter_with_cap():
+    """Each sleep should be drawn from [0, min(backoff, max_backoff)]."""
+    bounds = []
+
+    def fake_uniform(low, high):
+        bounds.append((low, high))
+        return high / 2
+
+    sleep_times = []
+
+    @retry_with_backoff(max_retries=4, initial_backoff=1.0, multiplier=4.0,
+                        max_backoff=10.0, sleep_func=sleep_times.append,
+                        random_func=fake_uniform)
+    def always_fails():
+        raise RetryableError("fail")
+
+    with pytest.raises(RetryableError):
+        always_fails()
+    assert bounds == [(0, 1.0), (0, 4.0), (0, 10.0), (0, 10.0)]
+    assert sleep_times == [0.5, 2.0, 5.0, 5.0]
+
+
+def test_circuit_breaker_opens_fails_fast_and_recovers(clock):
+    """closed -> open after the threshold, half-open after the timeout, then closed."""
+    breaker = CircuitBreaker("api", failure_threshold=2, recovery_timeout=10, clock=clock)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+    clock.now = 10
+    assert breaker.allow()          # the probe
+    assert breaker.state == "half_open"
+    assert not breaker.allow()      # only one probe at a time
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    clock.now = 20
+    assert breaker.allow()
+    breaker.record_success()
+    snapshot = breaker.snapshot()
+    assert (snapshot["state"], snapshot["failures"], snapshot["rejected"]) == ("closed", 0, 2)
+    assert snapshot["transitions"] == {"open": 2, "half_open": 2, "closed": 1}
+
+
+def test_open_circuit_fails_fast_across_shared_endpoint():
+    """Once failed calls open the endpoint's circuit, others sharing it fail fast."""
+    mock_sleep = MagicMock()
+    calls = []
+
+    @retry_with_backoff(max_retries=2, sleep_func=mock_sleep, endpoint="flaky")
+    def first():
+        calls.append("first")
+        raise RetryableError("HTTP 503", status_code=503)
+
+    @retry_with_backoff(max_retries=2, sleep_func=mock_sleep, endpoint="flaky")
+    def second():
+        calls.append("second")
+        return "ok"
+
+    threshold = get_breaker("flaky").failure_threshold
+    for _ in range(threshold):
+        with pytest.raises(RetryableError):
+            first()
+    # The breaker counts failed calls, so every call kept its full retry budget
+    assert calls == ["first"] * 3 * threshold
+    with pytest.raises(CircuitOpenError):
+        second()
+    assert "second" not in calls
+    assert breaker_states()["flaky"]["state"] == "open"
+
+
+def test_breaker_threshold_does_not_cut_the_retry_budget():
+    """A call throttled five times should still get its sixth attempt."""
+    results = [RetryableError("HTTP 429", status_code=429)] * 5 + ["ok"]
+
+    @retry_with_backoff(max_retries=5, sleep_func=MagicMock(), endpoint="throttled")
+    def throttled():
+        result = results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    assert get_breaker("throttled").failure_threshold <= 5
+    assert throttled() == "ok"
+    assert breaker_states()["throttled"]["state"] == "closed"
+
+
+def test_throttled_calls_do_not_open_the_circuit():
+    """Calls that give up on 429s leave the breaker alone; 5xx calls count."""
+    @retry_with_backoff(max_retries=1, sleep_func=MagicMock(), endpoint="busy")
+    def rate_limited():
+        raise RetryableError("HTTP 503", retry_after=2.0, status_code=503)
+
+    @retry_with_backoff(max_retries=1, sleep_func=MagicMock(), endpoint="busy")
+    def unavailable():
+        raise RetryableError("HTTP 503", status_code=503)
+
+    breaker = get_breaker("busy")
+    for _ in range(breaker.failure_threshold * 2):
+        with pytest.raises(RetryableError):
+            rate_limited()
+    assert (breaker.state, breaker.failures) == ("closed", 0)
+
+    for _ in range(breaker.failure_threshold):
+        with pytest.raises(RetryableError):
+            unavailable()
+    assert breaker.state == "open"
+
+
+def test_retrying_call_stops_before_sleeping_once_circuit_opens():
+    """A call mid-retry should fail fast, not sleep, when others open the circuit."""
+    mock_sleep = MagicMock()
+    breaker = get_breaker("outage")
+
+    @retry_with_backoff(max_retries=5, sleep_func=mock_sleep, endpoint="outage")
+    def down():
+        # Other workers exhaust their retries while this attempt runs
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure()
+        raise requests.exceptions.ConnectionError("refused")
+
+    with pytest.raises(CircuitOpenError) as excinfo:
+        down()
+    assert isinstance(excinfo.value.__cause__, requests.exceptions.ConnectionError)
+    mock_sleep.assert_not_called()
+
+
+def test_non_retryable_errors_do_not_trip_breaker():
+    """A 4xx means the endpoint is up, so it resets the failure count."""
+    resp = Mock(status_code=404)
+
+    @retry_with_backoff(max_retries=0, endpoint="lookup")
+    def not_found():
+        raise requests.exceptions.HTTPError(response=resp)
+
+    for _ in range(10):
+        with pytest.raises(requests.exceptions.HTTPError):
+            not_found()
+    assert breaker_states()["lookup"]["state"] == "closed"
+
+
+def test_retry_records_attempts_backoff_and_outcomes():
+    """Each call should be recorded with its attempts, sleeps and outcome."""
+    results = [RetryableError("HTTP 503"), RetryableError("HTTP 503"), "ok"]
+
+    @retry_with_backoff(max_retries=3, initial_backoff=1.0, jitter=False,
+                        sleep_func=MagicMock(), endpoint="metered")
+    def flaky():
+        result = results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    assert flaky() == "ok"
+    for _ in range(get_breaker("metered").failure_threshold):
+        get_breaker("metered").record_failure()
+    with pytest.raises(CircuitOpenError):
+        flaky()
+
+    stats = metrics.registry.snapshot()["functions"][f"{__name__}.flaky"]
+    assert (stats["calls"], stats["attempts"], stats["retries"]) == (2, 3, 2)
+    assert stats["backoff_seconds"] == 3.0
+    assert stats["outcomes"] == {"ok": 1, "circuit_open": 1}
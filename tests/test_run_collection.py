@@ -0,0 +1,210 @@
+"""Tests for collectors.run_collection module."""
+
+import json
+import os
+import tempfile
+import threading
+import pytest
+from unittest.mock import patch
+
+from collectors.file_utils import save_json_atomic, load_json_safe
+from collectors.config import BRIGHTDATA_FACEBOOK_DATASET_ID, BRIGHTDATA_TIKTOK_DATASET_ID
+from collectors import metrics, run_collection
+from collectors.run_collection import (
+    main, parse_args, collect_platforms, resume_pending_snapshots, store_posts,
+)
+
+
+ARGV = [
+    "--twitter-keywords", "AI",
+    "--meta-urls", "https://facebook.com/page",
+    "--tiktok-urls", "https://tiktok.com/@user/video/1",
+]
+
+
+@patch('collectors.run_collection.collect_tiktok')
+@patch('collectors.run_collection.collect_meta')
+@patch('collectors.run_collection.collect_twitter')
+def test_collect_platforms_parallel_runs_concurrently(mock_twitter, mock_meta, mock_tiktok):
+    """--parallel should run all collectors at once and merge in platform order."""
+    barrier = threading.Barrier(3, timeout=5)
+
+    def collector(platform):
+        def run(inputs, **kwargs):
+            barrier.wait()  # Only passes if all three run at the same time
+            return [{"id": "1", "platform": platform}]
+        return run
+
+    mock_twitter.side_effect = collector("twitter")
+    mock_meta.side_effect = collector("meta")
+    mock_tiktok.side_effect = collector("tiktok")
+
+    posts = collect_platforms(parse_args(ARGV + ["--parallel"]))
+    assert [p["platform"] for p in posts] == ["twitter", "meta", "tiktok"]
+
+
+@patch('collectors.run_collection.collect_tiktok')
+@patch('collectors.run_collection.collect_meta')
+@patch('collectors.run_collection.collect_twitter')
+@pytest.mark.parametrize("extra", [[], ["--parallel"]])
+def test_collect_platforms_isolates_failures(mock_twitter, mock_meta, mock_tiktok, extra):
+    """A failing collector should not prevent the others from returning posts."""
+    mock_twitter.return_value = [{"id": "t1", "platform": "twitter"}]
+    mock_meta.side_effect = RuntimeError("Snapshot failed")
+    mock_tiktok.return_value = [{"id": "k1", "platform": "tiktok"}]
+
+    posts = collect_platforms(parse_args(ARGV + extra))
+    assert [p["id"] for p in posts] == ["t1", "k1"]
+
+
+@patch('collectors.run_collection.stream_snapshot')
+@patch('collectors.run_collection.poll_snapshots')
+@patch('collectors.run_collection.find_pending_snapshots')
+def test_resume_pending_snapshots_normalizes_by_dataset(mock_find, mock_poll, mock_stream):
+    """Resume should download ready snapshots with the matching normalizer."""
+    mock_find.return_value = [
+        {"snapshot_id": "fb_1", "dataset_id": BRIGHTDATA_FACEBOOK_DATASET_ID},
+        {"snapshot_id": "tt_1", "dataset_id": BRIGHTDATA_TIKTOK_DATASET_ID},
+        {"snapshot_id": "tt_2", "dataset_id": BRIGHTDATA_TIKTOK_DATASET_ID},
+        {"snapshot_id": "xx_1", "dataset_id": "unknown_dataset"},
+    ]
+    mock_poll.return_value = {"fb_1": "ready", "tt_1": "ready", "tt_2": "timeout"}
+    mock_stream.side_effect = lambda snapshot_id, raw_path: iter([{"id": snapshot_id}])
+
+    posts = resume_pending_snapshots()
+
+    assert mock_poll.call_args[0][0] == ["fb_1", "tt_1", "tt_2"]
+    assert [(p["platform"], p["id"]) for p in posts] == [
+        ("meta", "fb_1"), ("tiktok", "tt_1"),
+    ]
+
+
+def test_store_posts_accumulates_and_refreshes():
+    """store_posts should import the old posts file, then upsert new posts."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        posts_file = os.path.join(tmp_dir, "posts.json")
+        paths = dict(posts_file=posts_file,
+                     data_path=os.path.join(tmp_dir, "store.ndjson"),
+                     index_path=os.path.join(tmp_dir, "store.index.ndjson"))
+        save_json_atomic([{"platform": "meta", "id": "1", "text": "fb"}], posts_file)
+
+        counts = store_posts([
+            {"platform": "twitter", "id": "1", "text": "t", "engagement": {"likes": 1}},
+        ], **paths)
+        assert (counts["inserted"], counts["total"]) == (1, 2)
+
+        counts = store_posts([
+            {"platform": "twitter", "id": "1", "text": "t", "engagement": {"likes": 9}},
+            {"platform": "meta", "id": "1", "text": "fb"},
+        ], **paths)
+        assert (counts["updated"], counts["unchanged"], counts["total"]) == (1, 1, 2)
+
+        saved = load_json_safe(posts_file)
+        assert [(p["platform"], p["id"]) for p in saved] == [("meta", "1"), ("twitter", "1")]
+        assert saved[1]["engagement"]["likes"] == 9
+
+
+@pytest.mark.parametrize("backend", ["json", "sqlite"])
+def test_store_posts_can_skip_export(backend):
+    """export=False should store posts without rewriting the posts file."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        posts_file = os.path.join(tmp_dir, "posts.json")
+        paths = dict(posts_file=posts_file, backend=backend,
+                     data_path=os.path.join(tmp_dir, "store"),
+                     index_path=os.path.join(tmp_dir, "store.index.ndjson"))
+        save_json_atomic([{"platform": "meta", "id": "1", "text": "fb"}], posts_file)
+        before = os.stat(posts_file).st_mtime_ns
+
+        counts = store_posts([{"platform": "twitter", "id": "1", "text": "t"}],
+                             export=False, **paths)
+        assert (counts["inserted"], counts["total"]) == (1, 2)
+        assert os.stat(posts_file).st_mtime_ns == before
+
+        assert store_posts([], **paths)["total"] == 2
+        assert len(load_json_safe(posts_file)) == 2
+
+
+def test_store_posts_sqlite_backend():
+    """The SQLite backend should import, upsert, and export the same posts file."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        posts_file = os.path.join(tmp_dir, "posts.json")
+        paths = dict(posts_file=posts_file, data_path=os.path.join(tmp_dir, "db.sqlite3"),
+                     backend="sqlite")
+        save_json_atomic([{"platform": "meta", "id": "1", "text": "fb"}], posts_file)
+
+        counts = store_posts([
+            {"platform": "twitter", "id": "1", "text": "t", "engagement": {"likes": 1}},
+        ], **paths)
+        assert (counts["inserted"], counts["total"]) == (1, 2)
+
+        counts = store_posts([
+            {"platform": "twitter", "id": "1", "text": "t", "engagement": {"likes": 9}},
+        ], **paths)
+        assert (counts["inserted"], counts["updated"], counts["total"]) == (0, 1, 2)
+
+        saved = load_json_safe(posts_file)
+        assert [(p["platform"], p["id"]) for p in saved] == [("meta", "1"), ("twitter", "1")]
+        assert saved[1]["engagement"]["likes"] == 9
+
+
+@patch('collectors.run_collection.collect_tiktok')
+@patch('collectors.run_collection.collect_meta')
+@patch('collectors.run_collection.collect_twitter')
+def test_collect_platforms_passes_snapshot_options(mock_twitter, mock_meta, mock_tiktok):
+    """Snapshot cache and chunk options should reach the BrightData collectors."""
+    mock_twitter.return_value = []
+    mock_meta.return_value = []
+    mock_tiktok.return_value = []
+
+    collect_platforms(parse_args(ARGV + ["--snapshot-cache-ttl", "0",
+                                         "--snapshot-chunk-size", "10"]))
+    mock_meta.assert_called_once_with(["https://facebook.com/page"],
+                                      cache_ttl=0, chunk_size=10)
+    mock_tiktok.assert_called_once_with(["https://tiktok.com/@user/video/1"],
+                                        cache_ttl=0, chunk_size=10)
+
+
+@patch('collectors.run_collection.collect_twitter')
+def test_collect_platforms_twitter_options(mock_twitter):
+    """Twitter flags should switch the collector's search mode."""
+    mock_twitter.return_value = []
+
+    collect_platforms(parse_args(["--twitter-keywords", "AI", "ML", "--twitter-per-keyword",
+                                  "--twitter-incremental"]))
+    mock_twitter.assert_called_once_with(["AI", "ML"], per_keyword=True, incremental=True)
+
+
+@patch('collectors.run_collection.collect_platforms')
+@patch('collectors.run_collection.validate_keys')
+def test_main_writes_run_stats_even_when_collection_fails(mock_validate, mock_collect):
+    """A failed run should still leave its request stats behind."""
+    def collect(args):
+        metrics.registry.record_request("api.twitterapi.io", 503, 0.5)
+        raise RuntimeError("collector crashed")
+
+    mock_collect.side_effect = collect
+
+    with pytest.raises(RuntimeError):
+        main(["--twitter-keywords", "AI"])
+
+    with open(run_collection.COLLECTION_STATS_FILE, encoding="utf-8") as f:
+        stats = json.load(f)
+    assert stats["endpoints"]["api.twitterapi.io"]["statuses"] == {"503": 1}
+    assert "circuit_breakers" in stats
+
+
+@patch('collectors.run_collection.store_posts')
+@patch('collectors.run_collection.collect_platforms')
+@patch('collectors.run_collection.validate_keys')
+def test_main_export_flags(mock_validate, mock_collect, mock_store):
+    """--no-export should skip the posts.json rewrite; --export-only only does it."""
+    mock_collect.return_value = [{"platform": "twitter", "id": "1"}]
+
+    main(["--twitter-keywords", "AI", "--no-export"])
+    mock_store.assert_called_once_with(mock_collect.return_value, export=False)
+
+    mock_store.reset_mock()
+    mock_collect.reset_mock()
+    main(["--export-only"])
+    mock_store.assert_called_once_with([])
+    mock_collect.assert_not_called()
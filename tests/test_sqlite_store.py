@@ -0,0 +1,85 @@
+"""Tests for collectors.sqlite_store module."""
+
+import json
+import os
+import tempfile
+import pytest
+
+from collectors import sqlite_store
+from collectors.file_utils import save_json_atomic
+
+
+@pytest.fixture
+def conn():
+    """Provide a connection to a temporary database."""
+    with tempfile.TemporaryDirectory() as d:
+        connection = sqlite_store.connect(os.path.join(d, "db.sqlite3"))
+        yield connection
+        connection.close()
+
+
+def _post(post_id, platform="twitter", likes=0, collected_at="2026-01-01"):
+    """Build a minimal post."""
+    return {"id": post_id, "platform": platform, "text": f"text {post_id}",
+            "timestamp": f"2026-01-0{post_id}", "engagement": {"likes": likes},
+            "collected_at": collected_at}
+
+
+def _claim(post_id, status="auto_accepted", category="health", confidence=0.9):
+    """Build a minimal claim."""
+    return {"post_id": post_id, "platform": "twitter", "claim_text": f"claim {post_id}",
+            "category": category, "confidence": confidence, "status": status}
+
+
+def test_connect_uses_wal_and_creates_indexes(conn):
+    """The database should be in WAL mode with the query indexes present."""
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    indexes = {row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {"idx_posts_timestamp", "idx_claims_post", "idx_claims_status",
+            "idx_claims_category", "idx_claims_confidence"} <= indexes
+
+
+def test_upsert_posts_keeps_first_seen_and_refreshes_engagement(conn):
+    """A re-collected post should update its columns but keep first_seen."""
+    sqlite_store.upsert_posts(conn, [_post("1"), _post("2", platform="meta")])
+    sqlite_store.upsert_posts(conn, [_post("1", likes=7, collected_at="2026-01-05")])
+
+    posts = list(sqlite_store.iter_posts(conn))
+    assert [(p["platform"], p["id"]) for p in posts] == [("twitter", "1"), ("meta", "2")]
+    assert posts[0]["engagement"]["likes"] == 7
+    assert (posts[0]["first_seen"], posts[0]["last_seen"]) == ("2026-01-01", "2026-01-05")
+    assert conn.execute("SELECT likes FROM posts WHERE id = '1'").fetchone() == (7,)
+    assert [p["id"] for p in sqlite_store.iter_posts(conn, platform="meta")] == ["2"]
+
+
+def test_replace_claims_mirrors_the_claims_file(conn):
+    """replace_claims should drop old rows and keep extraction order."""
+    sqlite_store.replace_claims(conn, [_claim("old")])
+    assert sqlite_store.replace_claims(
+        conn, [_claim("1"), _claim("2", status="needs_review", confidence=0.7)]) == 2
+
+    assert [c["post_id"] for c in sqlite_store.iter_claims(conn)] == ["1", "2"]
+    assert [c["post_id"] for c in sqlite_store.iter_claims(conn, status="needs_review")] == ["2"]
+    assert conn.execute(
+        "SELECT post_id FROM claims WHERE confidence >= 0.85").fetchall() == [("1",)]
+
+
+def test_import_and_export_round_trip_json_files(conn):
+    """Exported files should hold the same records the JSON files held."""
+    with tempfile.TemporaryDirectory() as d:
+        posts_path = os.path.join(d, "posts.json")
+        claims_path = os.path.join(d, "claims.json")
+        save_json_atomic([_post("1"), _post("2")], posts_path)
+        save_json_atomic([_claim("1")], claims_path)
+
+        assert sqlite_store.import_json(conn, posts_path, claims_path) == (2, 1)
+        assert sqlite_store.import_claims(conn, os.path.join(d, "missing.json")) == 0
+
+        out_posts = os.path.join(d, "out", "posts.json")
+        out_claims = os.path.join(d, "out", "claims.json")
+        assert sqlite_store.export_json(conn, out_posts, out_claims) == (2, 1)
+        with open(out_posts) as f:
+            assert [p["id"] for p in json.load(f)] == ["1", "2"]
+        with open(out_claims) as f:
+            assert json.load(f) == [_claim("1")]
@@ -1,11 +1,22 @@
 """Tests for collectors.tiktok_collector module."""
 
+import os
+import tempfile
 import pytest
 from unittest.mock import patch, MagicMock
 
 from collectors.tiktok_collector import normalize_tiktok_post, collect_tiktok
 
 
+@pytest.fixture(autouse=True)
+def snapshot_cache():
+    """Point the BrightData snapshot cache at a temporary file."""
+    with tempfile.TemporaryDirectory() as d:
+        with patch('collectors.brightdata_utils.BRIGHTDATA_CACHE_FILE',
+                   os.path.join(d, 'cache.json')):
+            yield
+
+
 SAMPLE_TIKTOK_POST = {
     "id": "tt_001",
     "author": "techcreator",
@@ -60,28 +71,45 @@ def test_normalize_tiktok_post_missing_fields():
     assert result["engagement"]["likes"] == 0
 
 
-@patch('collectors.tiktok_collector.save_json_atomic')
-@patch('collectors.tiktok_collector.download_snapshot')
-@patch('collectors.tiktok_collector.poll_snapshot')
-@patch('collectors.tiktok_collector.trigger_collection')
-def test_collect_tiktok_success(mock_trigger, mock_poll, mock_download, mock_save):
+@patch('collectors.brightdata_utils.stream_snapshot')
+@patch('collectors.brightdata_utils.poll_snapshots')
+@patch('collectors.brightdata_utils.trigger_collection')
+def test_collect_tiktok_success(mock_trigger, mock_poll, mock_stream):
     """collect_tiktok should return normalized posts on success."""
     mock_trigger.return_value = "snap_tt_001"
-    mock_poll.return_value = True
-    mock_download.return_value = [SAMPLE_TIKTOK_POST] * 5
+    mock_poll.side_effect = lambda ids: {sid: "ready" for sid in ids}
+    mock_stream.return_value = [dict(SAMPLE_TIKTOK_POST, id=f"tt_{i}") for i in range(5)]
 
     results = collect_tiktok(["https://tiktok.com/@techcreator"])
     assert len(results) == 5
     assert all(r["platform"] == "tiktok" for r in results)
 
 
-@patch('collectors.tiktok_collector.save_json_atomic')
-@patch('collectors.tiktok_collector.poll_snapshot')
-@patch('collectors.tiktok_collector.trigger_collection')
-def test_collect_tiktok_timeout(mock_trigger, mock_poll, mock_save):
+@patch('collectors.brightdata_utils.poll_snapshots')
+@patch('collectors.brightdata_utils.trigger_collection')
+def test_collect_tiktok_timeout(mock_trigger, mock_poll):
     """collect_tiktok should return empty list on timeout."""
     mock_trigger.return_value = "snap_tt_002"
-    mock_poll.return_value = False
+    mock_poll.side_effect = lambda ids: {sid: "timeout" for sid in ids}
 
     results = collect_tiktok(["https://tiktok.com/@user"])
     assert results == []
+
+
+@patch('collectors.brightdata_utils.stream_snapshot')
+@patch('collectors.brightdata_utils.poll_snapshots')
+@patch('collectors.brightdata_utils.trigger_collection')
+def test_collect_tiktok_scales_past_max_posts(mock_trigger, mock_poll, mock_stream):
+    """Large video lists should be chunked rather than truncated to MAX_POSTS."""
+    mock_trigger.side_effect = lambda dataset_id, chunk: chunk[0]["url"].rsplit("/", 1)[-1]
+    mock_poll.side_effect = lambda ids: {sid: "ready" for sid in ids}
+    mock_stream.side_effect = lambda sid, path: iter(
+        [dict(SAMPLE_TIKTOK_POST, id=str(n)) for n in range(int(sid), int(sid) + 10)]
+    )
+
+    urls = [f"https://tiktok.com/@user/video/{n}" for n in range(60)]
+    results = collect_tiktok(urls, chunk_size=10)
+
+    assert mock_trigger.call_count == 6
+    assert len(results) == 60
+    assert len({r["id"] for r in results}) == 60
@@ -0,0 +1,15 @@
+"""Tests for collectors.timestamps module."""
+
+from collectors.timestamps import parse_timestamp
+
+
+def test_parse_timestamp_handles_collector_formats():
+    """Twitter, ISO and bad timestamps should parse to aware datetimes or None."""
+    twitter = parse_timestamp("Fri Feb 20 07:20:53 +0000 2026")
+    assert twitter.isoformat() == "2026-02-20T07:20:53+00:00"
+    tiktok = parse_timestamp("2026-02-21T10:00:00.000Z")
+    assert tiktok.isoformat() == "2026-02-21T10:00:00+00:00"
+    assert parse_timestamp("2026-02-01").tzinfo is not None
+    assert parse_timestamp("") is None
+    assert parse_timestamp(None) is None
+    assert parse_timestamp("not a date") is None
@@ -1,9 +1,12 @@
 """Tests for collectors.twitter_collector module."""
 
+import os
+import tempfile
 import pytest
 from unittest.mock import patch, MagicMock
 
-from collectors.twitter_collector import normalize_tweet, collect_twitter
+from collectors.file_utils import save_json_atomic
+from collectors.twitter_collector import normalize_tweet, collect_twitter, load_twitter_state
 
 
 SAMPLE_TWEET = {
@@ -18,6 +21,11 @@ SAMPLE_TWEET = {
 }
 
 
+def _tweets(prefix, count):
+    """Build ``count`` tweets with ids '<prefix>_<n>'."""
+    return [dict(SAMPLE_TWEET, id=f"{prefix}_{n}") for n in range(count)]
+
+
 def test_normalize_tweet_basic():
     """normalize_tweet should map tweet fields to unified schema."""
     result = normalize_tweet(SAMPLE_TWEET)
@@ -103,3 +111,151 @@ def test_collect_twitter_multiple_keywords(mock_search, mock_save):
     assert "AI" in query
     assert "machine learning" in query
     assert "OR" in query
+
+
+@patch('collectors.twitter_collector.save_json_atomic')
+@patch('collectors.twitter_collector._search_page')
+def test_collect_twitter_per_keyword_splits_budget_evenly(mock_search, mock_save):
+    """Each keyword should get its own cursor and an even share of MAX_POSTS."""
+    def search(query, cursor=None):
+        page = int(cursor or 0)
+        return {"tweets": _tweets(f"{query}_{page}", 10),
+                "has_next_page": True, "next_cursor": str(page + 1)}
+
+    mock_search.side_effect = search
+
+    results = collect_twitter(["AI", "ML"], per_keyword=True)
+    queries = {call.args[0] for call in mock_search.call_args_list}
+    assert queries == {"AI", "ML"}
+    assert len(results) == 25
+    assert sum(r["id"].startswith("AI_") for r in results) == 13
+    assert sum(r["id"].startswith("ML_") for r in results) == 12
+
+
+@patch('collectors.twitter_collector.save_json_atomic')
+@patch('collectors.twitter_collector._search_page')
+def test_collect_twitter_per_keyword_dedups_and_redistributes(mock_search, mock_save):
+    """Overlapping tweets count once; a short keyword's unused share goes to the rest."""
+    def search(query, cursor=None):
+        if query == "rare":
+            return {"tweets": _tweets("shared", 3), "has_next_page": False}
+        page = int(cursor or 0)
+        tweets = _tweets(f"common_{page}", 10)
+        if page == 0:
+            tweets = _tweets("shared", 3) + tweets
+        return {"tweets": tweets, "has_next_page": True, "next_cursor": str(page + 1)}
+
+    mock_search.side_effect = search
+
+    results = collect_twitter(["common", "rare"], per_keyword=True)
+    ids = [r["id"] for r in results]
+    assert len(ids) == 25
+    assert len(set(ids)) == 25
+    assert sum(i.startswith("shared_") for i in ids) == 3
+
+
+@patch('collectors.twitter_collector.save_json_atomic')
+@patch('collectors.twitter_collector._search_page')
+def test_collect_twitter_per_keyword_isolates_failures(mock_search, mock_save):
+    """A failing keyword should not stop the others."""
+    def search(query, cursor=None):
+        if query == "bad":
+            raise RuntimeError("API error")
+        return {"tweets": _tweets(query, 5), "has_next_page": False}
+
+    mock_search.side_effect = search
+
+    results = collect_twitter(["bad", "good"], per_keyword=True)
+    assert [r["id"] for r in results] == [f"good_{n}" for n in range(5)]
+
+
+@pytest.fixture
+def state_path():
+    """Point the Twitter high-water mark file at a temporary path."""
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "twitter_state.json")
+        with patch('collectors.twitter_collector.TWITTER_STATE_FILE', path):
+            yield path
+
+
+def _page(*ids, cursor=None):
+    """Build a search page holding tweets with the given numeric ids."""
+    return {"tweets": [dict(SAMPLE_TWEET, id=str(i), createdAt=f"t{i}") for i in ids],
+            "has_next_page": cursor is not None, "next_cursor": cursor}
+
+
+@patch('collectors.twitter_collector.save_json_atomic')
+@patch('collectors.twitter_collector._search_page')
+def test_collect_twitter_incremental_stops_at_high_water_mark(mock_search, mock_save,
+                                                              state_path):
+    """A rerun should bound the query and stop at tweets seen before."""
+    mock_save.side_effect = lambda data, path: (
+        save_json_atomic(data, path) if path == state_path else None
+    )
+
+    mock_search.side_effect = [_page(105, 104, 103)]
+    assert len(collect_twitter(["AI"], incremental=True)) == 3
+    assert load_twitter_state()["AI"]["newest_id"] == "105"
+    assert load_twitter_state()["AI"]["newest_timestamp"] == "t105"
+
+    mock_search.side_effect = [_page(107, 106, cursor="c1"), _page(105, 104)]
+    results = collect_twitter(["AI"], incremental=True)
+    assert [r["id"] for r in results] == ["107", "106"]
+    assert mock_search.call_args.args[0] == "(AI) since_id:105"
+    assert load_twitter_state()["AI"]["newest_id"] == "107"
+    assert load_twitter_state()["AI"]["last_cursor"] == "c1"
+
+
+@patch('collectors.twitter_collector.save_json_atomic')
+@patch('collectors.twitter_collector._search_page')
+def test_collect_twitter_incremental_keeps_mark_when_budget_stops_early(
+        mock_search, mock_save, state_path):
+    """A run cut short by MAX_POSTS must not advance the mark past a gap."""
+    mock_save.side_effect = lambda data, path: (
+        save_json_atomic(data, path) if path == state_path else None
+    )
+    save_json_atomic({"AI": {"newest_id": "100"}}, state_path)
+
+    mock_search.side_effect = [_page(*range(140, 110, -1), cursor="c1")]
+    assert len(collect_twitter(["AI"], incremental=True)) == 25
+    assert load_twitter_state()["AI"]["newest_id"] == "100"
+
+
+@patch('collectors.twitter_collector.save_json_atomic')
+@patch('collectors.twitter_collector._search_page')
+def test_collect_twitter_per_keyword_incremental(mock_search, mock_save, state_path):
+    """Per-keyword searches should each use and update their own mark."""
+    mock_save.side_effect = lambda data, path: (
+        save_json_atomic(data, path) if path == state_path else None
+    )
+    save_json_atomic({"AI": {"newest_id": "10"}, "ML": {"newest_id": "20"}}, state_path)
+
+    pages = {"(AI) since_id:10": _page(12, 11, 10, 9), "(ML) since_id:20": _page(21, 20)}
+    mock_search.side_effect = lambda query, cursor=None: pages[query]
+
+    results = collect_twitter(["AI", "ML"], per_keyword=True, incremental=True)
+    assert [r["id"] for r in results] == ["12", "11", "21"]
+    state = load_twitter_state()
+    assert (state["AI"]["newest_id"], state["ML"]["newest_id"]) == ("12", "21")
+
+
+@patch('collectors.twitter_collector.save_json_atomic')
+@patch('collectors.twitter_collector._search_page')
+def test_collect_twitter_per_keyword_keeps_mark_when_search_fails(
+        mock_search, mock_save, state_path):
+    """A search that fails partway must not advance its mark past unfetched tweets."""
+    mock_save.side_effect = lambda data, path: (
+        save_json_atomic(data, path) if path == state_path else None
+    )
+    save_json_atomic({"AI": {"newest_id": "100"}}, state_path)
+
+    def search(query, cursor=None):
+        if cursor == "c1":
+            raise RuntimeError("API error")
+        return _page(*range(200, 190, -1), cursor="c1")
+
+    mock_search.side_effect = search
+
+    results = collect_twitter(["AI"], per_keyword=True, incremental=True)
+    assert len(results) == 10
+    assert load_twitter_state()["AI"]["newest_id"] == "100"